@@ -9,6 +9,7 @@ from flask_migrate import Migrate
 from app.dv import dv_bp  # DV blueprint lives in app/dv
 from models import user, wallet  # existing models you already import
 from models import dk            # <-- ensure this import is present
+from models import sim_job       # SimJob queue table
 
 migrate = Migrate()
 
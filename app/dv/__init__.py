@@ -11,4 +11,13 @@ dv_bp = Blueprint(
     static_folder="../../static"
 )
 
+@dv_bp.record_once
+def _init_dv_data(state):
+    # Resolve the data dir and size the frame cache once per app, not per request.
+    # Both modules are pandas-free, so registering the blueprint stays light.
+    from .data_dir import init_data_dir
+    from .dv_cache import set_memory_budget
+    init_data_dir(refresh=True)
+    set_memory_budget(int(state.app.config.get("DV_CACHE_MAX_MB", 256)) * 1024 * 1024)
+
 from . import routes  # keep at bottom
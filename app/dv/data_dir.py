@@ -0,0 +1,58 @@
+# app/dv/data_dir.py
+"""
+Locating the DraftVader data_files directory. Kept free of pandas so the
+blueprint can resolve it at registration without loading pandas at boot.
+"""
+import os
+from pathlib import Path
+
+# ------------------------------------------------------------
+# Candidate locations for DraftVader data_files directory
+# ------------------------------------------------------------
+def _candidate_data_dirs():
+    here = Path(__file__).resolve()
+    app_root = here.parents[2]  # SIMDaddy/
+    return [
+        Path(os.getenv("DV_DATA_DIR")) if os.getenv("DV_DATA_DIR") else None,
+        Path(os.getenv("SIMDADDY_DATA_DIR")) if os.getenv("SIMDADDY_DATA_DIR") else None,
+        app_root / "DATA",                              # ✅ default (your setup)
+        here.parents[2] / "data_files",                 # legacy local
+        here.parents[3] / "DraftVader" / "data_files",  # legacy clones
+        here.parents[3] / "DraftVader-master" / "data_files",
+        Path.cwd() / "DraftVader" / "data_files",
+        Path.cwd() / "DraftVader-master" / "data_files",
+    ]
+
+def _resolve_data_dir() -> Path:
+    tried = []
+    for p in _candidate_data_dirs():
+        if p is None:
+            continue
+        tried.append(str(p))
+        if p.exists():
+            return p
+    raise FileNotFoundError(
+        "Could not locate DraftVader data_files directory. "
+        "Set DV_DATA_DIR or SIMDADDY_DATA_DIR, or put CSVs under SIMDaddy/DATA. "
+        f"Tried: {', '.join(tried)}"
+    )
+
+# Resolved once (at app start via init_data_dir, else on first use)
+_DATA_DIR = None
+
+def init_data_dir(refresh: bool = False):
+    """Resolve and remember the data dir; returns None if none exists yet."""
+    global _DATA_DIR
+    if _DATA_DIR is None or refresh:
+        try:
+            _DATA_DIR = _resolve_data_dir()
+        except FileNotFoundError:
+            _DATA_DIR = None
+    return _DATA_DIR
+
+def get_data_dir() -> Path:
+    if _DATA_DIR is not None:
+        return _DATA_DIR
+    if init_data_dir() is None:
+        _resolve_data_dir()  # raises with the list of places tried
+    return _DATA_DIR
@@ -0,0 +1,91 @@
+# app/dv/dv_cache.py
+"""
+Process-wide cache for DV data frames.
+
+Entries are keyed by a name plus the (path, mtime, size) signature of every
+source file they were built from, so editing or replacing a CSV simply makes
+the old entry unreachable. Parsed CSVs and derived frames (age-curved stats,
+SoS, spike week) share one LRU bounded by an approximate memory budget.
+
+Callers get a copy, so adding columns in a route never leaks into the cache.
+"""
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+if TYPE_CHECKING:  # pandas is only needed by callers; keep it out of app boot
+    import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_entries: "OrderedDict[str, tuple]" = OrderedDict()   # name -> (signature, frame, nbytes)
+_lock = threading.Lock()
+_max_bytes = DEFAULT_MAX_BYTES
+_total_bytes = 0
+
+def set_memory_budget(max_bytes: int) -> None:
+    global _max_bytes
+    with _lock:
+        _max_bytes = max(0, int(max_bytes))
+        _evict()
+
+def file_signature(paths: Iterable[Path]) -> tuple:
+    """(path, mtime_ns, size) per source; missing files are part of the key too."""
+    sig = []
+    for p in paths:
+        p = Path(p)
+        try:
+            st = p.stat()
+            sig.append((str(p), st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append((str(p), None, None))
+    return tuple(sig)
+
+def _frame_bytes(df) -> int:
+    try:
+        return int(df.memory_usage(index=True, deep=True).sum())
+    except Exception:
+        return 0
+
+def _evict() -> None:
+    global _total_bytes
+    while _entries and _total_bytes > _max_bytes:
+        _, (_, _, nbytes) = _entries.popitem(last=False)
+        _total_bytes -= nbytes
+
+def cached_frame(name: str, sources: Iterable[Path], build: Callable[[], Optional[pd.DataFrame]]):
+    """
+    Frame for `name`, rebuilt with `build()` only when a source file changed.
+    A None result is cached as well (e.g. "no SoS inputs").
+    """
+    global _total_bytes
+    sig = file_signature(sources)
+    with _lock:
+        hit = _entries.get(name)
+        if hit is not None and hit[0] == sig:
+            _entries.move_to_end(name)
+            return None if hit[1] is None else hit[1].copy()
+
+    df = build()
+    nbytes = _frame_bytes(df) if df is not None else 0
+    with _lock:
+        old = _entries.pop(name, None)
+        if old is not None:
+            _total_bytes -= old[2]
+        if nbytes <= _max_bytes:
+            _entries[name] = (sig, df, nbytes)
+            _total_bytes += nbytes
+            _evict()
+    return None if df is None else df.copy()
+
+def cache_stats() -> dict:
+    with _lock:
+        return {"entries": len(_entries), "bytes": _total_bytes, "max_bytes": _max_bytes}
+
+def clear_dv_cache() -> None:
+    global _total_bytes
+    with _lock:
+        _entries.clear()
+        _total_bytes = 0
@@ -1,40 +1,16 @@
 # app/dv/dv_data.py
 
-import os
+import math
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+from .data_dir import get_data_dir, init_data_dir  # noqa: F401  (re-exported for routes)
+from .dv_cache import cached_frame
+
 # ------------------------------------------------------------
-# Candidate locations for DraftVader data_files directory
+# CSV reads (cached per file version)
 # ------------------------------------------------------------
-def _candidate_data_dirs():
-    here = Path(__file__).resolve()
-    app_root = here.parents[2]  # SIMDaddy/
-    return [
-        Path(os.getenv("DV_DATA_DIR")) if os.getenv("DV_DATA_DIR") else None,
-        Path(os.getenv("SIMDADDY_DATA_DIR")) if os.getenv("SIMDADDY_DATA_DIR") else None,
-        app_root / "DATA",                              # ✅ default (your setup)
-        here.parents[2] / "data_files",                 # legacy local
-        here.parents[3] / "DraftVader" / "data_files",  # legacy clones
-        here.parents[3] / "DraftVader-master" / "data_files",
-        Path.cwd() / "DraftVader" / "data_files",
-        Path.cwd() / "DraftVader-master" / "data_files",
-    ]
-
-def get_data_dir() -> Path:
-    tried = []
-    for p in _candidate_data_dirs():
-        if p is None:
-            continue
-        tried.append(str(p))
-        if p.exists():
-            return p
-    raise FileNotFoundError(
-        "Could not locate DraftVader data_files directory. "
-        "Set DV_DATA_DIR or SIMDADDY_DATA_DIR, or put CSVs under SIMDaddy/DATA. "
-        f"Tried: {', '.join(tried)}"
-    )
-
 def _read_csv(name: str) -> pd.DataFrame:
     data_dir = get_data_dir()
     path = data_dir / name
@@ -43,7 +19,7 @@ def _read_csv(name: str) -> pd.DataFrame:
             f"Missing required CSV: {path}\n"
             f"(Resolved data dir: {data_dir})"
         )
-    return pd.read_csv(path)
+    return cached_frame(f"csv:{path}", [path], lambda: pd.read_csv(path))
 
 # ------------------------------------------------------------
 # Data loaders
@@ -67,6 +43,50 @@ def load_rookie_rankings() -> pd.DataFrame:
 # ------------------------------------------------------------
 # Age curve logic (multi-pos curve; preserves original columns)
 # ------------------------------------------------------------
+# Per-position breakpoint tables: `edges` are the inclusive upper ages of
+# each bracket, so np.searchsorted(edges, age) is the bracket index and the
+# value/tag lists carry one extra entry for everything past the last edge.
+AGE_CURVES = {
+    "RB": {"edges": [22, 24, 27, 30, 33], "mult": [1.10, 1.08, 1.03, 0.98, 0.92, 0.85]},
+    "WR": {"edges": [22, 24, 28, 31, 34], "mult": [1.08, 1.05, 1.02, 0.98, 0.93, 0.88]},
+    "TE": {"edges": [22, 26, 30, 33], "mult": [1.05, 1.03, 1.00, 0.95, 0.90]},
+    "QB": {"edges": [22, 25, 32, 36, 38, 40, 44], "mult": [1.00, 1.02, 1.03, 1.02, 1.00, 0.98, 0.95, 0.90]},
+}
+AGE_TAGS = {
+    "RB": {"edges": [22, 27, 30], "tags": ["Breakout Window", "Prime", "Late Prime", "Decline"]},
+    "WR": {"edges": [22, 28, 31], "tags": ["Breakout Window", "Prime", "Late Prime", "Decline"]},
+    "TE": {"edges": [22, 30], "tags": ["Development", "Prime", "Decline"]},
+    "QB": {"edges": [22, 38], "tags": ["Development", "Prime", "Decline"]},
+}
+POSITION_ALIASES = {"FB": "RB"}
+
+def age_curve_values(pos, age):
+    """
+    Vectorized curve lookup for aligned position/age arrays.
+    Returns (multiplier ndarray, risk tag ndarray); unknown positions or
+    ages get 1.0 / "Unknown".
+    """
+    pos = pd.Series(pos).astype("string").str.upper().replace(POSITION_ALIASES).fillna("")
+    age = np.trunc(pd.to_numeric(pd.Series(age), errors="coerce").to_numpy(dtype="float64"))
+    has_age = ~np.isnan(age)
+    age_filled = np.where(has_age, age, 0.0)
+
+    mult_conds, mult_choices, tag_conds, tag_choices = [], [], [], []
+    for p, curve in AGE_CURVES.items():
+        is_pos = (pos == p).to_numpy() & has_age
+        idx = np.searchsorted(curve["edges"], age_filled, side="left")
+        mult_conds.append(is_pos)
+        mult_choices.append(np.asarray(curve["mult"])[idx])
+    for p, table in AGE_TAGS.items():
+        is_pos = (pos == p).to_numpy() & has_age
+        idx = np.searchsorted(table["edges"], age_filled, side="left")
+        tag_conds.append(is_pos)
+        tag_choices.append(np.asarray(table["tags"], dtype=object)[idx])
+
+    mult = np.select(mult_conds, mult_choices, default=1.0)
+    tags = np.select(tag_conds, tag_choices, default="Unknown")
+    return mult, tags
+
 def apply_age_curve(df: pd.DataFrame) -> pd.DataFrame:
     """
     Adds:
@@ -86,106 +106,130 @@ def apply_age_curve(df: pd.DataFrame) -> pd.DataFrame:
     if pos_col is None or age_col is None:
         return df
 
-    def get_age_curve_multiplier(pos, age):
-        if pd.isna(age):
-            return 1.0
-        try:
-            age = int(age)
-        except Exception:
-            return 1.0
-        pos = (pos or "").upper()
-        if pos in ("RB", "FB"):
-            if age <= 22: return 1.10
-            elif 23 <= age <= 24: return 1.08
-            elif 25 <= age <= 27: return 1.03
-            elif 28 <= age <= 30: return 0.98
-            elif 31 <= age <= 33: return 0.92
-            else: return 0.85
-        elif pos == "WR":
-            if age <= 22: return 1.08
-            elif 23 <= age <= 24: return 1.05
-            elif 25 <= age <= 28: return 1.02
-            elif 29 <= age <= 31: return 0.98
-            elif 32 <= age <= 34: return 0.93
-            else: return 0.88
-        elif pos == "TE":
-            if age <= 22: return 1.05
-            elif 23 <= age <= 26: return 1.03
-            elif 27 <= age <= 30: return 1.00
-            elif 31 <= age <= 33: return 0.95
-            else: return 0.90
-        elif pos == "QB":
-            if age <= 22: return 1.00
-            elif 23 <= age <= 25: return 1.02
-            elif 26 <= age <= 32: return 1.03
-            elif 33 <= age <= 36: return 1.02
-            elif 37 <= age <= 38: return 1.00
-            elif 39 <= age <= 40: return 0.98
-            elif 41 <= age <= 44: return 0.95
-            else: return 0.90
-        else:
-            return 1.0
-
-    def get_age_tag(pos, age):
-        if pd.isna(age):
-            return "Unknown"
-        try:
-            age = int(age)
-        except Exception:
-            return "Unknown"
-        pos = (pos or "").upper()
-        if pos in ("RB", "FB"):
-            if age <= 22: return "Breakout Window"
-            elif 23 <= age <= 27: return "Prime"
-            elif 28 <= age <= 30: return "Late Prime"
-            else: return "Decline"
-        elif pos == "WR":
-            if age <= 22: return "Breakout Window"
-            elif 23 <= age <= 28: return "Prime"
-            elif 29 <= age <= 31: return "Late Prime"
-            else: return "Decline"
-        elif pos == "TE":
-            if age <= 22: return "Development"
-            elif 23 <= age <= 30: return "Prime"
-            else: return "Decline"
-        elif pos == "QB":
-            if age <= 22: return "Development"
-            elif 23 <= age <= 38: return "Prime"
-            else: return "Decline"
-        return "Unknown"
-
     out = df.copy()
-    out["age_curve_multiplier"] = out[[pos_col, age_col]].apply(lambda r: get_age_curve_multiplier(r.iloc[0], r.iloc[1]), axis=1)
-    out["age_risk_tag"] = out[[pos_col, age_col]].apply(lambda r: get_age_tag(r.iloc[0], r.iloc[1]), axis=1)
+    mult, tags = age_curve_values(out[pos_col].to_numpy(), out[age_col].to_numpy())
+    out["age_curve_multiplier"] = mult
+    out["age_risk_tag"] = tags
     return out
 
+def load_age_curved_stats(years=(2024, 2023, 2022)) -> pd.DataFrame:
+    """
+    Latest available season stats (falling back to top_320_players.csv) with
+    the age curve applied. Recomputed only when the source file changes.
+    """
+    data_dir = get_data_dir()
+    names = [f"nfl_player_stats_{y}.csv" for y in years] + ["top_320_players.csv"]
+    path = next((data_dir / n for n in names if (data_dir / n).exists()), None)
+    if path is None:
+        raise FileNotFoundError(f"No player stats or top_320_players.csv in {data_dir}")
+    return cached_frame(f"age_curve:{path}", [path], lambda: apply_age_curve(pd.read_csv(path)))
+
+# ------------------------------------------------------------
+# Strength of schedule (derived from the season/weekly CSVs)
+# ------------------------------------------------------------
+def load_sos_frame(position: str = "WR", weeks=None):
+    """
+    utils.sos.load_sos for the data dir (optionally last `weeks` weekly
+    periods), rebuilt only when a source CSV changes.
+    """
+    from utils.sos import load_sos, sos_source_paths
+
+    data_dir = get_data_dir()
+    return cached_frame(f"sos:{position}:{weeks or 'all'}", sos_source_paths(data_dir),
+                        lambda: load_sos(data_dir, position=position, weeks=weeks))
+
 # ------------------------------------------------------------
 # Spike week from weekly data (expects per-game PPR)
 # ------------------------------------------------------------
-def compute_spike_week(weekly_df: pd.DataFrame) -> pd.DataFrame:
+DEFAULT_OVER_THRESHOLDS = (20, 25, 30)
+DEFAULT_UNDER_THRESHOLDS = (5, 10, 15)
+MAX_THRESHOLDS = 10  # per side
+
+def _threshold_label(t) -> str:
+    return f"{float(t):g}"
+
+def parse_thresholds(text, default):
+    """
+    '20,25,30' -> (20.0, 25.0, 30.0); blank -> default. Raises ValueError on
+    junk, nan/inf, or more than MAX_THRESHOLDS values (each one widens the
+    per-player bincount).
+    """
+    if text is None or not str(text).strip():
+        return tuple(float(t) for t in default)
+    vals = sorted({float(t) for t in str(text).replace(";", ",").split(",") if t.strip()})
+    if not vals:
+        raise ValueError(f"No thresholds in {text!r}")
+    if not all(math.isfinite(v) for v in vals):
+        raise ValueError(f"Thresholds must be finite numbers: {text!r}")
+    if len(vals) > MAX_THRESHOLDS:
+        raise ValueError(f"At most {MAX_THRESHOLDS} thresholds, got {len(vals)}")
+    return tuple(vals)
+
+def compute_spike_week(weekly_df: pd.DataFrame, over=DEFAULT_OVER_THRESHOLDS,
+                       under=DEFAULT_UNDER_THRESHOLDS) -> pd.DataFrame:
     """
     Expects columns:
       - 'player' or 'player_display_name'
       - 'fantasy_points_ppr' (preferred) OR 'ppr_pts'
     Returns a DataFrame with boom/bust counts and Spike Week Score.
+
+    Every game is binned once against the union of thresholds (ties with a
+    threshold get their own bin, since over/under are strict), counted per
+    player with one bincount, and each over_X / under_X count is read off the
+    cumulative bin counts. Boom weights are 1, 2, 3, ... by ascending over
+    threshold; bust weights are ..., 2, 1.5, 1 by ascending under threshold
+    (the defaults reproduce the original 20/25/30 and 5/10/15 scoring).
     """
     name_col = "player_display_name" if "player_display_name" in weekly_df.columns else "player"
     ppr_col = "fantasy_points_ppr" if "fantasy_points_ppr" in weekly_df.columns else ("ppr_pts" if "ppr_pts" in weekly_df.columns else None)
     if not ppr_col:
         raise ValueError("Weekly DF must include 'fantasy_points_ppr' or 'ppr_pts' column.")
 
-    df = weekly_df[[name_col, ppr_col]].rename(columns={name_col:"player_name", ppr_col:"ppr"}).copy()
-    total = df.groupby("player_name").size().rename("total_games")
-
-    def over(t): return (df[df["ppr"] > t].groupby("player_name").size().rename(f"over_{t}_ppr_count"))
-    def under(t): return (df[df["ppr"] < t].groupby("player_name").size().rename(f"under_{t}_ppr_count"))
-
-    merged = pd.concat([total, over(20), over(25), over(30), under(5), under(10), under(15)], axis=1).fillna(0)
-    merged = merged.reset_index()
-
-    merged["boom_score"] = merged["over_20_ppr_count"]*1 + merged["over_25_ppr_count"]*2 + merged["over_30_ppr_count"]*3
-    merged["bust_score"] = merged["under_5_ppr_count"]*2 + merged["under_10_ppr_count"]*1.5 + merged["under_15_ppr_count"]*1
+    over = sorted({float(t) for t in over})
+    under = sorted({float(t) for t in under})
+    edges = np.array(sorted(set(over) | set(under)), dtype="float64")
+
+    codes, players = pd.factorize(weekly_df[name_col], sort=True)
+    keep = codes >= 0                       # rows without a player name are dropped (as groupby did)
+    codes = codes[keep]
+    ppr = pd.to_numeric(weekly_df[ppr_col], errors="coerce").to_numpy(dtype="float64")[keep]
+    n_players = len(players)
+
+    # bin 2*i: strictly between edges[i-1] and edges[i]; bin 2*i+1: exactly edges[i]
+    i = np.digitize(ppr, edges, right=True)             # number of edges < ppr
+    on_edge = (i < len(edges)) & (ppr == edges[np.minimum(i, len(edges) - 1)])
+    bins = 2 * i + on_edge
+    n_bins = 2 * len(edges) + 1
+    valid = ~np.isnan(ppr)                              # NaN counts as a game but in no bucket
+
+    total = np.bincount(codes, minlength=n_players)
+    counts = np.bincount(codes[valid] * n_bins + bins[valid], minlength=n_players * n_bins)
+    cum = np.cumsum(counts.reshape(n_players, n_bins), axis=1)   # cum[:, j] = games in bins <= j
+    n_valid = cum[:, -1]
+    edge_pos = {t: k for k, t in enumerate(edges)}
+
+    out = {"player_name": players, "total_games": total}
+    boom = np.zeros(n_players)
+    bust = np.zeros(n_players)
+    for w, t in enumerate(over, start=1):
+        col = n_valid - cum[:, 2 * edge_pos[t] + 1]      # games > t
+        out[f"over_{_threshold_label(t)}_ppr_count"] = col
+        boom += w * col
+    for k, t in enumerate(under):
+        col = cum[:, 2 * edge_pos[t]]                    # games < t
+        out[f"under_{_threshold_label(t)}_ppr_count"] = col
+        bust += (1 + 0.5 * (len(under) - 1 - k)) * col
+
+    merged = pd.DataFrame(out)
+    merged["boom_score"] = boom
+    merged["bust_score"] = bust
     merged["spike_week_score"] = merged["boom_score"] - merged["bust_score"]
 
     merged = merged.sort_values("spike_week_score", ascending=False)
     return merged
+
+def load_spike_week(path, over=DEFAULT_OVER_THRESHOLDS, under=DEFAULT_UNDER_THRESHOLDS) -> pd.DataFrame:
+    """compute_spike_week over a weekly CSV, cached per threshold set until the file changes."""
+    path = Path(path)
+    key = f"spike_week:{path.resolve()}:{','.join(map(_threshold_label, over))}|{','.join(map(_threshold_label, under))}"
+    return cached_frame(key, [path], lambda: compute_spike_week(pd.read_csv(path), over=over, under=under))
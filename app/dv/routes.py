@@ -1,26 +1,22 @@
 # app/dv/routes.py
 
-from flask import render_template, current_app, request, flash
+from flask import render_template, current_app, request, flash, abort, jsonify, url_for
 from . import dv_bp
-from .dv_data import (
-    load_schedule,
-    load_top_players,
-    load_player_stats,
-    load_rookie_rankings,
-    apply_age_curve,
-    compute_spike_week,
-    get_data_dir,
-)
-import pandas as pd
 from pathlib import Path
-from utils.sos import load_sos  # SoS helper
+
+# dv_data / utils.sos pull in pandas, so they are imported on first use
+# inside each route rather than when the blueprint is registered.
 
 @dv_bp.context_processor
 def inject_dv_defaults():
-    return {"dv_data_dir": str(get_data_dir())}
+    # resolved once at app start (init_data_dir); no filesystem probing per render
+    from .data_dir import init_data_dir
+    return {"dv_data_dir": str(init_data_dir() or "")}
 
 @dv_bp.route("/schedules")
 def schedules():
+    from .dv_data import load_schedule, load_sos_frame
+
     year = int(request.args.get("year", 2025))
     try:
         df = load_schedule(year)
@@ -30,7 +26,7 @@ def schedules():
     except Exception as e:
         # If schedule isn't found, show SoS instead of an empty page
         try:
-            sos_df = load_sos(Path(get_data_dir()), position="WR")
+            sos_df = load_sos_frame(position="WR")
         except Exception:
             sos_df = None
         if sos_df is None or sos_df.empty:
@@ -45,39 +41,42 @@ def schedules():
                 columns=list(sos_df.columns),
             )
 
-@dv_bp.route("/rookies")
-def rookies():
+# ------------------------------------------------------------
+# Table pages
+# Each builder returns (frame or None, display columns, default sort, messages);
+# the HTML route and the JSON endpoint share it, and utils.table_query applies
+# ?q= / f_<col>= / sort / dir / page / size so only one page is rendered.
+# ------------------------------------------------------------
+def _rookies_table(args):
+    from .dv_data import load_rookie_rankings
+
     df = load_rookie_rankings()
     if df.empty:
-        flash("rookie_rankings.csv not found in DraftVader data_files. Drop one in to populate this page.", "warning")
-    return render_template("dv/rookies.html", table=df.to_dict(orient="records"), columns=list(df.columns) if not df.empty else [])
-
-@dv_bp.route("/projections")
-def projections():
-    # Try latest player stats; fall back to top_320 if stats not found
-    df = pd.DataFrame()
-    for year in (2024, 2023, 2022):
-        try:
-            df = load_player_stats(year)
-            break
-        except Exception:
-            continue
+        return None, [], None, [("rookie_rankings.csv not found in DraftVader data_files. Drop one in to populate this page.", "warning")]
+    return df, list(df.columns), None, []
 
-    if df.empty:
-        try:
-            df = load_top_players()
-        except Exception as e:
-            flash(str(e), "error")
-            return render_template("dv/projections.html", table=[], columns=[])
+def _projections_table(args):
+    import pandas as pd
+    from .dv_data import load_age_curved_stats, load_sos_frame
 
-    # ---- Age curve (adds age_curve_multiplier, age_risk_tag) ----
-    df = apply_age_curve(df)
+    # Latest player stats (fall back to top_320) with age_curve_multiplier / age_risk_tag
+    try:
+        df = load_age_curved_stats()
+    except Exception as e:
+        return None, [], None, [(str(e), "error")]
 
-    # ---- Strength of Schedule (merge on opponent_team if present) ----
+    # ---- Strength of Schedule (merge on opponent_team if present; ?sos_weeks=N for a recent window) ----
+    messages = []
     if "opponent_team" in df.columns:
+        sos_weeks = args.get("sos_weeks", type=int)
+        if sos_weeks is not None and sos_weeks < 1:
+            messages.append((f"sos_weeks must be 1 or more (got {sos_weeks}); showing the full-season SoS.", "warning"))
+            sos_weeks = None
         try:
-            sos_df = load_sos(Path(get_data_dir()), position="WR")
-        except Exception:
+            sos_df = load_sos_frame(position="WR", weeks=sos_weeks)
+        except Exception as e:
+            current_app.logger.exception("SoS load failed")
+            messages.append((f"Strength of schedule unavailable: {e}", "warning"))
             sos_df = None
         if sos_df is not None and not sos_df.empty:
             df = df.merge(sos_df, on="opponent_team", how="left")
@@ -104,48 +103,123 @@ def projections():
         ]
         if c in df.columns
     ]
+    return df, display_cols, None, messages
+
+def _transactions_table(args):
+    from .data_dir import get_data_dir
+    from .dv_data import _read_csv
+
+    # This route expects a local CSV 'transactions_YYYYMM.csv' if scraping isn't available.
+    month = args.get("month")  # format YYYYMM
+    if not month:
+        return None, [], None, [("Add ?month=YYYYMM to the URL to view a local transactions CSV export (e.g., /dv/transactions?month=202507).", "info")]
+    csv_name = f"transactions_{month}.csv"
+    if not (Path(get_data_dir()) / csv_name).exists():
+        return None, [], None, [(f"Couldn't find {csv_name} in data_files. Provide a local export or enable scraper.", "warning")]
+    df = _read_csv(csv_name)
+    return df, list(df.columns), None, []
+
+def _age_curve_table(args):
+    from .dv_data import load_age_curved_stats
+
+    # Latest season player stats if available, else top_320 (cached per file mtime)
+    try:
+        out = load_age_curved_stats()
+    except Exception as e:
+        return None, [], None, [(str(e), "error")]
+    return out, list(out.columns), None, []
+
+def _spike_week_table(args):
+    from .dv_data import (DEFAULT_OVER_THRESHOLDS, DEFAULT_UNDER_THRESHOLDS, MAX_THRESHOLDS, get_data_dir,
+                          load_spike_week, parse_thresholds)
+
+    messages = []
+    try:
+        over = parse_thresholds(args.get("over"), DEFAULT_OVER_THRESHOLDS)
+        under = parse_thresholds(args.get("under"), DEFAULT_UNDER_THRESHOLDS)
+    except ValueError:
+        messages.append((f"Thresholds must be up to {MAX_THRESHOLDS} comma-separated finite numbers "
+                         "(e.g. ?over=20,25,30&under=5,10,15); using defaults.", "warning"))
+        over = parse_thresholds(None, DEFAULT_OVER_THRESHOLDS)
+        under = parse_thresholds(None, DEFAULT_UNDER_THRESHOLDS)
+
+    weekly_param = args.get("weekly")
+    candidates = []
+    if weekly_param:
+        candidates.append(Path(weekly_param))
+    candidates += [Path(get_data_dir()) / n for n in ("wr_weekly_summary_01.csv", "weekly_ppr.csv")]
+    weekly_path = next((p for p in candidates if p.exists()), None)
+
+    if weekly_path is None:
+        messages.append(("Need a weekly per-game PPR CSV (columns: player or player_display_name and fantasy_points_ppr). "
+                         "Pass ?weekly=/path/to.csv or drop 'wr_weekly_summary_01.csv' into data_files.", "warning"))
+        return None, [], None, messages
 
+    # parsed + scored once per file version (dv_cache)
+    try:
+        out = load_spike_week(weekly_path, over=over, under=under)
+    except Exception as e:
+        return None, [], None, messages + [(str(e), "error")]
+    return out, list(out.columns), None, messages
+
+TABLES = {
+    "rookies": (_rookies_table, "dv/rookies.html"),
+    "projections": (_projections_table, "dv/projections.html"),
+    "transactions": (_transactions_table, "dv/transactions.html"),
+    "age-curve": (_age_curve_table, "dv/age_curve.html"),
+    "spike-week": (_spike_week_table, "dv/spike_week.html"),
+}
+
+def _query_table(name):
+    from utils.table_query import parse_table_args, query_frame
+
+    build, _ = TABLES[name]
+    df, columns, default_sort, messages = build(request.args)
+    tq = parse_table_args(request.args, columns, default_sort=default_sort)
+    return query_frame(df, tq, columns), messages
+
+def _forwarded_args():
+    """
+    Query args to carry into generated URLs. `name` would collide with the
+    table_data path argument and url_for reserves `_external`, `_scheme`, ...
+    """
+    return {k: v for k, v in request.args.to_dict().items() if k != "name" and not k.startswith("_")}
+
+def _table_url(**overrides):
+    """Current page URL with some query args replaced (sort links, pager)."""
+    args = _forwarded_args()
+    args.update({k: v for k, v in overrides.items() if v is not None})
+    return url_for(request.endpoint, **args)
+
+def _render_table(name, **ctx):
+    page, messages = _query_table(name)
+    for msg, category in messages:
+        flash(msg, category)
     return render_template(
-        "dv/projections.html",
-        table=df[display_cols].to_dict(orient="records"),
-        columns=display_cols,
+        TABLES[name][1],
+        table=page["rows"],
+        columns=page["columns"],
+        tp=page,
+        table_url=_table_url,
+        data_url=url_for("dv.table_data", name=name, **_forwarded_args()),
+        **ctx,
     )
 
+@dv_bp.route("/rookies")
+def rookies():
+    return _render_table("rookies")
+
+@dv_bp.route("/projections")
+def projections():
+    return _render_table("projections")
+
 @dv_bp.route("/transactions")
 def transactions():
-    # This route expects a local CSV 'transactions_YYYYMM.csv' if scraping isn't available.
-    month = request.args.get("month")  # format YYYYMM
-    df = pd.DataFrame()
-    if month:
-        csv_name = f"transactions_{month}.csv"
-        path = Path(get_data_dir()) / csv_name
-        if path.exists():
-            df = pd.read_csv(path)
-        else:
-            flash(f"Couldn't find {csv_name} in data_files. Provide a local export or enable scraper.", "warning")
-    else:
-        flash("Add ?month=YYYYMM to the URL to view a local transactions CSV export (e.g., /dv/transactions?month=202507).", "info")
-    return render_template("dv/transactions.html", month=month, table=df.to_dict(orient="records"), columns=list(df.columns) if not df.empty else [])
+    return _render_table("transactions", month=request.args.get("month"))
 
 @dv_bp.route("/age-curve")
 def age_curve():
-    # Apply to latest season player stats if available, else to top_320
-    df = pd.DataFrame()
-    for year in (2024, 2023, 2022):
-        try:
-            df = load_player_stats(year)
-            break
-        except Exception:
-            continue
-    if df.empty:
-        try:
-            df = load_top_players()
-        except Exception as e:
-            flash(str(e), "error")
-            return render_template("dv/age_curve.html", table=[], columns=[])
-
-    out = apply_age_curve(df)
-    return render_template("dv/age_curve.html", table=out.to_dict(orient="records"), columns=list(out.columns))
+    return _render_table("age-curve")
 
 @dv_bp.route("/spike-week")
 def spike_week():
@@ -154,32 +228,15 @@ def spike_week():
     Provide one of:
       - ?weekly=/absolute/path.csv
       - Place a file named 'wr_weekly_summary_01.csv' or 'weekly_ppr.csv' into data_files
+    Thresholds: ?over=20,25,30&under=5,10,15 (defaults shown).
     """
-    weekly_param = request.args.get("weekly")
-    weekly_df = None
-    candidates = []
-    if weekly_param:
-        candidates.append(Path(weekly_param))
-    candidates += [Path(get_data_dir()) / n for n in ("wr_weekly_summary_01.csv", "weekly_ppr.csv")]
-
-    for p in candidates:
-        if p.exists():
-            try:
-                weekly_df = pd.read_csv(p)
-                break
-            except Exception:
-                continue
-
-    if weekly_df is None:
-        flash("Need a weekly per-game PPR CSV (columns: player or player_display_name and fantasy_points_ppr). "
-              "Pass ?weekly=/path/to.csv or drop 'wr_weekly_summary_01.csv' into data_files.", "warning")
-        return render_template("dv/spike_week.html", table=[], columns=[])
-
-    try:
-        out = compute_spike_week(weekly_df)
-    except Exception as e:
-        flash(str(e), "error")
-        return render_template("dv/spike_week.html", table=[], columns=[])
-
-    return render_template("dv/spike_week.html", table=out.to_dict(orient="records"),
-                           columns=list(out.columns))
+    return _render_table("spike-week")
+
+@dv_bp.route("/data/<name>")
+def table_data(name):
+    """One page of a DV table as JSON (same query args as the HTML page) for incremental loading."""
+    if name not in TABLES:
+        abort(404)
+    page, messages = _query_table(name)
+    page["messages"] = [msg for msg, _ in messages]
+    return jsonify(page)
@@ -1,51 +1,156 @@
+# best_ball_boom_report.py
+
+import argparse
+
+import numpy as np
 import pandas as pd
 
-# --- USER PARAMETERS ---
-INPUT_CSV = "output/summaries/wr_weekly_summary_01.csv"    # Path to your SIMDaddy WR sim output CSV
+from best_ball_engine import PLAYOFF_WEEKS, build_season_samples
+
 BOOM_THRESHOLD = 18                              # Define "boom" week (e.g., 18+ fantasy points)
-PLAYOFF_WEEKS = [15, 16, 17]                     # Weeks considered as fantasy playoffs
-
-# --- LOAD DATA ---
-df = pd.read_csv(INPUT_CSV)
-
-# --- GENERATE REPORT ---
-def boom_week_report(
-    df,
-    fp_col="proj_fantasy_pts",
-    boom_thresh=BOOM_THRESHOLD,
-    playoff_weeks=PLAYOFF_WEEKS,
-    context_cols=("environment_boost", "notes")
-):
-    results = []
-    grouped = df.groupby(['player_id', 'player_name', 'team'])
-    for (pid, pname, team), g in grouped:
-        boom_weeks = g[g[fp_col] >= boom_thresh]['week'].tolist()
-        playoff_boom_weeks = [w for w in boom_weeks if w in playoff_weeks]
-        # Optional context
-        avg_playoff_env = (
-            g[g['week'].isin(playoff_boom_weeks)]['environment_boost'].mean()
-            if playoff_boom_weeks else None
-        )
-        playoff_notes = (
-            " | ".join(g[g['week'].isin(playoff_boom_weeks)]['notes'].dropna().astype(str))
-            if playoff_boom_weeks else ""
-        )
-        results.append({
-            'Player Name': pname,
-            'Team': team,
-            'Total Boom Weeks': len(boom_weeks),
-            'Playoff Boom Weeks': len(playoff_boom_weeks),
-            'Boom Weeks (List)': boom_weeks,
-            'Playoff Boom Weeks (List)': playoff_boom_weeks,
-            'Avg Playoff Env Boost': avg_playoff_env,
-            'Playoff Notes': playoff_notes
-        })
-    boom_df = pd.DataFrame(results)
+OUTPUT_CSV = "wr_best_ball_boom_week_report.csv"
+
+# Column candidates: sim_engine season frame first, legacy summary names second.
+PLAYER_COLS = ("wr_name", "player_name")
+POINTS_COLS = ("final_pts", "proj_fantasy_pts")
+ENV_COLS = ("env_boost", "environment_boost")
+
+def _pick(df, candidates, required=True):
+    for c in candidates:
+        if c in df.columns:
+            return c
+    if required:
+        raise KeyError(f"None of {candidates} found in frame")
+    return None
+
+# -------------------------------
+# BOOM WEEK REPORT
+# -------------------------------
+
+def boom_week_report(df, fp_col=None, boom_thresh=BOOM_THRESHOLD, playoff_weeks=PLAYOFF_WEEKS,
+                     player_col=None, env_col=None, notes_col="notes"):
+    """
+    Season-wide boom/bust counts per player from one grouped pass:
+    total boom weeks, playoff boom weeks, the week lists, mean env boost in
+    playoff boom weeks and the joined notes for those weeks.
+    """
+    fp_col = fp_col or _pick(df, POINTS_COLS)
+    player_col = player_col or _pick(df, PLAYER_COLS)
+    env_col = env_col or _pick(df, ENV_COLS, required=False)
+    keys = [c for c in ("player_id", player_col, "team") if c in df.columns]
+
+    pts = pd.to_numeric(df[fp_col], errors="coerce")
+    boom = pts >= boom_thresh
+    playoff_boom = boom & df["week"].isin(playoff_weeks)
+
+    frame = df.assign(_boom=boom, _playoff_boom=playoff_boom)
+    out = frame.groupby(keys, dropna=False, sort=False).agg(
+        total_boom=("_boom", "sum"),
+        playoff_boom=("_playoff_boom", "sum"),
+    )
+
+    booms = frame[boom].sort_values("week")
+    playoff_rows = booms[booms["week"].isin(playoff_weeks)]
+    out["boom_list"] = booms.groupby(keys, dropna=False, sort=False)["week"].agg(list)
+    out["playoff_list"] = playoff_rows.groupby(keys, dropna=False, sort=False)["week"].agg(list)
+    out["env"] = (playoff_rows.groupby(keys, dropna=False, sort=False)[env_col].mean()
+                  if env_col else np.nan)
+    if notes_col in df.columns:
+        noted = playoff_rows[playoff_rows[notes_col].notna()]
+        out["notes"] = (noted.assign(_note=noted[notes_col].astype(str))
+                        .groupby(keys, dropna=False, sort=False)["_note"].agg(" | ".join))
+    else:
+        out["notes"] = ""
+
+    out = out.reset_index()
+    empty_list = pd.Series([[]] * len(out), index=out.index)
+    boom_df = pd.DataFrame({
+        "Player Name": out[player_col],
+        "Team": out["team"] if "team" in out.columns else None,
+        "Total Boom Weeks": out["total_boom"].astype(int),
+        "Playoff Boom Weeks": out["playoff_boom"].astype(int),
+        "Boom Weeks (List)": out["boom_list"].where(out["boom_list"].notna(), empty_list),
+        "Playoff Boom Weeks (List)": out["playoff_list"].where(out["playoff_list"].notna(), empty_list),
+        "Avg Playoff Env Boost": out["env"],
+        "Playoff Notes": out["notes"].fillna(""),
+    })
     # Sort by playoff upside, then total boom weeks
-    boom_df = boom_df.sort_values(['Playoff Boom Weeks', 'Total Boom Weeks'], ascending=False)
-    return boom_df
+    return boom_df.sort_values(["Playoff Boom Weeks", "Total Boom Weeks"], ascending=False, kind="stable")
+
+# -------------------------------
+# BOOM PROBABILITIES
+# -------------------------------
+
+def boom_probabilities(samples, thresholds=(BOOM_THRESHOLD,), weeks=None):
+    """
+    P(pts >= threshold) per player, week and threshold from SeasonSamples.
+    Returns a long frame: player, week, threshold, boom_prob.
+    """
+    cols = samples.week_positions(weeks) if weeks is not None else list(range(len(samples.weeks)))
+    values = samples.values[:-1][:, cols, :]                   # drop the empty-slot row
+    t = np.asarray(thresholds, dtype=np.float64)
+    probs = (values[None, :, :, :] >= t[:, None, None, None]).mean(axis=3)   # (T, P, W)
+
+    T, P, W = probs.shape
+    return pd.DataFrame({
+        "player": np.tile(np.repeat(samples.player_ids, W), T),
+        "week": np.tile(np.asarray(samples.weeks)[cols], T * P),
+        "threshold": np.repeat(t, P * W),
+        "boom_prob": probs.ravel().round(4),
+    })
+
+def playoff_boom_summary(samples, thresholds=(BOOM_THRESHOLD,), playoff_weeks=PLAYOFF_WEEKS):
+    """Wide per-player view: boom probability per playoff week + P(>=1 playoff boom)."""
+    probs = boom_probabilities(samples, thresholds, playoff_weeks)
+    wide = probs.pivot_table(index=["player", "threshold"], columns="week", values="boom_prob")
+    wide.columns = [f"P(boom) wk{w}" for w in wide.columns]
+
+    cols = samples.week_positions(playoff_weeks)
+    t = np.asarray(thresholds, dtype=np.float64)  # same dtype as boom_probabilities, so the reindex lines up
+    any_boom = (samples.values[:-1][None, :, cols, :] >= t[:, None, None, None]).any(axis=2).mean(axis=2)
+    wide["P(any playoff boom)"] = pd.Series(
+        any_boom.ravel().round(4),
+        index=pd.MultiIndex.from_product([t, samples.player_ids]).swaplevel(),
+    ).reindex(wide.index)
+    return wide.reset_index()
+
+def playoff_boom_columns(summary):
+    """
+    One row per player: playoff_boom_summary's per-threshold rows pivoted into
+    columns such as 'P(boom>=20) wk15' and 'P(any playoff boom>=20)'.
+    """
+    wide = summary.set_index(["player", "threshold"]).unstack("threshold")
+    wide.columns = [c.replace("boom)", f"boom>={t:g})") for c, t in wide.columns]
+    return wide.reset_index()
+
+# -------------------------------
+# CLI
+# -------------------------------
+
+def main():
+    from best_ball_simulator import load_season_frame
+
+    parser = argparse.ArgumentParser(description="Best-ball boom week report")
+    parser.add_argument("--input", type=str, default=None, help="Season projection CSV (default: full-season export)")
+    parser.add_argument("--threshold", type=float, nargs="+", default=[BOOM_THRESHOLD], help="Boom threshold(s); the first drives the week counts")
+    parser.add_argument("--playoff-weeks", type=int, nargs="+", default=PLAYOFF_WEEKS, help="Fantasy playoff weeks")
+    parser.add_argument("--sims", type=int, default=0, help="Simulations per player-week for boom probabilities (0 = skip)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--output", type=str, default=OUTPUT_CSV, help="Report CSV path")
+    args = parser.parse_args()
+
+    df = load_season_frame(args.input)
+    report = boom_week_report(df, boom_thresh=args.threshold[0], playoff_weeks=args.playoff_weeks)
+
+    if args.sims > 0:
+        samples = build_season_samples(df, simulations=args.sims, seed=args.seed,
+                                       player_col=_pick(df, PLAYER_COLS), pts_col=_pick(df, POINTS_COLS))
+        probs = playoff_boom_columns(playoff_boom_summary(samples, args.threshold, args.playoff_weeks))
+        report = report.merge(probs.rename(columns={"player": "Player Name"}), on="Player Name", how="left")
+
+    report.to_csv(args.output, index=False)
+    print(report.head(20))
+    print(f"✅ Boom report saved to {args.output}")
 
-# --- RUN REPORT ---
-boom_week_summary = boom_week_report(df)
-boom_week_summary.to_csv("wr_best_ball_boom_week_report.csv", index=False)
-print(boom_week_summary.head(20))
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# best_ball_engine.py
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# DEFAULTS
+# -------------------------------
+
+N_STARTERS = 3                     # WR starters counted each week
+REGULAR_SEASON_WEEKS = list(range(1, 15))
+PLAYOFF_WEEKS = [15, 16, 17]
+DEFAULT_STD_DEV = 2.0              # same spread project_wr_week samples with
+SAMPLE_MEMORY_BUDGET = 256 * 1024 * 1024  # bytes per vectorized roster chunk
+
+# -------------------------------
+# SEASON SAMPLES
+# -------------------------------
+
+class SeasonSamples:
+    """
+    Per-week simulated fantasy points for a pool of players.
+
+    values: float32 array shaped (players, weeks, sims). A final all-zero
+    "empty slot" row is appended so padded rosters (player index -1) score 0.
+    """
+
+    def __init__(self, player_ids, weeks, values):
+        values = np.asarray(values, dtype=np.float32)
+        if values.shape[:2] != (len(player_ids), len(weeks)):
+            raise ValueError(f"Sample shape {values.shape} does not match {len(player_ids)} players x {len(weeks)} weeks")
+        self.player_ids = list(player_ids)
+        self.weeks = list(weeks)
+        self.index = {pid: i for i, pid in enumerate(self.player_ids)}
+        self.values = np.concatenate([np.nan_to_num(values), np.zeros((1,) + values.shape[1:], np.float32)])
+
+    @property
+    def n_sims(self):
+        return self.values.shape[2]
+
+    def week_positions(self, weeks):
+        pos = {w: i for i, w in enumerate(self.weeks)}
+        return [pos[w] for w in weeks if w in pos]
+
+    def encode(self, roster):
+        """Player ids -> integer rows (unknown players map to the empty slot)."""
+        return np.array([self.index.get(pid, -1) for pid in roster], dtype=np.int64)
+
+def build_season_samples(season_df, simulations=1000, player_col="wr_name", pts_col="final_pts",
+                         std_dev=DEFAULT_STD_DEV, seed=None):
+    """
+    Draws (players, weeks, sims) samples from a season projection frame in one
+    vectorized normal draw. Per-row spread comes from the p25/p75 columns when
+    the sim wrote them, otherwise `std_dev`. Missing player-weeks (byes) are 0.
+    """
+    df = season_df[[player_col, "week", pts_col] +
+                   [c for c in ("adj_pts_p25", "adj_pts_p75") if c in season_df.columns]].copy()
+    df = df.dropna(subset=[player_col, "week"]).drop_duplicates([player_col, "week"], keep="last")
+
+    players = pd.Index(df[player_col].unique())
+    weeks = sorted(int(w) for w in df["week"].unique())
+    p_idx = players.get_indexer(df[player_col])
+    w_idx = pd.Index(weeks).get_indexer(df["week"].astype(int))
+
+    mean = np.zeros((len(players), len(weeks)), np.float32)
+    scale = np.zeros_like(mean)
+    mean[p_idx, w_idx] = pd.to_numeric(df[pts_col], errors="coerce").fillna(0).to_numpy()
+    if "adj_pts_p25" in df.columns and "adj_pts_p75" in df.columns:
+        iqr = (pd.to_numeric(df["adj_pts_p75"], errors="coerce") - pd.to_numeric(df["adj_pts_p25"], errors="coerce"))
+        spread = (iqr / 1.349).fillna(std_dev).clip(lower=0).to_numpy()
+    else:
+        spread = np.full(len(df), std_dev)
+    scale[p_idx, w_idx] = spread
+
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((len(players), len(weeks), simulations), dtype=np.float32)
+    values = np.clip(mean[:, :, None] + scale[:, :, None] * noise, 0, None)
+    return SeasonSamples(players, weeks, values)
+
+# -------------------------------
+# TOP-K SCORING
+# -------------------------------
+
+def _top_k_sum(sub, k):
+    """Sum of the k largest along axis -3 (the roster axis) via np.partition."""
+    n = sub.shape[-3]
+    if n <= k:
+        return sub.sum(axis=-3)
+    return np.partition(sub, n - k, axis=-3)[..., n - k:, :, :].sum(axis=-3)
+
+def weekly_scores(samples, roster_rows, n_starters=N_STARTERS):
+    """Best-ball score per (week, sim) for one encoded roster."""
+    return _top_k_sum(samples.values[roster_rows], n_starters)
+
+def score_rosters(samples, rosters, n_starters=N_STARTERS, weeks=None, memory_budget=SAMPLE_MEMORY_BUDGET):
+    """
+    Vectorized best-ball scoring for many rosters at once.
+
+    rosters: int array (n_rosters, roster_size) of sample rows, padded with -1.
+    Returns season totals shaped (n_rosters, sims) over `weeks` (default: all).
+    Rosters are processed in chunks sized to `memory_budget`.
+    """
+    rosters = np.atleast_2d(np.asarray(rosters, dtype=np.int64))
+    cols = samples.week_positions(weeks) if weeks is not None else slice(None)
+    values = samples.values[:, cols, :]
+    per_roster = rosters.shape[1] * values.shape[1] * values.shape[2] * values.itemsize
+    chunk = max(1, int(memory_budget // max(per_roster, 1)))
+
+    totals = np.empty((rosters.shape[0], values.shape[2]), np.float32)
+    for start in range(0, rosters.shape[0], chunk):
+        block = values[rosters[start:start + chunk]]          # (r, k, W, S)
+        totals[start:start + chunk] = _top_k_sum(block, n_starters).sum(axis=1)
+    return totals
+
+# -------------------------------
+# ROSTER REPORT
+# -------------------------------
+
+def advance_rates(regular_totals, advance_slots=2):
+    """
+    regular_totals: (n_rosters, sims) regular-season totals for one league.
+    Returns the fraction of sims each roster finishes in the top `advance_slots`.
+    """
+    n = regular_totals.shape[0]
+    if n <= advance_slots:
+        return np.ones(n)
+    rank = (-regular_totals).argsort(axis=0).argsort(axis=0)
+    return (rank < advance_slots).mean(axis=1)
+
+def evaluate_roster(samples, roster, n_starters=N_STARTERS, regular_weeks=REGULAR_SEASON_WEEKS,
+                    playoff_weeks=PLAYOFF_WEEKS, advance_threshold=None, percentiles=(10, 50, 90)):
+    """
+    Summary for one roster (player ids):
+      - expected regular-season and total best-ball score
+      - advance rate: P(regular-season total >= advance_threshold) when given
+      - playoff-week score distribution (mean + percentiles per week)
+    """
+    rows = samples.encode(roster)
+    weekly = weekly_scores(samples, rows, n_starters)                   # (W, S)
+    reg_cols = samples.week_positions(regular_weeks)
+    po_cols = samples.week_positions(playoff_weeks)
+
+    regular_total = weekly[reg_cols].sum(axis=0)
+    report = {
+        "expected_score": float(weekly.sum(axis=0).mean()),
+        "expected_regular_season": float(regular_total.mean()),
+        "weekly_mean": dict(zip(samples.weeks, weekly.mean(axis=1).round(2).tolist())),
+        "unknown_players": [pid for pid, r in zip(roster, rows) if r < 0],
+    }
+    if advance_threshold is not None:
+        report["advance_rate"] = float((regular_total >= advance_threshold).mean())
+
+    playoff = {}
+    for week, col in zip([w for w in playoff_weeks if w in samples.weeks], po_cols):
+        pct = np.percentile(weekly[col], percentiles)
+        playoff[week] = {"mean": round(float(weekly[col].mean()), 2),
+                         **{f"p{p}": round(float(v), 2) for p, v in zip(percentiles, pct)}}
+    report["playoff_weeks"] = playoff
+    if po_cols:
+        report["expected_playoff_score"] = float(weekly[po_cols].sum(axis=0).mean())
+    return report
+
+def evaluate_league(samples, rosters, n_starters=N_STARTERS, regular_weeks=REGULAR_SEASON_WEEKS,
+                    playoff_weeks=PLAYOFF_WEEKS, advance_slots=2):
+    """
+    Scores every roster in one league (list of player-id lists) against the
+    same simulations. Returns a DataFrame with expected scores and advance rate.
+    """
+    size = max(len(r) for r in rosters)
+    encoded = np.full((len(rosters), size), -1, np.int64)
+    for i, r in enumerate(rosters):
+        encoded[i, :len(r)] = samples.encode(r)
+
+    regular = score_rosters(samples, encoded, n_starters, weeks=regular_weeks)
+    playoff = score_rosters(samples, encoded, n_starters, weeks=playoff_weeks)
+    return pd.DataFrame({
+        "roster": range(len(rosters)),
+        "expected_regular_season": regular.mean(axis=1),
+        "expected_playoff_score": playoff.mean(axis=1),
+        "advance_rate": advance_rates(regular, advance_slots),
+    })
@@ -1,62 +1,207 @@
-import pandas as pd
+# best_ball_simulator.py
+
+import argparse
 import glob
-from collections import Counter
+import os
+from multiprocessing import Pool, cpu_count
+
+import numpy as np
+import pandas as pd
 
-# --- CONFIG: Edit this section for your league ---
-n_starters = 3  # Number of WR starters in best ball each week
+from config import EXPORT_FULL_SEASON_FILE
+from utils.player_index import name_to_id_map, normalize_name_series
+from best_ball_engine import (
+    N_STARTERS,
+    REGULAR_SEASON_WEEKS,
+    PLAYOFF_WEEKS,
+    build_season_samples,
+    score_rosters,
+    advance_rates,
+    evaluate_roster
+)
 
-# Put your drafted WRs here!
-my_wr_list = [
-    "Ja'Marr Chase", "Amon-Ra St. Brown", "Justin Jefferson",
-    "Garrett Wilson", "CeeDee Lamb", "Tyreek Hill", "Puka Nacua"
-]
+PARALLEL_MIN_ROSTERS = 20000   # below this a single process is faster than pickling work out
+SUMMARY_GLOB = "output/summaries/wr_weekly_summary_*.csv"
 
-# --- LOAD DATA ---
-# If you have multiple weeks, put all CSVs in output/summaries/ with the pattern below.
-files = sorted(glob.glob("output/summaries/wr_weekly_summary_*.csv"))
-if not files:
-    files = ["wr_weekly_summary_01.csv"]  # fallback
+# -------------------------------
+# LOADERS
+# -------------------------------
 
-all_weeks = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
+def player_keys(names):
+    """
+    Player id from the identity index (normalized name when unknown), so
+    "AJ Brown" on a roster meets "A.J. Brown" in the projections.
+    """
+    clean = normalize_name_series(pd.Series(names))
+    try:
+        ids = clean.map(name_to_id_map())
+    except Exception:
+        ids = pd.Series(pd.NA, index=clean.index, dtype="object")
+    return ids.fillna("name:" + clean).astype("string")   # missing names stay <NA>
 
-# If week column is missing (some exports), add it from the filename as a fallback
-if 'week' not in all_weeks.columns:
+def load_season_frame(path=None):
+    """
+    Season projection frame (one row per player-week). Uses `path`, else the
+    full-season export, else the weekly summary CSVs concatenated.
+    """
+    if path:
+        return pd.read_csv(path)
+    if os.path.exists(EXPORT_FULL_SEASON_FILE):
+        return pd.read_csv(EXPORT_FULL_SEASON_FILE)
+
+    files = sorted(glob.glob(SUMMARY_GLOB))
+    if not files:
+        raise FileNotFoundError(f"No season projections found ({EXPORT_FULL_SEASON_FILE} or {SUMMARY_GLOB})")
+    frames = []
     for i, f in enumerate(files, 1):
-        all_weeks.loc[all_weeks.index // len(files) == i-1, 'week'] = i
-    all_weeks['week'] = all_weeks['week'].astype(int)
-
-# --- FILTER TO YOUR ROSTER ---
-team_df = all_weeks[all_weeks["wr_name"].isin(my_wr_list)].copy()
-
-# --- BEST BALL SCORING ---
-weekly_results = []
-for week in sorted(team_df['week'].unique()):
-    week_df = team_df[team_df['week'] == week].sort_values("final_pts", ascending=False)
-    top_wr = week_df.head(n_starters)
-    total = top_wr["final_pts"].sum()
-    weekly_results.append({
-        "week": week,
-        "score": total,
-        "starters": list(top_wr["wr_name"]),
-        "starter_points": list(top_wr["final_pts"])
-    })
-
-weekly_df = pd.DataFrame(weekly_results)
-
-# --- OUTPUT ---
-print("Weekly best ball scores:\n", weekly_df)
-print("\nSeason total:", weekly_df["score"].sum())
-print("Mean weekly score:", weekly_df["score"].mean())
-
-# WR starter appearance count
-starter_counts = Counter()
-for starters in weekly_df["starters"]:
-    for wr in starters:
-        starter_counts[wr] += 1
-print("\nWR Starter Appearances:")
-for wr, count in starter_counts.most_common():
-    print(f"{wr}: {count}")
-
-# Save to CSV
-weekly_df.to_csv("best_ball_simulation_results.csv", index=False)
-print("\n✅ Results saved to best_ball_simulation_results.csv")
+        df = pd.read_csv(f)
+        if "week" not in df.columns:
+            df["week"] = i
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+def load_rosters(path):
+    """
+    Rosters CSV with one row per rostered player:
+    columns `roster_id`, `player` and optionally `league_id`.
+    """
+    df = pd.read_csv(path)
+    missing = {"roster_id", "player"} - set(df.columns)
+    if missing:
+        raise ValueError(f"Rosters file is missing columns: {', '.join(sorted(missing))}")
+    if "league_id" not in df.columns:
+        df["league_id"] = 0
+    return df
+
+def build_player_samples(season_df, player_col="wr_name", **kwargs):
+    """build_season_samples keyed by player_keys instead of the raw name string."""
+    return build_season_samples(season_df.assign(_player_key=player_keys(season_df[player_col])),
+                                player_col="_player_key", **kwargs)
+
+def encode_rosters(rosters_df, samples):
+    """
+    Maps player names (via player_keys) to sample rows and pivots to a padded
+    (n_rosters, max_size) int matrix (-1 = empty/unknown).
+    Returns (keys_df, matrix, sizes, unknown_counts).
+    """
+    df = rosters_df[["league_id", "roster_id", "player"]].copy()
+    df["row"] = player_keys(df["player"]).map(samples.index).fillna(-1).astype(np.int64)
+    keys = df[["league_id", "roster_id"]].drop_duplicates().reset_index(drop=True)
+    roster_pos = pd.MultiIndex.from_frame(keys).get_indexer(pd.MultiIndex.from_frame(df[["league_id", "roster_id"]]))
+    slot = df.groupby(["league_id", "roster_id"], sort=False).cumcount().to_numpy()
+
+    matrix = np.full((len(keys), slot.max() + 1 if len(slot) else 1), -1, np.int64)
+    matrix[roster_pos, slot] = df["row"].to_numpy()
+    unknown = np.bincount(roster_pos[df["row"].to_numpy() < 0], minlength=len(keys))
+    sizes = np.bincount(roster_pos, minlength=len(keys))
+    return keys, matrix, sizes, unknown
+
+# -------------------------------
+# PARALLEL SCORING
+# -------------------------------
+
+_WORKER_SAMPLES = None
+
+def _init_worker(samples):
+    global _WORKER_SAMPLES
+    _WORKER_SAMPLES = samples
+
+def _score_chunk(args):
+    rosters, n_starters, regular_weeks, playoff_weeks = args
+    return (score_rosters(_WORKER_SAMPLES, rosters, n_starters, weeks=regular_weeks),
+            score_rosters(_WORKER_SAMPLES, rosters, n_starters, weeks=playoff_weeks))
+
+def _score_all(samples, matrix, n_starters, regular_weeks, playoff_weeks, workers):
+    if workers <= 1 or len(matrix) < PARALLEL_MIN_ROSTERS:
+        return (score_rosters(samples, matrix, n_starters, weeks=regular_weeks),
+                score_rosters(samples, matrix, n_starters, weeks=playoff_weeks))
+
+    chunks = np.array_split(matrix, workers * 4)
+    # Samples are shipped once per worker via the initializer, not once per chunk.
+    with Pool(workers, initializer=_init_worker, initargs=(samples,)) as pool:
+        parts = pool.map(_score_chunk, [(c, n_starters, regular_weeks, playoff_weeks) for c in chunks])
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+# -------------------------------
+# BATCH EVALUATION
+# -------------------------------
+
+def evaluate_rosters(season_df, rosters_df, n_starters=N_STARTERS, simulations=500, seed=None,
+                     regular_weeks=REGULAR_SEASON_WEEKS, playoff_weeks=PLAYOFF_WEEKS,
+                     advance_slots=2, workers=None):
+    """
+    Scores every roster in `rosters_df` against one shared set of simulations.
+
+    Returns one row per (league_id, roster_id) with expected regular-season and
+    playoff best-ball scores, and the advance rate within its league (share of
+    sims finishing in the top `advance_slots` of that league).
+    """
+    samples = build_player_samples(season_df, simulations=simulations, seed=seed)
+    keys, matrix, sizes, unknown = encode_rosters(rosters_df, samples)
+
+    workers = cpu_count() if workers is None else workers
+    regular, playoff = _score_all(samples, matrix, n_starters, regular_weeks, playoff_weeks, workers)
+
+    adv = np.empty(len(keys))
+    for _, idx in keys.groupby("league_id", sort=False).indices.items():
+        adv[idx] = advance_rates(regular[idx], advance_slots)
+
+    out = keys.copy()
+    out["n_players"] = sizes
+    out["n_unknown"] = unknown
+    out["expected_regular_season"] = regular.mean(axis=1, dtype=np.float64).round(2)
+    out["regular_season_p10"] = np.percentile(regular, 10, axis=1).round(2)
+    out["regular_season_p90"] = np.percentile(regular, 90, axis=1).round(2)
+    out["expected_playoff_score"] = playoff.mean(axis=1, dtype=np.float64).round(2)
+    out["advance_rate"] = adv.round(4)
+    return out
+
+def write_results(df, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    df.to_csv(path, index=False)
+    print(f"✅ Results saved to {path}")
+
+# -------------------------------
+# CLI
+# -------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Best-ball roster evaluation")
+    parser.add_argument("--rosters", type=str, help="CSV of rosters (league_id, roster_id, player)")
+    parser.add_argument("--players", type=str, help="Comma-separated player names for a single roster")
+    parser.add_argument("--season", type=str, default=None, help="Season projection CSV (default: full-season export)")
+    parser.add_argument("--output", type=str, default="best_ball_simulation_results.csv", help="Output CSV")
+    parser.add_argument("--starters", type=int, default=N_STARTERS, help="Starters counted each week")
+    parser.add_argument("--sims", type=int, default=500, help="Simulations per player-week")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--advance-slots", type=int, default=2, help="Teams per league that advance")
+    args = parser.parse_args()
+
+    if not args.rosters and not args.players:
+        parser.error("Pass --rosters FILE or --players 'Name A,Name B,...'")
+
+    season_df = load_season_frame(args.season)
+
+    if args.players:
+        roster = [p.strip() for p in args.players.split(",") if p.strip()]
+        samples = build_player_samples(season_df, simulations=args.sims, seed=args.seed)
+        keys = player_keys(roster).tolist()
+        report = evaluate_roster(samples, keys, n_starters=args.starters)
+        print("Expected season score:", round(report["expected_score"], 2))
+        print("Playoff weeks:", report["playoff_weeks"])
+        unknown = set(report["unknown_players"])
+        if unknown:
+            print("⚠️ Not in projections:", ", ".join(n for n, k in zip(roster, keys) if k in unknown))
+        weekly_df = pd.DataFrame({"week": list(report["weekly_mean"]), "score": list(report["weekly_mean"].values())})
+        write_results(weekly_df, args.output)
+        return
+
+    rosters_df = load_rosters(args.rosters)
+    results = evaluate_rosters(season_df, rosters_df, n_starters=args.starters, simulations=args.sims,
+                               seed=args.seed, advance_slots=args.advance_slots, workers=args.workers)
+    print(results.sort_values("expected_regular_season", ascending=False).head(20))
+    write_results(results, args.output)
+
+if __name__ == "__main__":
+    main()
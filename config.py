@@ -24,9 +24,33 @@ WR_STATS_2024_FILE = DATA_DIR / PLAYER_PROFILER_DIR / "WR_STATS_2024.csv"
 DB_ALIGNMENT_FILE = DATA_DIR / PLAYER_PROFILER_DIR / "DB_STATS_2022_2023_2024.csv"
 BLENDED_WR_FILE = DATA_DIR / PLAYER_PROFILER_DIR / "BLENDED_WR_STATS.csv"
 BLENDED_DB_FILE = DATA_DIR / PLAYER_PROFILER_DIR / "BLENDED_DB_STATS.csv"
+PLAYER_PROFILER_STATE_FILE = DATA_DIR / PLAYER_PROFILER_DIR / "scrape_state.jsonl"
+PLAYER_PROFILER_SCRAPE_FILE = DATA_DIR / PLAYER_PROFILER_DIR / "WR_STATS_2024_scraped.csv"
 DEF_COVERAGE_TAGS_FILE = DATA_DIR / "DEF_TEAM_COVERAGE_TAGS.csv"
 STADIUM_ENV_FILE = DATA_DIR / "STADIUM_ENVIRONMENT_PROFILES.csv"
 WR_PROP_MARKET_FILE = DATA_DIR / "wr_prop_market.csv"
+PROP_SNAPSHOT_DB = DATA_DIR / "prop_snapshots.sqlite"
+PLAYER_INDEX_FILE = DATA_DIR / "player_index.json"
+SIM_RESULTS_DIR = DATA_DIR / "sim_results"
+INJURY_DB = DATA_DIR / "injuries.sqlite"
+HTTP_CACHE_DIR = DATA_DIR / "http_cache"
+
+# Files whose changes invalidate loaded sim inputs / cached sim results.
+SIM_INPUT_FILES = [
+    NFL_SCHEDULE_2025_FILE,
+    WR_STATS_2024_FILE,
+    DB_ALIGNMENT_FILE,
+    DEF_COVERAGE_TAGS_FILE,
+    STADIUM_ENV_FILE,
+]
+
+# -------------------------------
+# Simulation Jobs
+# -------------------------------
+MAX_SIM_WORKERS = int(os.getenv("SIM_MAX_WORKERS", "2"))   # concurrent running sim jobs
+SIM_JOB_TIMEOUT_MINUTES = 10                                # no heartbeat for this long = worker died
+SIM_RESULT_MAX_AGE_HOURS = 6                                # reuse a finished result this fresh
+SIM_WEATHER_REFRESH_MINUTES = 60                            # forecast boosts are re-fetched this often
 
 EXPORT_HTML_DIR = Path("html_output")
 EXPORT_FULL_SEASON_FILE = f"season_projection_output{FILENAME_SUFFIX}.csv"
@@ -131,6 +155,9 @@ class Config:
     # Toggle OAuth (optional)
     ENABLE_SOCIAL_LOGINS = False
 
+    # DV pages: in-process frame cache budget (parsed CSVs + derived tables)
+    DV_CACHE_MAX_MB = int(os.getenv("DV_CACHE_MAX_MB", "256"))
+
 
 # Uploads
 UPLOAD_FOLDER = os.path.join(BASE_DIR, "static", "avatars")
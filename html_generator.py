@@ -4,6 +4,8 @@
 import os
 import pandas as pd
 
+from utils.player_index import resolve_player
+
 # --- BEGIN TEAM COLORS ---
 TEAM_COLORS = {
     "CIN": "#FB4F14",
@@ -152,9 +154,12 @@ def generate_html_table(df):
     return "\n".join(rows)
 
 def get_headshot_url(wr_name, team):
-    # Replace this with your actual image source or player ID lookup
+    # Roster headshot via the shared player identity index (O(1) lookup)
+    player = resolve_player(wr_name)
+    if player and player.get("headshot_url"):
+        return player["headshot_url"]
+    # Fallback: slug pattern for static image hosts
     clean_name = wr_name.replace("'", "").replace(".", "").replace(" ", "-").lower()
-    # This pattern works for most static image hosts; you can replace as needed
     return f"https://sleepercdn.com/content/nfl/players/{clean_name}.jpg"
 
 def get_team_color(team):
@@ -0,0 +1,132 @@
+# market_blend.py
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    WR_PROP_MARKET_FILE,
+    PROP_SNAPSHOT_DB,
+    PROJECTION_SOURCE_TOGGLE
+)
+from utils.player_index import normalize_name, normalize_name_series, name_to_id_map
+
+# Fantasy scoring offsets applied on top of the posted prop lines.
+MARKET_REC_OFFSET = 0.5
+MARKET_YDS_OFFSET = 2.0
+MARKET_TD_DEFAULT = 0.4  # default if odds missing
+PROP_LINE_MAX_AGE_DAYS = 3  # ignore stored lines for games that kicked off longer ago than this
+
+PROP_MARKETS = ["player_receptions", "player_receiving_yards", "player_touchdowns"]
+
+# -------------------------------
+# NAME NORMALIZATION
+# -------------------------------
+
+# Name keys come from the shared player identity index so props, roster and
+# sim output all agree on how "A.J. Brown" / "AJ Brown" / "Marvin Harrison Jr." match.
+clean_name = normalize_name
+clean_name_series = normalize_name_series
+
+def load_clean_roster():
+    """Series normalized name (incl. aliases) -> gsis_id from the player identity index."""
+    return pd.Series(name_to_id_map(), dtype="string")
+
+# -------------------------------
+# MARKET TABLE
+# -------------------------------
+
+def load_latest_props(book=None):
+    """
+    Latest prop lines: the snapshot store when it exists, otherwise the
+    legacy wr_prop_market.csv export. Pulls prune games that kicked off; the
+    age cutoff also keeps last week's lines out when no pull has run since.
+    """
+    if os.path.exists(PROP_SNAPSHOT_DB):
+        from prop_store import PropStore, to_game_time
+        since = to_game_time(datetime.now(timezone.utc) - timedelta(days=PROP_LINE_MAX_AGE_DAYS))
+        return PropStore(PROP_SNAPSHOT_DB).latest(book=book, since=since)
+    try:
+        return pd.read_csv(WR_PROP_MARKET_FILE)
+    except FileNotFoundError:
+        print("❌ Could not find prop market file.")
+        return pd.DataFrame()
+
+def build_market_table(prop_df, roster=None):
+    """
+    Pivots raw prop rows into one row per rostered player (indexed by gsis_id)
+    with a `market_ppr` column.
+    """
+    if prop_df is None or prop_df.empty:
+        return pd.DataFrame(columns=["market_ppr"])
+    if roster is None:
+        roster = load_clean_roster()
+
+    props = prop_df[prop_df["market"].isin(PROP_MARKETS)].copy()
+    props["player_clean"] = clean_name_series(props["player"])
+    pivot = props.pivot_table(index="player_clean", columns="market", values="value", aggfunc="first")
+    pivot = pivot.reindex(columns=PROP_MARKETS)
+
+    # Inner join onto the roster: only players we can resolve to a gsis_id get a market line.
+    pivot = pivot.join(roster.rename("gsis_id"), how="inner").set_index("gsis_id")
+
+    # A missing receptions or yards line leaves market_ppr NaN, so that player stays on the model.
+    market_rec = pivot["player_receptions"] + MARKET_REC_OFFSET
+    market_yds = pivot["player_receiving_yards"] + MARKET_YDS_OFFSET
+    pivot["market_ppr"] = market_rec + market_yds * 0.1 + MARKET_TD_DEFAULT * 6.0
+    return pivot[["market_ppr"]]
+
+# -------------------------------
+# BLEND STAGE
+# -------------------------------
+
+def apply_market_blend(output_df, prop_df=None, roster=None, source=PROJECTION_SOURCE_TOGGLE):
+    """
+    Join-and-mask market blend. Adds market_ppr, model_ppr, blend_ppr,
+    final_proj and proj_source to `output_df` (in place, also returned).
+
+    Works on a single week or a full season frame: rows are matched to the
+    market table on `player_id` when present, otherwise on the cleaned `wr_name`.
+    """
+    if prop_df is None:
+        prop_df = load_latest_props()
+
+    output_df["model_ppr"] = output_df["final_pts"]
+
+    market = pd.DataFrame(columns=["market_ppr"])
+    if not prop_df.empty:
+        try:
+            if roster is None:
+                roster = load_clean_roster()
+            market = build_market_table(prop_df, roster)
+        except FileNotFoundError:
+            print("❌ Could not find roster file.")
+
+    if market.empty:
+        output_df["market_ppr"] = np.nan
+        output_df["blend_ppr"] = output_df["final_pts"]
+        output_df["final_proj"] = output_df["final_pts"]
+        output_df["proj_source"] = "model"
+        return output_df
+
+    if "player_id" in output_df.columns:
+        ids = output_df["player_id"]
+    else:
+        ids = clean_name_series(output_df["wr_name"]).map(roster)
+    output_df["market_ppr"] = ids.map(market["market_ppr"]).astype(float).to_numpy()
+    output_df["blend_ppr"] = output_df[["model_ppr", "market_ppr"]].mean(axis=1)
+
+    # Apply source toggle: market/blend only where a market line exists.
+    has_market = output_df["market_ppr"].notna()
+    if source in ("market", "blend"):
+        picked = output_df["market_ppr"] if source == "market" else output_df["blend_ppr"]
+        output_df["final_proj"] = picked.where(has_market, output_df["model_ppr"])
+        output_df["proj_source"] = np.where(has_market, source, "model")
+    else:
+        output_df["final_proj"] = output_df["model_ppr"]
+        output_df["proj_source"] = "model"
+
+    print(f"📦 Projections updated with {source} source ({int(has_market.sum())} market matches).")
+    return output_df
@@ -0,0 +1,53 @@
+"""Simulation job queue
+
+Revision ID: 4b7e2c9d1a03
+Revises: 1f99e48adc6d
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2c9d1a03'
+down_revision = '1f99e48adc6d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sim_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('week', sa.Integer(), nullable=False),
+    sa.Column('simulations', sa.Integer(), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('progress', sa.Float(), nullable=False),
+    sa.Column('message', sa.String(length=500), nullable=True),
+    sa.Column('result_path', sa.String(length=255), nullable=True),
+    sa.Column('requested_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('sim_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sim_jobs_created_at'), ['created_at'], unique=False)
+        batch_op.create_index('ix_sim_jobs_week_fp_status', ['week', 'fingerprint', 'status'], unique=False)
+        batch_op.create_index('ix_sim_jobs_status_id', ['status', 'id'], unique=False)
+        batch_op.create_index('uq_sim_jobs_active_week_fp', ['week', 'fingerprint'], unique=True,
+                              sqlite_where=sa.text("status IN ('queued', 'running')"),
+                              postgresql_where=sa.text("status IN ('queued', 'running')"))
+
+
+def downgrade():
+    with op.batch_alter_table('sim_jobs', schema=None) as batch_op:
+        batch_op.drop_index('uq_sim_jobs_active_week_fp')
+        batch_op.drop_index('ix_sim_jobs_status_id')
+        batch_op.drop_index('ix_sim_jobs_week_fp_status')
+        batch_op.drop_index(batch_op.f('ix_sim_jobs_created_at'))
+
+    op.drop_table('sim_jobs')
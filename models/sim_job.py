@@ -0,0 +1,46 @@
+# models/sim_job.py
+from datetime import datetime
+from extensions import db
+
+class SimJob(db.Model):
+    __tablename__ = "sim_jobs"
+    id = db.Column(db.Integer, primary_key=True)
+    week = db.Column(db.Integer, nullable=False)
+    simulations = db.Column(db.Integer, nullable=False, default=100)
+    fingerprint = db.Column(db.String(64), nullable=False)  # hash of sim inputs + settings
+    status = db.Column(db.String(16), nullable=False, default="queued")  # queued | running | done | failed
+    progress = db.Column(db.Float, nullable=False, default=0.0)
+    message = db.Column(db.String(500))
+    result_path = db.Column(db.String(255))
+    requested_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)  # worker heartbeat
+    __table_args__ = (
+        db.Index("ix_sim_jobs_week_fp_status", "week", "fingerprint", "status"),
+        db.Index("ix_sim_jobs_status_id", "status", "id"),
+        # at most one queued/running job per (week, inputs)
+        db.Index("uq_sim_jobs_active_week_fp", "week", "fingerprint", unique=True,
+                 sqlite_where=db.text("status IN ('queued', 'running')"),
+                 postgresql_where=db.text("status IN ('queued', 'running')")),
+    )
+
+    def to_dict(self):
+        # public view: result_path is a server filesystem path and stays internal
+        return {
+            "id": self.id,
+            "week": self.week,
+            "simulations": self.simulations,
+            "status": self.status,
+            "progress": round(self.progress or 0.0, 3),
+            "message": self.message,
+            "has_result": bool(self.status == "done" and self.result_path),
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    def __repr__(self):
+        return f"<SimJob {self.id} week={self.week} {self.status}>"
@@ -39,4 +39,5 @@ class Entitlement(db.Model):
     key = db.Column(db.String(64), nullable=False)          # e.g., '2025-W03' or '2025-SEASON'
     source = db.Column(db.String(20), nullable=False)       # 'coins' | 'purchase' | 'grant'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Unique (user_id, scope, key) doubles as the composite index for entitlement lookups.
     __table_args__ = (db.UniqueConstraint('user_id','scope','key', name='uq_user_scope_key'),)
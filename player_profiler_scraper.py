@@ -0,0 +1,181 @@
+# player_profiler_scraper.py
+
+"""
+Parallel PlayerProfiler scraper with resumable checkpoints.
+
+Each finished profile is appended to a JSONL state file as soon as it is
+parsed, so a crash or Ctrl-C loses at most the pages in flight and a rerun
+only fetches what is missing. The CSV (run.COLUMNS schema, run.player_urls
+order) is rebuilt from the state file at the end of every run, with numeric
+stats typed (percentages as fractions) so sim_engine can load it as-is.
+It goes to PLAYER_PROFILER_SCRAPE_FILE; pass --output to replace the
+committed WR_STATS_2024.csv once the run looks right.
+
+    python player_profiler_scraper.py                     # fetch anything not yet checkpointed
+    python player_profiler_scraper.py --since 24h         # also re-fetch profiles older than 24 hours
+    python player_profiler_scraper.py --force --workers 8 # re-fetch everything
+    python player_profiler_scraper.py --force --save-html scripts/fixtures  # keep raw pages as parser fixtures
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from config import PLAYER_PROFILER_SCRAPE_FILE, PLAYER_PROFILER_STATE_FILE
+from run import COLUMNS, parse_player_page, player_urls
+from utils.http_client import http_get
+
+DEFAULT_OUTPUT = PLAYER_PROFILER_SCRAPE_FILE  # typed values, same schema sim_engine reads
+DEFAULT_WORKERS = 4  # the shared HTTP client also caps concurrency per host
+
+# -------------------------------
+# CHECKPOINTS
+# -------------------------------
+
+def utc_now_iso():
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+def load_state(path=PLAYER_PROFILER_STATE_FILE):
+    """url -> {"fetched_at", "row"}; later lines win."""
+    state = {}
+    path = Path(path)
+    if not path.exists():
+        return state
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn last line from an interrupted run
+            if rec.get("url") and isinstance(rec.get("row"), dict):
+                state[rec["url"]] = rec
+    return state
+
+def append_state(fh, url, row):
+    fh.write(json.dumps({"url": url, "fetched_at": utc_now_iso(), "row": row}) + "\n")
+    fh.flush()
+
+def compact_state(state, path=PLAYER_PROFILER_STATE_FILE):
+    """Rewrite the state file with one line per URL."""
+    path = Path(path)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for rec in state.values():
+            f.write(json.dumps(rec) + "\n")
+    os.replace(tmp, path)
+
+def parse_since(text):
+    """'90m' / '24h' / '7d' or an ISO date -> UTC cutoff datetime."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([mhd])\s*", text or "")
+    if m:
+        unit = {"m": "minutes", "h": "hours", "d": "days"}[m.group(2)]
+        return datetime.now(timezone.utc) - timedelta(**{unit: float(m.group(1))})
+    dt = datetime.fromisoformat(text)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+def urls_to_fetch(urls, state, since=None, force=False):
+    if force:
+        return list(urls)
+    todo = []
+    for url in urls:
+        rec = state.get(url)
+        if rec is None:
+            todo.append(url)
+        elif since is not None and datetime.fromisoformat(rec["fetched_at"]) < since:
+            todo.append(url)
+    return todo
+
+# -------------------------------
+# SCRAPE
+# -------------------------------
+
+def fixture_name(url):
+    """Profile URL -> playerprofiler_<slug>.html (the validator's fixture glob)."""
+    slug = re.sub(r"[^a-z0-9]+", "_", url.rstrip("/").rsplit("/", 1)[-1].lower()).strip("_")
+    return f"playerprofiler_{slug}.html"
+
+def fetch_profile(url, year, save_html=None):
+    r = http_get(url)
+    r.raise_for_status()
+    if save_html:
+        Path(save_html, fixture_name(url)).write_text(r.text, encoding="utf-8")
+    return parse_player_page(r.text, year)
+
+def scrape_profiles(urls=None, year="2024", workers=DEFAULT_WORKERS, since=None, force=False,
+                    state_path=PLAYER_PROFILER_STATE_FILE, save_html=None):
+    """
+    Fetch + parse profiles on a bounded thread pool, checkpointing each one.
+    `save_html` keeps every fetched page in that directory. Returns (state, failures).
+    """
+    urls = list(urls or player_urls)
+    state_path = Path(state_path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state = load_state(state_path)
+    todo = urls_to_fetch(urls, state, since=since, force=force)
+    print(f"🕸️  {len(todo)} of {len(urls)} profiles to fetch ({len(urls) - len(todo)} checkpointed)")
+
+    if save_html:
+        Path(save_html).mkdir(parents=True, exist_ok=True)
+
+    failures = {}
+    with open(state_path, "a", encoding="utf-8") as fh, \
+            ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        futures = {ex.submit(fetch_profile, url, year, save_html): url for url in todo}
+        for i, fut in enumerate(as_completed(futures), 1):
+            url = futures[fut]
+            try:
+                row = fut.result()
+            except Exception as e:
+                failures[url] = str(e)
+                print(f"⚠️ [{i}/{len(todo)}] {url}: {e}")
+                continue
+            append_state(fh, url, row)  # only the main thread writes
+            state[url] = {"url": url, "fetched_at": utc_now_iso(), "row": row}
+            print(f"✅ [{i}/{len(todo)}] {row.get('Player') or url}")
+
+    compact_state(state, state_path)
+    return state, failures
+
+def write_output(state, urls=None, output=DEFAULT_OUTPUT):
+    """CSV with COLUMNS, one row per checkpointed URL in `urls` order."""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix(output.suffix + ".tmp")
+    n = 0
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for url in (urls or player_urls):
+            rec = state.get(url)
+            if rec:
+                writer.writerow([rec["row"].get(col, "") for col in COLUMNS])
+                n += 1
+    os.replace(tmp, output)
+    print(f"💾 Saved {n} rows to {output}")
+    return n
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape PlayerProfiler WR profiles (parallel, resumable)")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="CSV to write (COLUMNS schema)")
+    parser.add_argument("--year", default="2024", help="Value for the Year column")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent fetches")
+    parser.add_argument("--since", default=None, help="Re-fetch profiles fetched before this age/date (e.g. 24h, 7d, 2025-08-01)")
+    parser.add_argument("--force", action="store_true", help="Re-fetch every profile")
+    parser.add_argument("--state", default=str(PLAYER_PROFILER_STATE_FILE), help="Checkpoint file")
+    parser.add_argument("--save-html", default=None, metavar="DIR", help="Also save each fetched page here")
+    args = parser.parse_args()
+
+    since = parse_since(args.since) if args.since else None
+    state, failures = scrape_profiles(year=args.year, workers=args.workers, since=since,
+                                      force=args.force, state_path=args.state, save_html=args.save_html)
+    write_output(state, output=args.output)
+    if failures:
+        print(f"⚠️ {len(failures)} profile(s) failed; rerun to retry only those.")
+
+if __name__ == "__main__":
+    main()
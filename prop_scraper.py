@@ -1,58 +1,153 @@
-import requests
-import pandas as pd
-import re
-import time
+import argparse
+import json
+import os
+from datetime import datetime, timezone
 
-ODDS_API_KEY = "82db1e191bc4c97af4330406ea8b34e9"
+from config import WR_PROP_MARKET_FILE, PROP_SNAPSHOT_DB
+from utils.player_index import normalize_name
+from prop_store import PropStore, utc_now_iso, to_game_time
+from utils.http_client import http_get
+
+ODDS_API_KEY = os.getenv("ODDS_API_KEY") or "82db1e191bc4c97af4330406ea8b34e9"
+ODDS_API_BASE = "https://api.the-odds-api.com/v4"
 BOOKMAKER = "draftkings"
 SPORT = "americanfootball_nfl"
 REGION = "us"
 MARKETS = "player_receiving_yards,player_receptions,player_touchdowns"
+REQUEST_TIMEOUT = 10  # seconds per request
+
+# -------------------------------
+# FETCH
+# -------------------------------
 
-# Standardize names to match roster_2025.csv
-name_cleaner = lambda x: re.sub(r'[^a-z]', '', x.lower().split(" ")[0] + x.lower().split(" ")[-1])
+def fetch_events(timeout=REQUEST_TIMEOUT):
+    """Upcoming NFL events (cheap call; no odds attached)."""
+    url = f"{ODDS_API_BASE}/sports/{SPORT}/events"
+    response = http_get(url, params={"apiKey": ODDS_API_KEY}, timeout=timeout)
+    if response.status_code != 200:
+        raise Exception(f"API error: {response.status_code} - {response.text}")
+    return response.json()
 
-def fetch_wr_props():
-    url = f"https://api.the-odds-api.com/v4/sports/{SPORT}/odds"
+def fetch_event_odds(event_id, timeout=REQUEST_TIMEOUT):
+    url = f"{ODDS_API_BASE}/sports/{SPORT}/events/{event_id}/odds"
     params = {
         "regions": REGION,
         "markets": MARKETS,
         "apiKey": ODDS_API_KEY,
         "bookmakers": BOOKMAKER
     }
-
-    print("Fetching odds from OddsAPI...")
-    response = requests.get(url, params=params)
+    response = http_get(url, params=params, timeout=timeout)
     if response.status_code != 200:
         raise Exception(f"API error: {response.status_code} - {response.text}")
+    return response.json()
+
+def load_fixture(path):
+    """Recorded event-odds payloads (a JSON list of /events/{id}/odds responses)."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+# -------------------------------
+# PARSE
+# -------------------------------
 
-    all_data = response.json()
+def parse_event_props(event):
+    """Flattens one event-odds payload into prop rows (one per player/market/book)."""
     props = []
+    seen = set()
+    matchup = f"{event.get('home_team')} vs {event.get('away_team')}"
+    for bookmaker in event.get("bookmakers", []):
+        book = bookmaker.get("key")
+        for market in bookmaker.get("markets", []):
+            market_key = market.get("key")
+            for outcome in market.get("outcomes", []):
+                # Player props carry the player in `description` and Over/Under in `name`.
+                name = outcome.get("description") or outcome.get("name")
+                key = (name, market_key, book)
+                if not name or key in seen:
+                    continue
+                seen.add(key)
+                props.append({
+                    "player": name,
+                    "player_clean": normalize_name(name),
+                    "market": market_key,
+                    "book": book,
+                    "value": outcome.get("point"),
+                    "matchup": matchup,
+                    "game_time": event.get("commence_time")
+                })
+    return props
+
+def _event_last_update(event):
+    stamps = [m.get("last_update") for b in event.get("bookmakers", []) for m in b.get("markets", [])]
+    stamps = [s for s in stamps if s]
+    return max(stamps) if stamps else None
+
+# -------------------------------
+# PULL
+# -------------------------------
+
+def fetch_wr_props(store=None, fixture=None, timeout=REQUEST_TIMEOUT, export_csv=True, now=None, fetched_at=None):
+    """
+    Incremental pull into the prop snapshot store.
+
+    Only events that have not kicked off are requested, events whose markets
+    have not updated since the last pull are skipped, and the store only
+    records lines that moved. Latest lines for games that already started
+    are pruned. Pass `fixture` to replay a recorded payload instead of calling
+    the live API; with a fixture, `now` (commence_time format) sets the clock
+    and nothing is filtered or pruned when it is omitted, and `fetched_at`
+    stamps the replayed snapshot.
+    """
+    store = store or PropStore(PROP_SNAPSHOT_DB)
+    fetched_at = fetched_at or utc_now_iso()
+
+    if fixture:
+        events = load_fixture(fixture)
+        get_odds = {e.get("id"): e for e in events}.get
+    else:
+        print("Fetching events from OddsAPI...")
+        now = now or to_game_time(datetime.now(timezone.utc))
+        events = fetch_events(timeout)
+        get_odds = lambda event_id: fetch_event_odds(event_id, timeout)
+    if now:
+        events = [e for e in events if (e.get("commence_time") or "") > now]
+        pruned = store.prune_started(now)
+        if pruned:
+            print(f"Pruned {pruned} lines for games that kicked off.")
+
+    changed = 0
+    for event in events:
+        event_id = event.get("id")
+        try:
+            odds = get_odds(event_id)
+        except Exception as e:
+            print(f"⚠️ Skipping event {event_id}: {e}")
+            continue
+        if not odds:
+            continue
+        last_update = _event_last_update(odds)
+        if last_update and store.last_update(event_id) == last_update:
+            continue
+        changed += store.upsert(parse_event_props(odds), fetched_at=fetched_at)
+        if last_update:
+            store.mark_pulled(event_id, last_update)
+
+    print(f"Prop snapshot {fetched_at}: {changed} changed lines across {len(events)} events.")
 
-    for game in all_data:
-        for bookmaker in game.get("bookmakers", []):
-            for market in bookmaker.get("markets", []):
-                market_key = market.get("key")
-                for outcome in market.get("outcomes", []):
-                    name = outcome.get("name")
-                    clean_name = name_cleaner(name)
-                    props.append({
-                        "player": name,
-                        "player_clean": clean_name,
-                        "market": market_key,
-                        "value": outcome.get("point"),
-                        "matchup": f"{game.get('home_team')} vs {game.get('away_team')}",
-                        "game_time": game.get("commence_time")
-                    })
-
-    df = pd.DataFrame(props)
-    if df.empty:
-        print("No WR props found.")
-        return
-
-    df = df[df["market"].isin(["player_receiving_yards", "player_receptions", "player_touchdowns"])]
-    df.to_csv("wr_prop_market.csv", index=False)
-    print("Saved to wr_prop_market.csv")
+    if export_csv:
+        latest = store.latest()
+        if latest.empty:
+            print("No WR props found.")
+        else:
+            latest.to_csv(WR_PROP_MARKET_FILE, index=False)
+            print(f"Saved to {WR_PROP_MARKET_FILE}")
+    return changed
 
 if __name__ == "__main__":
-    fetch_wr_props()
+    parser = argparse.ArgumentParser(description="Pull WR prop lines into the local snapshot store")
+    parser.add_argument("--fixture", type=str, default=None, help="Replay a recorded JSON payload instead of the live API")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="Per-request timeout in seconds")
+    parser.add_argument("--no-csv", action="store_true", help="Skip exporting the latest snapshot to wr_prop_market.csv")
+    parser.add_argument("--now", type=str, default=None, help="Clock for --fixture replays, e.g. 2025-09-07T12:00:00Z")
+    args = parser.parse_args()
+    fetch_wr_props(fixture=args.fixture, timeout=args.timeout, export_csv=not args.no_csv, now=args.now)
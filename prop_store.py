@@ -0,0 +1,166 @@
+# prop_store.py
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from config import PROP_SNAPSHOT_DB
+from utils.player_index import normalize_name
+
+# -------------------------------
+# SCHEMA
+# -------------------------------
+
+# prop_snapshots keeps every distinct line we have seen (history);
+# prop_latest holds exactly one row per (player_clean, market, book) so a
+# per-player lookup is a primary-key probe.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prop_snapshots (
+    player_clean TEXT NOT NULL,
+    player       TEXT NOT NULL,
+    market       TEXT NOT NULL,
+    book         TEXT NOT NULL,
+    value        REAL,
+    matchup      TEXT,
+    game_time    TEXT,
+    fetched_at   TEXT NOT NULL,
+    PRIMARY KEY (player_clean, market, book, fetched_at)
+);
+CREATE INDEX IF NOT EXISTS ix_prop_snapshots_fetched_at ON prop_snapshots (fetched_at);
+
+CREATE TABLE IF NOT EXISTS prop_latest (
+    player_clean TEXT NOT NULL,
+    player       TEXT NOT NULL,
+    market       TEXT NOT NULL,
+    book         TEXT NOT NULL,
+    value        REAL,
+    matchup      TEXT,
+    game_time    TEXT,
+    fetched_at   TEXT NOT NULL,
+    PRIMARY KEY (player_clean, market, book)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS prop_pulls (
+    event_id    TEXT PRIMARY KEY,
+    last_update TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+LATEST_COLUMNS = ["player", "player_clean", "market", "book", "value", "matchup", "game_time", "fetched_at"]
+
+
+def utc_now_iso():
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+def to_game_time(dt):
+    """UTC datetime -> the API's commence_time format, so game_time compares as text."""
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class PropStore:
+    """
+    Local SQLite store of prop-market snapshots.
+
+    Rows are deduped per (player, market, book, timestamp), and a new snapshot
+    row is only written when the line actually moved, so repeated pulls of an
+    unchanged board cost nothing on disk.
+    """
+
+    def __init__(self, path=PROP_SNAPSHOT_DB):
+        self.path = str(path)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    # ---- writes ----
+    def upsert(self, rows, fetched_at=None):
+        """
+        Insert prop rows (dicts with player/market/book/value/...) as a snapshot.
+        Returns the number of rows whose line changed (the delta).
+        """
+        fetched_at = fetched_at or utc_now_iso()
+        changed = 0
+        with closing(self._connect()) as conn, conn:
+            for r in rows:
+                key = (r.get("player_clean") or normalize_name(r["player"]), r["market"], r["book"])
+                prev = conn.execute(
+                    "SELECT value, game_time FROM prop_latest WHERE player_clean=? AND market=? AND book=?", key
+                ).fetchone()
+                # same line for the same game: nothing moved (a repeat line for a new game is new)
+                if prev is not None and prev == (r.get("value"), r.get("game_time")):
+                    continue
+                rec = key + (r["player"], r.get("value"), r.get("matchup"), r.get("game_time"), fetched_at)
+                conn.execute(
+                    "INSERT OR IGNORE INTO prop_snapshots "
+                    "(player_clean, market, book, player, value, matchup, game_time, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rec
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO prop_latest "
+                    "(player_clean, market, book, player, value, matchup, game_time, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rec
+                )
+                changed += 1
+        return changed
+
+    def prune_started(self, now=None):
+        """
+        Drop latest lines for games that have kicked off (history stays in
+        prop_snapshots), so last week's lines never outlive the pull that
+        replaced them. Returns the number of rows removed.
+        """
+        now = now or to_game_time(datetime.now(timezone.utc))
+        with closing(self._connect()) as conn, conn:
+            return conn.execute("DELETE FROM prop_latest WHERE game_time < ?", (now,)).rowcount
+
+    def last_update(self, event_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT last_update FROM prop_pulls WHERE event_id=?", (event_id,)).fetchone()
+        return row[0] if row else None
+
+    def mark_pulled(self, event_id, last_update):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO prop_pulls (event_id, last_update) VALUES (?, ?)",
+                         (event_id, last_update))
+
+    # ---- reads ----
+    def lookup(self, player_name, book=None):
+        """Returns {market: value} from the latest snapshot for one player."""
+        sql = "SELECT market, value FROM prop_latest WHERE player_clean=?"
+        params = [normalize_name(player_name)]
+        if book:
+            sql += " AND book=?"
+            params.append(book)
+        with closing(self._connect()) as conn:
+            return dict(conn.execute(sql, params).fetchall())
+
+    def latest(self, book=None, since=None):
+        """
+        Latest line for every (player, market, book) as a DataFrame.
+        `since` (commence_time format) drops lines for games that started earlier.
+        """
+        where, params = [], []
+        if book:
+            where.append("book=?")
+            params.append(book)
+        if since:
+            where.append("(game_time IS NULL OR game_time >= ?)")
+            params.append(since)
+        sql = f"SELECT {', '.join(LATEST_COLUMNS)} FROM prop_latest"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def history(self, player_name, market=None):
+        sql = "SELECT * FROM prop_snapshots WHERE player_clean=?"
+        params = [normalize_name(player_name)]
+        if market:
+            sql += " AND market=?"
+            params.append(market)
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(sql + " ORDER BY fetched_at", conn, params=params)
@@ -1,10 +1,10 @@
 
 #run.py
 
-import requests
-from bs4 import BeautifulSoup
-import csv
 import re
+from html.parser import HTMLParser
+
+from utils.http_client import http_get
 
 player_urls = [
     # Arizona Cardinals
@@ -297,117 +297,283 @@ COLUMNS = [
     "TargetSeparationVsZone", "FantasyPointsPerTargetVsMan", "FantasyPointsPerTargetVsZone"
 ]
 
-def clean_number(val):
-    val = val.replace(",", "")
-    try:
-        return str(float(val))
-    except:
-        return val
+# -------------------------------
+# STAT LABEL -> COLUMN TABLE
+# -------------------------------
+
+# Columns kept as text; everything else is written as a number
+TEXT_COLUMNS = {"Team", "Player", "Position", "Height", "DraftPick", "College"}
+
+# Site labels that differ from the column name. Every column also matches its
+# own name ("Target Share" -> TargetShare), and Man/Zone split tables produce
+# "<row label> vs Man|Zone" (-> RoutesVsMan, WinRateVsZone, ...).
+LABEL_ALIASES = {
+    "Red Zone Target Share": "RzTargetShare",
+    "Slot Rate": "SlotSnapRate",
+    "Routes": "RoutesRun",
+    "Average Target Distance": "AvgTargetDistADOT",
+    "aDOT": "AvgTargetDistADOT",
+    "Red Zone Targets": "RzTargets",
+    "Red Zone Receptions": "RzRec",
+    "Formation-Adjusted Yards per Route Run": "FormationAdjustedYardsPerRouteRun",
+    "Yards per Reception": "YardsPerRec",
+    "Yards per Team Pass Attempt": "YardsPerTeamPassAtt",
+    "Target Premium": "TargetPrem",
+    "Contested Targets": "ContestedCatchTargets",
+    "Production Premium": "ProductionPrem",
+    "Expected Points Added": "ExpectedPointsAddedEPA",
+    "EPA": "ExpectedPointsAddedEPA",
+    "QB Rating per Target": "QbRatingPerTarget",
+    "Fantasy Points": "TotalFantasyPoints",
+    "Route Wins": "TotalRouteWins",
+    "Route Win Rate vs Man": "WinRateVsMan",
+    "Route Win Rate vs Zone": "WinRateVsZone",
+    "Routes Run vs Man": "RoutesVsMan",
+    "Routes Run vs Zone": "RoutesVsZone",
+    "Fantasy Points per Target vs Man": "FantasyPointsPerTargetVsMan",
+    "Fantasy Points per Target vs Zone": "FantasyPointsPerTargetVsZone",
+    "Draft Year": "DraftYear",
+}
 
+_SPLIT_HEADERS = {"man": "Man", "vsman": "Man", "zone": "Zone", "vszone": "Zone"}
 
-import re
+def _norm_label(text):
+    return re.sub(r"[^a-z0-9]", "", (text or "").lower().replace("&", "and"))
 
-def height_to_inches(height_str):
-    """Convert height like 6' 3" or 6′3″ into inches."""
-    if not height_str:
-        return ""
-    # Normalize quotes and remove spaces
-    height_str = (
-        height_str.replace("’", "'")
-                  .replace("‘", "'")
-                  .replace("″", '"')
-                  .replace("“", '"')
-                  .replace("”", '"')
-                  .replace(" ", "")  # Remove space between feet and inches
-    )
-    match = re.match(r"(\d+)'(\d+)", height_str)
-    if match:
-        feet = int(match.group(1))
-        inches = int(match.group(2))
-        return feet * 12 + inches
-    return ""
-
-def get_profile_stats(soup):
-    profile = {}
+# Compiled once: normalized label -> column
+LABEL_TO_COLUMN = {_norm_label(c): c for c in COLUMNS}
+LABEL_TO_COLUMN.update({_norm_label(k): v for k, v in LABEL_ALIASES.items()})
 
-    # Player name
-    name = soup.select_one("h1.font-display")
-    profile["Player"] = name.get_text(strip=True) if name else ""
+_NUMBER_RX = re.compile(r"[-+]?\d*\.?\d+")
+
+def normalize_stat_value(val):
+    """
+    Display value -> number: '22.2%' -> 0.222, '+-2.1%' -> -0.021, '+38.8' -> 38.8,
+    '1,566' -> 1566. Blank / '-' / 'N/A' -> ''. Non-numeric text is returned as-is.
+    """
+    if val is None:
+        return ""
+    if isinstance(val, (int, float)):
+        return val
+    text = str(val).strip().replace(",", "")
+    if text in ("", "-", "--", "N/A", "n/a", "nan"):
+        return ""
+    if text.startswith("+"):
+        text = text[1:]  # the site prints negatives as "+-2.1"
+    m = _NUMBER_RX.fullmatch(text.rstrip("%").strip())
+    if not m:
+        return str(val).strip()
+    num = float(m.group(0))
+    if text.endswith("%"):
+        return round(num / 100.0, 6)
+    return int(num) if "." not in m.group(0) else num
+
+
+# -------------------------------
+# SINGLE-PASS PAGE EXTRACTOR
+# -------------------------------
+
+class _ProfileWalker(HTMLParser):
+    """
+    One streaming pass over a profile page. Collects the header fields
+    (name/team/position), every core-stat card (label, value, rank, full text)
+    and every table row; tables whose header is Man/Zone become
+    "<label> vs Man|Zone" pairs.
+    """
+    VOID = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []          # (tag, roles, buffer)
+        self.open_bufs = []
+        self.ctx = {"header_team": 0, "header_pos": 0, "core": 0}
+        self.header = {}
+        self.cores = []          # dicts: label, value, rank, text
+        self.pairs = []          # (label, value) in page order
+        self._core = None
+        self._row = None
+        self._headers = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID:
+            return
+        cls = ""
+        for k, v in attrs:
+            if k == "class":
+                cls = v or ""
+                break
+        classes = cls.split()
+        roles = []
+        if "player-page__header-team" in classes:
+            roles.append("header_team")
+        if "player-page__header-pos" in classes:
+            roles.append("header_pos")
+        if "player-page__core-stat" in classes and not self.ctx["core"]:
+            self._core = {}
+            roles.append("core")
+        if tag == "h1" and "font-display" in classes and "Player" not in self.header:
+            roles.append("cap:player")
+        if self.ctx["header_team"] and "font-display" in classes and "Team" not in self.header:
+            roles.append("cap:team")
+        if self.ctx["header_pos"] and "text-lg" in classes and "Position" not in self.header:
+            roles.append("cap:pos")
+        if self.ctx["core"]:
+            if "text-blue-light" in classes and "label" not in self._core:
+                roles.append("cap:core_label")
+            if "font-display" in classes and "value" not in self._core:
+                roles.append("cap:core_value")
+            if tag == "span" and "text-xs" in classes and "rank" not in self._core:
+                roles.append("cap:core_rank")
+        if tag == "table":
+            self._headers = None
+        elif tag == "tr":
+            self._row = []
+        elif tag in ("td", "th") and self._row is not None:
+            roles.append("cap:" + tag)
+
+        buf = None
+        if "core" in roles or any(r.startswith("cap:") for r in roles):
+            buf = []
+            self.open_bufs.append(buf)
+        for r in roles:
+            if r in self.ctx:
+                self.ctx[r] += 1
+        self.stack.append((tag, roles, buf))
+
+    def handle_endtag(self, tag):
+        if tag in self.VOID:
+            return
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > i:
+            t, roles, buf = self.stack.pop()
+            self._close(t, roles, buf)
+
+    def handle_data(self, data):
+        if self.open_bufs:
+            data = data.strip()
+            if data:
+                for buf in self.open_bufs:
+                    buf.append(data)
+
+    def _close(self, tag, roles, buf):
+        text = ""
+        if buf is not None:
+            # by identity: sibling buffers can compare equal (e.g. both empty)
+            self.open_bufs = [b for b in self.open_bufs if b is not buf]
+            text = " ".join(buf)
+        for r in roles:
+            if r in self.ctx:
+                self.ctx[r] -= 1
+            if r == "cap:player":
+                self.header["Player"] = text
+            elif r == "cap:team":
+                self.header["Team"] = text
+            elif r == "cap:pos":
+                self.header["Position"] = text
+            elif r == "cap:core_label":
+                self._core["label"] = text
+            elif r == "cap:core_value":
+                self._core["value"] = text
+            elif r == "cap:core_rank":
+                self._core["rank"] = text
+            elif r in ("cap:td", "cap:th") and self._row is not None:
+                self._row.append((tag, text))
+            elif r == "core":
+                self._core["text"] = text
+                self.cores.append(self._core)
+                if self._core.get("label"):
+                    self.pairs.append((self._core["label"], self._core.get("value", "")))
+                self._core = None
+        if tag == "tr" and self._row is not None:
+            self._finish_row(self._row)
+            self._row = None
+
+    def _finish_row(self, cells):
+        if not cells:
+            return
+        if all(t == "th" for t, _ in cells):
+            self._headers = [c for _, c in cells]
+            return
+        label, values = cells[0][1], [c for _, c in cells[1:]]
+        splits = [_SPLIT_HEADERS.get(_norm_label(h)) for h in (self._headers or [])[1:]]
+        if splits and all(splits):
+            for side, value in zip(splits, values):
+                self.pairs.append((f"{label} vs {side}", value))
+        elif values:
+            self.pairs.append((label, values[0]))
+
+
+def _bio_fields(core):
+    """Bio cards keep the original substring rules (height/weight/arm length/draft/college)."""
+    text = (core.get("label") or "").strip().lower()
+    val = (core.get("value") or "").strip()
+    out = {}
+    if "height" in text:
+        out["Height"] = val  # e.g., 6'1"
+    elif "weight" in text:
+        out["Weight"] = normalize_stat_value(re.sub(r"[^\d]", "", val))
+    elif "arm length" in text:
+        out["ArmLength"] = normalize_stat_value(re.sub(r"[^\d.]", "", val))
+        if core.get("rank"):
+            out["ArmLengthRank"] = normalize_stat_value(re.sub(r"[^\d]", "", core["rank"]))
+    elif "draft pick" in text:
+        out["DraftPick"] = "Undrafted" if "undrafted" in val.lower() else val
+        year_match = re.search(r"\((\d{4})\)", core.get("text") or "")
+        if year_match:
+            out["DraftYear"] = int(year_match.group(1))
+    elif "college" in text:
+        out["College"] = val
+    return out
+
+
+def get_profile_stats(html):
+    """Every COLUMNS field found on the page (typed), from a single traversal."""
+    walker = _ProfileWalker()
+    walker.feed(html)
+    walker.close()
 
-    # Team
-    team_div = soup.select_one(".player-page__header-team .font-display")
-    team = team_div.get_text(strip=True) if team_div else ""
+    profile = {}
+    player = walker.header.get("Player", "")
+    team = walker.header.get("Team", "")
+    profile["Player"] = player
     profile["Team"] = TEAM_ABBREV.get(team, team[:3].upper())
+    profile["Position"] = walker.header.get("Position", "")
 
-    # Position (e.g., WR61)
-    pos_div = soup.select_one(".player-page__header-pos .text-lg")
-    profile["Position"] = pos_div.get_text(strip=True) if pos_div else ""
+    for core in walker.cores:
+        for col, v in _bio_fields(core).items():
+            profile.setdefault(col, v)
 
-    # Core stats
-    stat_divs = soup.select(".player-page__core-stat")
-    for div in stat_divs:
-        label = div.select_one(".text-blue-light")
-        value = div.select_one(".font-display")
-        if not label or not value:
+    for label, value in walker.pairs:
+        col = LABEL_TO_COLUMN.get(_norm_label(label))
+        if col is None or col in profile:
             continue
-        text = label.text.strip().lower()
-        val = value.text.strip()
-
-        if "height" in text:
-            profile["Height"] = val  # e.g., 6'1"
-            profile["HeightInches"] = height_to_inches(val) or ""
-
-        elif "weight" in text:
-            profile["Weight"] = re.sub(r"[^\d]", "", val)
-
-        elif "arm length" in text:
-            profile["ArmLength"] = re.sub(r"[^\d.]", "", val)
-            rank_span = div.select_one("span.text-xs")
-            if rank_span:
-                profile["ArmLengthRank"] = re.sub(r"[^\d]", "", rank_span.text)
-
-        elif "draft pick" in text:
-            profile["DraftPick"] = "Undrafted" if "undrafted" in val.lower() else val
-            year_match = re.search(r"\((\d{4})\)", div.text)
-            if year_match:
-                profile["DraftYear"] = year_match.group(1)
+        profile[col] = value.strip() if col in TEXT_COLUMNS else normalize_stat_value(value)
+    return profile
 
-        elif "college" in text:
-            profile["College"] = val
 
-    # Fill in blanks for any missing keys
-    for k in ["Height", "HeightInches", "Weight", "ArmLength", "ArmLengthRank", "DraftPick", "DraftYear", "College"]:
-        if k not in profile:
-            profile[k] = ""
+def parse_player_page(html, year="2024"):
+    """One PlayerProfiler page -> row dict keyed by COLUMNS (page parsed once)."""
+    out = {"Year": int(year)}
+    out.update(get_profile_stats(html))
 
-    return profile
+    # Fill any remaining columns with blanks
+    return {col: out.get(col, "") for col in COLUMNS}
 
 
-def scrape_player(url):
+def scrape_player(url, year="2024"):
     print("Scraping", url)
-    r = requests.get(url)
-    soup = BeautifulSoup(r.text, "html.parser")
-    out = {}
-    out["Year"] = "2024"
+    r = http_get(url)
+    r.raise_for_status()
+    row = parse_player_page(r.text, year)
+    return [row[col] for col in COLUMNS]
 
-    # Profile stats
-    profile = get_profile_stats(soup)
-    out.update(profile)
 
-    # Fill any remaining columns with blanks
-    for col in COLUMNS:
-        if col not in out:
-            out[col] = ""
-
-    return [out[col] for col in COLUMNS]
-
-
-# Write CSV
-with open("DATA/player_profiler_data/WR_STATS_2024_test.csv", "w", newline='', encoding="utf-8") as f:
-    writer = csv.writer(f)
-    writer.writerow(COLUMNS)
-    for url in player_urls:
-        row = scrape_player(url)
-        print(row)
-        writer.writerow(row)
-    print("Done! Saved to DATA/player_profiler_data/WR_STATS_2024_test_.csv")
+# Scraping lives in player_profiler_scraper.py (parallel, checkpointed);
+# `python run.py` is kept as a shortcut for it.
+if __name__ == "__main__":
+    from player_profiler_scraper import main
+    main()
@@ -0,0 +1,77 @@
+# scripts/bench_injury_parse.py
+"""
+Per-page parse time for saved injury-news pages, per parser backend.
+
+  bs4     reference: BeautifulSoup tree + find()/find_all() per article (the old path)
+  stdlib  single streaming pass with html.parser, no tree
+  lxml    XPath plan compiled once, one walk per article (if lxml is installed)
+
+Every backend must produce exactly the items the bs4 reference does; the
+script exits non-zero on any mismatch.
+
+Usage:
+    python scripts/bench_injury_parse.py
+    python scripts/bench_injury_parse.py --fixture saved_page.html --repeat 50
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.injury_reports import _BACKENDS, default_backend, parse_injury_html  # noqa: E402
+
+DEFAULT_FIXTURE = ROOT / "scripts" / "fixtures" / "injury_news_page.html"
+
+def available_backends():
+    out = []
+    for name in sorted(_BACKENDS, key=lambda n: n != "bs4"):  # reference first
+        try:
+            parse_injury_html("<html></html>", backend=name)
+            out.append(name)
+        except ImportError:
+            print(f"⚠️  {name}: not installed, skipped")
+    return out
+
+def time_backend(name, pages, repeat):
+    """Median seconds per page over `repeat` runs of every page."""
+    samples = []
+    for _ in range(repeat):
+        for html in pages:
+            t0 = time.perf_counter()
+            parse_injury_html(html, backend=name)
+            samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Injury page parser benchmark")
+    parser.add_argument("--fixture", action="append", default=None, help="Saved HTML page(s)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per page")
+    args = parser.parse_args()
+
+    paths = [Path(f) for f in (args.fixture or [DEFAULT_FIXTURE])]
+    pages = [p.read_text(encoding="utf-8") for p in paths]
+    backends = available_backends()
+
+    reference = [parse_injury_html(h, backend="bs4") for h in pages]
+    n_items = sum(len(r) for r in reference)
+    print(f"📄 {len(pages)} page(s), {n_items} items; default backend: {default_backend()}")
+
+    failed = False
+    base = None
+    for name in backends:
+        if name != "bs4" and [parse_injury_html(h, backend=name) for h in pages] != reference:
+            print(f"❌ {name}: items differ from the bs4 reference")
+            failed = True
+            continue
+        sec = time_backend(name, pages, args.repeat)
+        base = base or sec
+        print(f"  {name:<7} {sec * 1000:8.2f} ms/page   {base / sec:5.1f}x")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
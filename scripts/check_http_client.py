@@ -0,0 +1,144 @@
+# scripts/check_http_client.py
+"""
+Exercise utils.http_client against a local http.server stub (no network):
+retry on 503, ETag / 304 revalidation, `max_age` cache hits, per-host
+start spacing and streamed download(). Exits non-zero on the first failed
+check.
+
+Usage:
+    python scripts/check_http_client.py
+"""
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.http_client import HttpClient  # noqa: E402
+
+FLAKY_FAILURES = 2                            # /flaky answers 503 this many times first
+ETAG = '"v1"'
+DOWNLOAD_BODY = bytes(range(256)) * 400       # ~100 KB, several chunks
+SPACING = 0.2                                 # seconds between request starts for the spacing check
+
+failed = []
+
+def check(label, ok, detail=""):
+    print(f"{'✅' if ok else '❌'} {label}" + (f" ({detail})" if detail else ""))
+    if not ok:
+        failed.append(label)
+
+# -------------------------------
+# STUB SERVER
+# -------------------------------
+
+class Stub(BaseHTTPRequestHandler):
+    hits = {}          # path -> request count
+    arrivals = []      # monotonic arrival times for /spaced
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        with self.lock:
+            n = self.hits[path] = self.hits.get(path, 0) + 1
+            if path == "/spaced":
+                self.arrivals.append(time.monotonic())
+
+        if path == "/flaky":
+            if n <= FLAKY_FAILURES:
+                self._reply(503, b"busy", {"Retry-After": "0"})
+            else:
+                self._reply(200, b"ok")
+        elif path == "/etag":
+            if self.headers.get("If-None-Match") == ETAG:
+                self._reply(304, headers={"ETag": ETAG})
+            else:
+                self._reply(200, b'{"v": 1}', {"ETag": ETAG, "Content-Type": "application/json"})
+        elif path == "/download":
+            self._reply(200, DOWNLOAD_BODY, {"Content-Type": "application/octet-stream"})
+        else:
+            self._reply(200, b"hello")
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# -------------------------------
+# CHECKS
+# -------------------------------
+
+def main():
+    server = start_stub()
+    host = f"127.0.0.1:{server.server_address[1]}"
+    base = f"http://{host}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        http = HttpClient(cache_dir=Path(tmp) / "cache", host_limits={}, timeout=5)
+
+        # retry on 503 (Retry-After: 0 keeps the backoff instant)
+        resp = http.get(f"{base}/flaky")
+        check("retry: 503s retried until 200", resp.status_code == 200 and resp.text == "ok",
+              f"status {resp.status_code}")
+        check("retry: one request per attempt", Stub.hits["/flaky"] == FLAKY_FAILURES + 1,
+              f"{Stub.hits['/flaky']} hits")
+        no_retry = HttpClient(cache_dir=Path(tmp) / "cache", host_limits={}, retries=0)
+        Stub.hits.pop("/flaky")
+        check("retry: retries=0 returns the 503", no_retry.get(f"{base}/flaky").status_code == 503)
+
+        # ETag / 304 revalidation
+        first = http.get(f"{base}/etag", cache=True)
+        second = http.get(f"{base}/etag", cache=True)
+        check("etag: first fetch stored, not from cache", first.status_code == 200 and not first.from_cache)
+        check("etag: revalidated with If-None-Match and served from disk on 304",
+              second.from_cache and second.status_code == 200 and second.json() == {"v": 1},
+              f"status {second.status_code}, from_cache={second.from_cache}")
+        check("etag: both fetches reached the server", Stub.hits["/etag"] == 2, f"{Stub.hits['/etag']} hits")
+
+        # max_age: fresh entries skip the network entirely
+        http.get(f"{base}/fresh", cache=True)
+        hit = http.get(f"{base}/fresh", cache=True, max_age=60)
+        check("max_age: fresh copy returned without a request",
+              hit.from_cache and hit.text == "hello" and Stub.hits["/fresh"] == 1, f"{Stub.hits['/fresh']} hits")
+        http.get(f"{base}/fresh", cache=True, max_age=0)
+        check("max_age: stale copy goes back to the server", Stub.hits["/fresh"] == 2, f"{Stub.hits['/fresh']} hits")
+        http.get(f"{base}/fresh", params={"week": 2}, cache=True, max_age=60)
+        check("cache: params are part of the key", Stub.hits["/fresh"] == 3, f"{Stub.hits['/fresh']} hits")
+
+        # per-host spacing: concurrent callers still start SPACING apart
+        http.set_host_limit(host, concurrency=4, min_interval=SPACING)
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda _: http.get(f"{base}/spaced"), range(4)))
+        gaps = [b - a for a, b in zip(Stub.arrivals, Stub.arrivals[1:])]
+        check("spacing: request starts spaced by the host interval",
+              len(gaps) == 3 and min(gaps) >= SPACING * 0.9, ", ".join(f"{g:.3f}s" for g in gaps))
+
+        # download(): streamed to a .part file, then moved into place
+        dst = Path(tmp) / "logo.png"
+        http.download(f"{base}/download", dst, chunk_size=4096)
+        check("download: body written intact", dst.read_bytes() == DOWNLOAD_BODY, f"{dst.stat().st_size} bytes")
+        check("download: no .part file left behind", not dst.with_suffix(".png.part").exists())
+
+    server.shutdown()
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# scripts/check_import_time.py
+"""
+Import-time audit for the Flask app factory.
+
+Runs `python -X importtime -c "from app import create_app; create_app()"` in a
+fresh interpreter, prints the slowest top-level imports, and exits non-zero if
+  - a heavy module (pandas, numpy, PIL, bs4, requests, ...) is imported at boot, or
+  - total import time exceeds the budget (default 300 ms).
+
+Usage:
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget-ms 250 --top 30
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Must only be imported lazily, inside the routes/functions that need them.
+HEAVY_MODULES = ("pandas", "numpy", "PIL", "bs4", "requests", "lxml", "selectolax", "pyarrow")
+
+BOOT_SNIPPET = "from app import create_app; create_app()"
+
+def run_importtime(snippet=BOOT_SNIPPET):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        cwd=str(ROOT), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"App boot failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+def parse_importtime(stderr):
+    """Rows of (self_us, cumulative_us, depth, module) from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cum_us), depth, name.strip()))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Flask app import-time check")
+    parser.add_argument("--budget-ms", type=float, default=300.0, help="Max total import time (ms)")
+    parser.add_argument("--top", type=int, default=20, help="How many top-level imports to list")
+    args = parser.parse_args()
+
+    rows = run_importtime()
+    top_level = [r for r in rows if r[2] == 0]
+    total_ms = sum(r[1] for r in top_level) / 1000
+
+    print(f"⏱️  App boot imports: {total_ms:.0f} ms ({len(rows)} modules)")
+    for self_us, cum_us, _, name in sorted(top_level, key=lambda r: -r[1])[:args.top]:
+        print(f"  {cum_us / 1000:8.1f} ms  {name}")
+
+    heavy = sorted({r[3] for r in rows if r[3].split(".")[0] in HEAVY_MODULES and "." not in r[3]})
+    failed = False
+    if heavy:
+        print(f"❌ Heavy modules imported at boot: {', '.join(heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"❌ Boot import time {total_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("✅ Import-time check passed")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
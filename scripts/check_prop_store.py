@@ -0,0 +1,75 @@
+# scripts/check_prop_store.py
+"""
+Replay the recorded odds payloads in scripts/fixtures through the prop
+pipeline: parse_event_props on the first pull, then an incremental PropStore
+ingest of both pulls into a throwaway SQLite file (unchanged events skipped,
+only moved lines written, started games pruned from the latest view).
+Exits non-zero on the first failed check.
+
+Usage:
+    python scripts/check_prop_store.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from prop_scraper import fetch_wr_props, load_fixture, parse_event_props  # noqa: E402
+from prop_store import PropStore  # noqa: E402
+
+FIXTURES = ROOT / "scripts" / "fixtures"
+PULL_1 = FIXTURES / "odds_event_props_pull1.json"
+PULL_2 = FIXTURES / "odds_event_props_pull2.json"   # same board, one Ja'Marr Chase yards line moved
+
+failed = []
+
+def check(label, ok, detail=""):
+    print(f"{'✅' if ok else '❌'} {label}" + (f" ({detail})" if detail else ""))
+    if not ok:
+        failed.append(label)
+
+def main():
+    rows = [r for event in load_fixture(PULL_1) for r in parse_event_props(event)]
+    keys = {(r["player_clean"], r["market"], r["book"]) for r in rows}
+    check("parse: one row per player/market/book", len(rows) == len(keys) == 10, f"{len(rows)} rows")
+    check("parse: every row has a line and a game time",
+          all(r["value"] is not None and r["game_time"] for r in rows))
+    chase = {r["market"]: r["value"] for r in rows if r["player"] == "Ja'Marr Chase"}
+    check("parse: Over/Under collapse to the posted point", chase.get("player_receiving_yards") == 90.5, str(chase))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PropStore(Path(tmp) / "props.sqlite")
+        before_kickoff = "2025-09-04T12:00:00Z"
+
+        n = fetch_wr_props(store=store, fixture=PULL_1, export_csv=False, now=before_kickoff,
+                           fetched_at="2025-09-04T15:05:00+00:00")
+        check("ingest pull 1: every line is new", n == 10, f"{n} changed")
+        n = fetch_wr_props(store=store, fixture=PULL_1, export_csv=False, now=before_kickoff,
+                           fetched_at="2025-09-04T17:00:00+00:00")
+        check("replay pull 1: unchanged events skipped", n == 0, f"{n} changed")
+        n = fetch_wr_props(store=store, fixture=PULL_2, export_csv=False, now=before_kickoff,
+                           fetched_at="2025-09-04T19:45:00+00:00")
+        check("ingest pull 2: only the moved line is written", n == 1, f"{n} changed")
+
+        latest = store.latest()
+        moved = latest[(latest["player_clean"] == "jamarrchase") & (latest["market"] == "player_receiving_yards")]
+        check("latest carries the moved line", moved["value"].tolist() == [92.5], str(moved["value"].tolist()))
+        check("history keeps both lines", len(store.history("Ja'Marr Chase", "player_receiving_yards")) == 2)
+
+        # Thursday game (PHI/DAL) has kicked off by Saturday: its lines leave the latest view
+        fetch_wr_props(store=store, fixture=PULL_2, export_csv=False, now="2025-09-06T12:00:00Z",
+                       fetched_at="2025-09-06T12:00:00+00:00")
+        latest = store.latest()
+        check("started games pruned from latest", len(latest) == 5 and set(latest["matchup"]) ==
+              {"Cleveland Browns vs Cincinnati Bengals"}, f"{len(latest)} rows")
+        check("pruned lines stay in history", len(store.history("A.J. Brown")) == 3)
+        check("latest(since=...) hides older games",
+              len(store.latest(since="2025-09-08T00:00:00Z")) == 0)
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
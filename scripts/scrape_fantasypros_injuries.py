@@ -5,21 +5,27 @@ Scrape FantasyPros NFL injury news and save monthly CSVs with NO row cap.
 - Crawls ?page=1..N (you choose how deep with --max-pages)
 - Parses fields: headline, date, description, fantasy_impact, player_name
 - Parses/normalizes dates, groups by YYYY-MM
-- Writes/merges to DATA/injuries/injuries_YYYY-MM.csv
-- Dedupes per month by (player_name, date, headline), keeping newest first
+- Incremental: stops at the first item already archived (keys live in
+  DATA/injuries/_index.sqlite; the newest key is kept as a high-water mark)
+- Appends only new rows to DATA/injuries/injuries_YYYY-MM.csv (rewritten only
+  when an archived item changed or the columns differ)
 - Default years: 2024 and 2025. You can pass others via --years.
 
 Examples:
   python scripts/scrape_fantasypros_injuries.py
   python scripts/scrape_fantasypros_injuries.py --years 2024,2025,2023 --max-pages 80
-  python scripts/scrape_fantasypros_injuries.py --max-pages 60  # go deeper to reach older months
+  python scripts/scrape_fantasypros_injuries.py --max-pages 60 --full  # ignore the index, go deeper
 """
 
 import os
 import re
-import time
+import sys
+import glob
+import hashlib
+import sqlite3
 import argparse
-from typing import List, Dict, Optional
+from contextlib import closing
+from typing import List, Dict, Optional, Iterable
 
 import requests
 from bs4 import BeautifulSoup
@@ -27,17 +33,26 @@ import pandas as pd
 from dateutil import parser as dateparser
 from datetime import datetime, timezone
 
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from utils.http_client import client  # noqa: E402
+
 BASE_URL = "https://www.fantasypros.com/nfl/injury-news.php"
-HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-REQUEST_DELAY_SEC = 1.2  # polite crawl delay
+REQUEST_DELAY_SEC = 1.2  # polite crawl delay (enforced per host by the shared client)
 OUTDIR = os.path.join("DATA", "injuries")
-
+INDEX_NAME = "_index.sqlite"
 
 def fetch_page(page: int) -> Optional[str]:
     params = {} if page == 1 else {"page": page}
     url = BASE_URL if page == 1 else f"{BASE_URL}?page={page}"
     print(f"Fetching page {page}: {url}")
-    resp = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=20)
+    try:
+        resp = client().get(BASE_URL, params=params, timeout=20)
+    except requests.RequestException as e:
+        print(f"  ! {type(e).__name__}: {e}")
+        return None
     if resp.status_code != 200:
         print(f"  ! HTTP {resp.status_code}")
         return None
@@ -49,13 +64,25 @@ def clean_ordinals(s: str) -> str:
     return re.sub(r"(\d+)(st|nd|rd|th)", r"\1", s)
 
 
+# US zones the site prints (hours from UTC)
+TZ_OFFSETS = {"EDT": -4, "EST": -5, "CDT": -5, "CST": -6, "MDT": -6,
+              "MST": -7, "PDT": -7, "PST": -8, "ET": -5}
+
+# "Sun, Aug 10th 6:32pm EDT" (optionally with a year after the day)
+DATE_RX = (r"(?P<mon>[A-Za-z]{3})[A-Za-z]*\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?"
+           r"(?:,?\s+(?P<year>\d{4}))?,?\s+(?P<time>\d{1,2}:\d{2}\s*[AaPp][Mm])"
+           r"(?:\s+(?P<tz>[A-Za-z]{2,4})\b)?")
+FUTURE_SLACK = pd.Timedelta(days=3)  # yearless dates further ahead than this belong to last year
+
+
 def parse_date(text: str) -> Optional[datetime]:
     if not text:
         return None
     try:
         # ex: "Sun, Aug 10th 6:32pm EDT"
         t = clean_ordinals(text)
-        dt = dateparser.parse(t, fuzzy=True)
+        tzinfos = {k: v * 3600 for k, v in TZ_OFFSETS.items()}
+        dt = dateparser.parse(t, fuzzy=True, tzinfos=tzinfos)
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(timezone.utc)
@@ -63,6 +90,44 @@ def parse_date(text: str) -> Optional[datetime]:
         return None
 
 
+def parse_dates(dates: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_date: one regex extract + one to_datetime over the whole
+    column. Strings the site pattern misses fall back to dateutil row by row.
+    A missing year means the current year, or last year when that would put
+    the item more than a few days in the future (same rule as
+    utils.injury_store.parse_report_date).
+    """
+    text = dates.fillna("").astype(str)
+    parts = text.str.extract(DATE_RX)
+    year = parts["year"].fillna(str(datetime.now().year))
+    stamp = (year + " " + parts["mon"].str.title() + " " + parts["day"] + " "
+             + parts["time"].str.replace(" ", "", regex=False).str.upper())
+    naive = pd.to_datetime(stamp, format="%Y %b %d %I:%M%p", errors="coerce")
+    offset_h = parts["tz"].str.upper().map(TZ_OFFSETS).fillna(0)
+    out = (naive - pd.to_timedelta(offset_h, unit="h")).dt.tz_localize("UTC")
+
+    missed = out.isna() & text.str.strip().ne("")
+    if missed.any():
+        out[missed] = pd.to_datetime(text[missed].map(parse_date), utc=True)
+
+    yearless = parts["year"].isna() & ~text.str.contains(r"\b(?:19|20)\d\d\b")
+    future = yearless & (out > pd.Timestamp.now(tz="UTC") + FUTURE_SLACK)
+    if future.any():
+        out[future] = out[future] - pd.DateOffset(years=1)
+    return out
+
+
+def item_keys(headlines: pd.Series, dates: pd.Series) -> pd.Series:
+    """Vectorized item_key(): normalize with string ops, then hash each row."""
+    raw = _norm(headlines) + "|" + _norm(dates)
+    return raw.map(lambda r: hashlib.sha1(r.encode("utf-8")).hexdigest())
+
+
+def _norm(col: pd.Series) -> pd.Series:
+    return col.fillna("").astype(str).str.strip().str.lower()
+
+
 def extract_items(html: str) -> List[Dict]:
     soup = BeautifulSoup(html, "html.parser")
     articles = soup.find_all("div", class_="player-news-item")
@@ -108,8 +173,84 @@ def extract_items(html: str) -> List[Dict]:
     return items
 
 
-def scrape(max_pages: int) -> pd.DataFrame:
+def item_key(headline: Optional[str], date: Optional[str]) -> str:
+    """Stable item id: sha1(headline|date), same scheme as utils/injury_store."""
+    raw = f"{(headline or '').strip().lower()}|{(date or '').strip().lower()}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ArchiveIndex:
+    """
+    Keys of every archived item (SQLite, primary-key indexed) plus a
+    high-water mark, so a crawl can stop at the first item it already has
+    and month files are appended to without reading their rows.
+    """
+    def __init__(self, outdir: str):
+        ensure_dir(outdir)
+        self.outdir = outdir
+        self.path = os.path.join(outdir, INDEX_NAME)
+        fresh = not os.path.exists(self.path)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS items (item_key TEXT PRIMARY KEY, ym TEXT);"
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+            )
+        if fresh:
+            self.seed_from_csvs()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def seed_from_csvs(self) -> int:
+        """Index rows already in month CSVs written before the index existed."""
+        n = 0
+        for path in sorted(glob.glob(os.path.join(self.outdir, "injuries_*.csv"))):
+            ym = os.path.basename(path)[len("injuries_"):-len(".csv")]
+            try:
+                existing = pd.read_csv(path, usecols=["headline", "date"], dtype=str)
+            except Exception:
+                continue
+            n += self.add((k, ym) for k in item_keys(existing["headline"], existing["date"]))
+        if n:
+            print(f"Indexed {n} existing archive rows")
+        return n
+
+    def known(self, keys: List[str]) -> set:
+        found = set()
+        with closing(self._connect()) as conn:
+            for i in range(0, len(keys), 900):  # stay under SQLite's bound-parameter limit
+                chunk = keys[i:i + 900]
+                rows = conn.execute(
+                    f"SELECT item_key FROM items WHERE item_key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(r[0] for r in rows)
+        return found
+
+    def add(self, pairs: Iterable) -> int:
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO items (item_key, ym) VALUES (?, ?)", pairs)
+            return conn.total_changes - before
+
+    def get_high_water(self) -> Optional[str]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key='high_water'").fetchone()
+        return row[0] if row else None
+
+    def set_high_water(self, key: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('high_water', ?)", (key,))
+
+
+def scrape(max_pages: int, index: Optional[ArchiveIndex] = None) -> pd.DataFrame:
+    """
+    Crawl newest-first. With an `index`, stop at the first item already
+    archived and return only the new ones. The newest item's key is left in
+    df.attrs["high_water"]; main() records it once the rows are saved.
+    """
+    client().set_host_limit("www.fantasypros.com", 1, REQUEST_DELAY_SEC)  # sequential, spaced pages
     rows: List[Dict] = []
+    high_water = index.get_high_water() if index else None
     for page in range(1, max_pages + 1):
         html = fetch_page(page)
         if not html:
@@ -118,11 +259,24 @@ def scrape(max_pages: int) -> pd.DataFrame:
         if not page_items:
             # likely end of listings
             break
-        rows.extend(page_items)
-        time.sleep(REQUEST_DELAY_SEC)
+        if index is None:
+            rows.extend(page_items)
+        else:
+            keys = [item_key(it["headline"], it["date"]) for it in page_items]
+            known = {high_water} if keys[0] == high_water else index.known(keys)
+            hit = False
+            for it, k in zip(page_items, keys):
+                if k in known:
+                    hit = True
+                    break
+                rows.append(it)
+            if hit:
+                print(f"  reached archived items on page {page}")
+                break
     df = pd.DataFrame(rows)
     if not df.empty:
-        df["_date_parsed"] = df["date"].apply(parse_date)
+        df.attrs["high_water"] = item_key(rows[0]["headline"], rows[0]["date"])
+        df["_date_parsed"] = parse_dates(df["date"])
         df = df.sort_values("_date_parsed", ascending=False, na_position="last")
     print(f"Scraped total rows: {len(df)}")
     return df
@@ -137,48 +291,76 @@ def normalize_df(df: pd.DataFrame) -> pd.DataFrame:
     for c in cols:
         if c not in df.columns:
             df[c] = None
-        df[c] = df[c].astype(str).replace({"None": ""})
+        df[c] = df[c].fillna("").astype(str).replace({"None": "", "nan": ""})
     if "_date_parsed" not in df.columns:
-        df["_date_parsed"] = df["date"].apply(parse_date)
+        df["_date_parsed"] = parse_dates(df["date"])
     df = df.sort_values("_date_parsed", ascending=False, na_position="last")
     ordered = ["date", "player_name", "headline", "description", "fantasy_impact"]
-    for c in ordered:
-        if c not in df.columns:
-            df[c] = None
     return df[ordered + [c for c in df.columns if c not in ordered]]
 
 
 def dedupe_keep_newest(df: pd.DataFrame) -> pd.DataFrame:
-    # Deduplicate by (player_name, date, headline), case-insensitive
-    df["_key"] = df.apply(
-        lambda r: f"{str(r.get('player_name') or '').strip().lower()}|"
-                  f"{str(r.get('date') or '').strip().lower()}|"
-                  f"{str(r.get('headline') or '').strip().lower()}",
-        axis=1
-    )
-    df = df.drop_duplicates(subset=["_key"], keep="first").drop(columns=["_key"], errors="ignore")
-    return df
+    # Deduplicate by (player_name, date, headline), case-insensitive; rows are newest-first
+    key = _norm(df["player_name"]) + "|" + _norm(df["date"]) + "|" + _norm(df["headline"])
+    return df[~key.duplicated(keep="first")]
+
 
+def _write_month(df: pd.DataFrame, out_path: str) -> None:
+    tmp = out_path + ".tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, out_path)
 
-def merge_save_month(df_month: pd.DataFrame, ym: str, outdir: str):
+
+def append_month(df_month: pd.DataFrame, ym: str, outdir: str, index: ArchiveIndex):
+    """
+    Keyed upsert of a month. Rows whose key is not yet indexed are appended
+    to the month CSV in the file's own column order (no read of the rows).
+    The file is read and rewritten only when an already-archived item came
+    back with different fields, or the scraped columns are not all in the
+    file's header; scraped rows win on key.
+    """
     ensure_dir(outdir)
     out_path = os.path.join(outdir, f"injuries_{ym}.csv")
-    if os.path.exists(out_path):
-        try:
-            existing = pd.read_csv(out_path)
-        except Exception:
-            existing = pd.DataFrame()
-    else:
-        existing = pd.DataFrame()
-
-    merged = pd.concat([existing, df_month], ignore_index=True)
-    if "_date_parsed" not in merged.columns:
-        merged["_date_parsed"] = merged["date"].apply(parse_date)
-    merged = merged.sort_values("_date_parsed", ascending=False, na_position="last")
-    merged = dedupe_keep_newest(merged)
-    merged = merged.drop(columns=["_date_parsed"], errors="ignore")
-    merged.to_csv(out_path, index=False)
-    print(f"  -> wrote {len(merged)} rows to {out_path}")
+    df_month = dedupe_keep_newest(df_month.drop(columns=["_date_parsed"], errors="ignore"))
+    keys = item_keys(df_month["headline"], df_month["date"])
+    first = ~keys.duplicated(keep="first")
+    df_month, keys = df_month[first], keys[first]
+    indexed = keys.isin(index.known(keys.tolist()))
+
+    header = list(pd.read_csv(out_path, nrows=0).columns) if os.path.exists(out_path) else None
+    if header is None:
+        _write_month(df_month, out_path)
+        index.add((k, ym) for k in keys)
+        print(f"  -> wrote {len(df_month)} rows to {out_path}")
+        return
+
+    new_columns = [c for c in df_month.columns if c not in header]
+    updated = 0
+    if indexed.any() or new_columns:
+        existing = pd.read_csv(out_path, dtype=str, keep_default_na=False)
+        ex_keys = item_keys(existing["headline"], existing["date"])
+        cols = [c for c in df_month.columns if c in existing.columns]
+        old = existing.set_index(ex_keys)[cols]
+        old = old[~old.index.duplicated(keep="first")]
+        seen = df_month[indexed].set_index(keys[indexed])[cols]
+        updated = int((seen.astype(str) != old.reindex(seen.index).fillna("").astype(str)).any(axis=1).sum())
+        if updated or new_columns:
+            merged = pd.concat([df_month, existing], ignore_index=True)
+            merged = merged[~item_keys(merged["headline"], merged["date"]).duplicated(keep="first")]
+            merged = normalize_df(merged.fillna("")).drop(columns=["_date_parsed"])
+            _write_month(merged, out_path)
+            index.add((k, ym) for k in keys[~indexed])
+            print(f"  -> rewrote {out_path}: {int((~indexed).sum())} new, {updated} updated"
+                  + (f", new columns {new_columns}" if new_columns else ""))
+            return
+
+    new_rows = df_month[~indexed]
+    if new_rows.empty:
+        print(f"  -> nothing new for {out_path}")
+        return
+    new_rows.reindex(columns=header).to_csv(out_path, mode="a", header=False, index=False)
+    index.add((k, ym) for k in keys[~indexed])
+    print(f"  -> appended {len(new_rows)} rows to {out_path}")
 
 
 def main():
@@ -189,6 +371,8 @@ def main():
                     help="How many pages to crawl (default: 60; increase to reach older months)")
     ap.add_argument("--outdir", type=str, default=OUTDIR,
                     help="Output dir for CSVs (default: DATA/injuries)")
+    ap.add_argument("--full", action="store_true",
+                    help="Crawl all --max-pages instead of stopping at the first archived item")
     args = ap.parse_args()
 
     years = []
@@ -199,16 +383,20 @@ def main():
         return
     years_set = set(years)
 
-    df = scrape(max_pages=args.max_pages)
+    index = ArchiveIndex(args.outdir)
+    df = scrape(max_pages=args.max_pages, index=None if args.full else index)
     if df.empty:
         print("No rows scraped.")
         return
+    high_water = df.attrs.get("high_water")
 
     # filter to the chosen years
     df = df[df["_date_parsed"].notna()]
     df = df[df["_date_parsed"].dt.year.isin(years_set)].copy()
     if df.empty:
         print(f"No rows in selected years: {sorted(years_set)}")
+        if high_water:
+            index.set_high_water(high_water)
         return
 
     df = normalize_df(df)
@@ -220,7 +408,10 @@ def main():
         if year_int not in years_set:
             continue
         print(f"Month {ym}: {len(chunk)} rows before merge")
-        merge_save_month(chunk.drop(columns=["_ym"], errors="ignore"), ym, args.outdir)
+        append_month(chunk.drop(columns=["_ym"], errors="ignore"), ym, args.outdir, index)
+
+    if high_water:
+        index.set_high_water(high_water)
 
 
 if __name__ == "__main__":
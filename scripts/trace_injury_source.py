@@ -4,7 +4,9 @@ Trace where get_injury_reports() loads data from.
 
 - Prints the module/file that defines get_injury_reports
 - Shows the first ~120 lines of its source
-- Monkey-patches pandas.read_csv and requests.get/post to log paths/URLs
+- Monkey-patches pandas.read_csv and requests.Session.request to log paths/URLs
+  (every request goes through a Session, including the pooled ones in
+  utils.http_client and the requests.get/post shortcuts)
 - Calls get_injury_reports() and prints basic DataFrame info
 """
 
@@ -92,31 +94,24 @@ def patch_read_csv():
         print(f"[TRACE] pandas.read_csv -> {path}")
         return real(*args, **kwargs)
     pd.read_csv = wrapper
-    return ("pandas.read_csv", real)
+    return (pd, "read_csv", real)
 
 def patch_requests():
     try:
         import requests
     except Exception:
         return None
-    real_get = requests.get
-    real_post = requests.post
-    def wrap(method_name, real):
-        def inner(*args, **kwargs):
-            url = args[0] if args else kwargs.get("url", "<no-url>")
-            captured["http"].append(f"{method_name} {url}")
-            print(f"[TRACE] requests.{method_name} -> {url}")
-            return real(*args, **kwargs)
-        return inner
-    requests.get = wrap("get", real_get)
-    requests.post = wrap("post", real_post)
-    return [("requests.get", real_get), ("requests.post", real_post)]
+    real = requests.Session.request
+    def inner(self, method, url, *args, **kwargs):
+        captured["http"].append(f"{method.upper()} {url}")
+        print(f"[TRACE] requests {method.upper()} -> {url}")
+        return real(self, method, url, *args, **kwargs)
+    requests.Session.request = inner
+    return (requests.Session, "request", real)
 
 def restore(patches):
-    for name, real in patches:
-        pkg, attr = name.split(".")
-        mod = __import__(pkg)
-        setattr(mod, attr, real)
+    for owner, attr, real in patches:
+        setattr(owner, attr, real)
 
 def main():
     from pprint import pprint
@@ -132,9 +127,8 @@ def main():
     patches = []
     r1 = patch_read_csv()
     if r1: patches.append(r1)
-    r2s = patch_requests()
-    if r2s:
-        patches.extend(r2s)
+    r2 = patch_requests()
+    if r2: patches.append(r2)
 
     # Run in app context so any config/env is available
     app = create_app()
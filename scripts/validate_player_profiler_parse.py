@@ -0,0 +1,149 @@
+# scripts/validate_player_profiler_parse.py
+"""
+Check the PlayerProfiler extractor (run.parse_player_page) against saved
+profile pages.
+
+For every fixture, the parsed row is compared column by column with the same
+player's row in a checked-in reference CSV (display values like '22.2%' are
+normalized the same way the extractor types them), so a scraper run can
+never turn the reference into the parser's own output. Each LABEL_ALIASES
+entry is then swapped into the page for the label it stands in for and the
+row must not change. Exits non-zero on any blank or mismatched column.
+
+Save live pages with `player_profiler_scraper.py --save-html scripts/fixtures`
+and add their expected rows to the reference CSV.
+
+Usage:
+    python scripts/validate_player_profiler_parse.py
+    python scripts/validate_player_profiler_parse.py --fixture saved.html --expected my_expected.csv
+"""
+import argparse
+import csv
+import glob
+import html as htmllib
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from run import (  # noqa: E402
+    COLUMNS, LABEL_ALIASES, LABEL_TO_COLUMN, TEXT_COLUMNS, _ProfileWalker, _norm_label,
+    normalize_stat_value, parse_player_page,
+)
+
+FIXTURES_DIR = ROOT / "scripts" / "fixtures"
+DEFAULT_FIXTURES = str(FIXTURES_DIR / "playerprofiler_*.html")
+DEFAULT_EXPECTED = FIXTURES_DIR / "playerprofiler_expected.csv"
+SPLIT_SUFFIXES = (" vs Man", " vs Zone")
+
+def _same(col, got, want):
+    if col in TEXT_COLUMNS:
+        return str(got).strip() == str(want).strip()
+    want = normalize_stat_value(want)
+    if isinstance(got, (int, float)) and isinstance(want, (int, float)):
+        return abs(got - want) < 1e-9
+    return got == want
+
+def _swap_label(html, label, alias):
+    """
+    Page with the cell that produced `label` renamed to `alias`, or None when
+    that cell can't be located unambiguously. Man/Zone split rows are renamed
+    by their row label ("Routes" -> "Routes Run" for "Routes Run vs Man").
+    """
+    old, new = label, alias
+    if html.count(f">{htmllib.escape(old, quote=False)}<") != 1:
+        suffix = next((x for x in SPLIT_SUFFIXES if label.endswith(x) and alias.endswith(x)), None)
+        if suffix is None:
+            return None
+        old, new = label[:-len(suffix)], alias[:-len(suffix)]
+    needle = f">{htmllib.escape(old, quote=False)}<"
+    if html.count(needle) != 1:
+        return None
+    return html.replace(needle, f">{htmllib.escape(new, quote=False)}<")
+
+def check_aliases(html, row, year):
+    """(exercised aliases, failures) for every alias whose column this page fills."""
+    walker = _ProfileWalker()
+    walker.feed(html)
+    by_column = {}
+    for label, _ in walker.pairs:
+        col = LABEL_TO_COLUMN.get(_norm_label(label))
+        if col:
+            by_column.setdefault(col, label)
+
+    exercised, failures = set(), []
+    for alias, col in LABEL_ALIASES.items():
+        label = by_column.get(col)
+        if label is None:
+            continue
+        if _norm_label(label) == _norm_label(alias):
+            exercised.add(alias)  # the page itself uses this alias
+            continue
+        swapped = _swap_label(html, label, alias)
+        if swapped is None:
+            continue
+        exercised.add(alias)
+        got = parse_player_page(swapped, year)
+        diffs = [c for c in COLUMNS if got[c] != row[c]]
+        if diffs:
+            failures.append((alias, label, diffs))
+    return exercised, failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate PlayerProfiler extraction against saved pages")
+    parser.add_argument("--fixture", action="append", default=None, help="Saved profile page(s)")
+    parser.add_argument("--expected", default=str(DEFAULT_EXPECTED), help="Reference CSV (COLUMNS schema)")
+    parser.add_argument("--year", default="2024")
+    args = parser.parse_args()
+
+    paths = args.fixture or sorted(glob.glob(DEFAULT_FIXTURES))
+    with open(args.expected, newline="", encoding="utf-8") as f:
+        expected = {r["Player"]: r for r in csv.DictReader(f)}
+
+    failed = False
+    bad_targets = sorted(a for a, c in LABEL_ALIASES.items() if c not in COLUMNS)
+    if bad_targets:
+        failed = True
+        print(f"❌ LABEL_ALIASES point outside COLUMNS: {bad_targets}")
+
+    exercised = set()
+    for path in paths:
+        html = Path(path).read_text(encoding="utf-8")
+        t0 = time.perf_counter()
+        row = parse_player_page(html, args.year)
+        ms = (time.perf_counter() - t0) * 1000
+        want = expected.get(row["Player"])
+        if want is None:
+            print(f"❌ {path}: no reference row for {row['Player']!r}")
+            failed = True
+            continue
+        blanks = [c for c in COLUMNS if row[c] == ""]
+        diffs = [(c, row[c], want.get(c)) for c in COLUMNS if row[c] != "" and not _same(c, row[c], want.get(c))]
+        if blanks or diffs:
+            failed = True
+            print(f"❌ {Path(path).name}: {len(blanks)} blank, {len(diffs)} mismatched")
+            for c in blanks:
+                print(f"    blank  {c}")
+            for c, got, exp in diffs:
+                print(f"    {c}: got {got!r}, expected {exp!r}")
+        else:
+            print(f"✅ {Path(path).name}: {len(COLUMNS)} columns match ({ms:.1f} ms)")
+
+        hit, alias_failures = check_aliases(html, row, args.year)
+        exercised |= hit
+        for alias, label, cols in alias_failures:
+            failed = True
+            print(f"❌ {Path(path).name}: alias {alias!r} (for {label!r}) changed {cols}")
+        if hit and not alias_failures:
+            print(f"✅ {Path(path).name}: {len(hit)} label aliases give the same row")
+
+    untested = sorted(set(LABEL_ALIASES) - exercised)
+    if untested:
+        print(f"ℹ️  aliases not exercised by any fixture: {untested}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# services/sim_jobs.py
+import hashlib, os, time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import select, update, func
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models.sim_job import SimJob
+from config import (
+    BASE_DIR, SIM_INPUT_FILES, MAX_SIM_WORKERS, SIM_RESULTS_DIR,
+    SIM_JOB_TIMEOUT_MINUTES, SIM_RESULT_MAX_AGE_HOURS, SIM_WEATHER_REFRESH_MINUTES,
+    PROP_SNAPSHOT_DB, WR_PROP_MARKET_FILE, USE_FORECAST_WEATHER
+)
+
+ACTIVE = ("queued", "running")
+
+def weather_epoch() -> int:
+    """Forecast refresh window; boosts fetched in different windows may differ."""
+    if not USE_FORECAST_WEATHER:
+        return 0
+    return int(time.time() // (SIM_WEATHER_REFRESH_MINUTES * 60))
+
+def input_fingerprint(simulations: int) -> str:
+    """
+    Hash of everything that changes a week's output: sim input files,
+    multiplier CSVs and the prop market (snapshot DB / legacy CSV) by
+    path + size + mtime, the forecast refresh window and the simulation count.
+    """
+    from load_multipliers import MULTIPLIER_CSV_PATHS
+
+    h = hashlib.sha1(f"sims={int(simulations)}|weather={weather_epoch()}".encode())
+    sources = list(SIM_INPUT_FILES) + list(MULTIPLIER_CSV_PATHS.values()) + [PROP_SNAPSHOT_DB, WR_PROP_MARKET_FILE]
+    for p in sources:
+        path = Path(p) if Path(p).is_absolute() else BASE_DIR / p
+        try:
+            st = path.stat()
+            h.update(f"|{p}:{st.st_size}:{st.st_mtime_ns}".encode())
+        except OSError:
+            h.update(f"|{p}:missing".encode())
+    return h.hexdigest()
+
+def result_path_for_job(week: int, fingerprint: str) -> Path:
+    """One result file per (week, inputs), so a reused job never points at another run's output."""
+    return Path(SIM_RESULTS_DIR) / "jobs" / f"week_{int(week):02d}_{fingerprint[:8]}.csv"
+
+def _active_job(week: int, fp: str) -> SimJob | None:
+    return (SimJob.query.filter(SimJob.week == week, SimJob.fingerprint == fp, SimJob.status.in_(ACTIVE))
+            .order_by(SimJob.id).first())
+
+def submit_sim_job(week: int, simulations: int = 100, user_id: int | None = None) -> tuple[SimJob, str]:
+    """
+    Returns (job, outcome) where outcome is:
+      'reused'    - a fresh finished result for the same inputs exists
+      'coalesced' - an identical job is already queued/running
+      'queued'    - a new job was created
+    """
+    fp = input_fingerprint(simulations)
+
+    active = _active_job(week, fp)
+    if active:
+        return active, "coalesced"
+
+    cutoff = datetime.utcnow() - timedelta(hours=SIM_RESULT_MAX_AGE_HOURS)
+    done = (SimJob.query.filter(SimJob.week == week, SimJob.fingerprint == fp,
+                                SimJob.status == "done", SimJob.finished_at >= cutoff)
+            .order_by(SimJob.id.desc()).first())
+    if done and done.result_path and os.path.exists(done.result_path):
+        return done, "reused"
+
+    job = SimJob(week=week, simulations=simulations, fingerprint=fp, status="queued", requested_by=user_id)
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent submit won the race (uq_sim_jobs_active_week_fp): join its job.
+        db.session.rollback()
+        active = _active_job(week, fp)
+        if active is None:
+            raise
+        return active, "coalesced"
+    return job, "queued"
+
+def get_job(job_id: int) -> SimJob | None:
+    return db.session.get(SimJob, job_id)
+
+def recent_jobs(limit: int = 50) -> list[SimJob]:
+    return SimJob.query.order_by(SimJob.id.desc()).limit(limit).all()
+
+# ---- worker side ----
+
+def requeue_stale_jobs() -> int:
+    """
+    Running jobs without a heartbeat (updated_at) for SIM_JOB_TIMEOUT_MINUTES
+    belonged to a dead worker: queue them again. A live worker heartbeats
+    while it runs, so slow jobs are left alone.
+    """
+    cutoff = datetime.utcnow() - timedelta(minutes=SIM_JOB_TIMEOUT_MINUTES)
+    heartbeat = func.coalesce(SimJob.updated_at, SimJob.started_at)
+    n = db.session.execute(
+        update(SimJob).where(SimJob.status == "running", heartbeat < cutoff)
+                      .values(status="queued", started_at=None, updated_at=datetime.utcnow(),
+                              progress=0.0, message="requeued")
+    ).rowcount
+    db.session.commit()
+    return n
+
+def claim_next_job() -> SimJob | None:
+    """
+    Moves the oldest queued job to 'running', unless MAX_SIM_WORKERS jobs are
+    already running. Both the running-count check and the status check live
+    in one conditional UPDATE, so the claim is atomic across processes.
+    """
+    job_id = db.session.scalar(select(SimJob.id).where(SimJob.status == "queued").order_by(SimJob.id).limit(1))
+    if job_id is None:
+        return None
+    running = (select(func.count()).select_from(SimJob).where(SimJob.status == "running")
+               .scalar_subquery())
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        update(SimJob).where(SimJob.id == job_id, SimJob.status == "queued", running < MAX_SIM_WORKERS)
+                      .values(status="running", started_at=now, updated_at=now, progress=0.0)
+                      .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return db.session.get(SimJob, job_id) if claimed else None
+
+def set_job_progress(job_id: int, progress: float, message: str | None = None) -> None:
+    """Also the worker heartbeat: every call refreshes updated_at."""
+    values = {"progress": round(float(progress), 3), "updated_at": datetime.utcnow()}
+    if message is not None:
+        values["message"] = message[:500]
+    db.session.execute(update(SimJob).where(SimJob.id == job_id).values(**values))
+    db.session.commit()
+
+def finish_job(job_id: int, result_path) -> None:
+    db.session.execute(update(SimJob).where(SimJob.id == job_id).values(
+        status="done", progress=1.0, result_path=str(result_path),
+        finished_at=datetime.utcnow(), updated_at=datetime.utcnow()))
+    db.session.commit()
+
+def fail_job(job_id: int, message) -> None:
+    db.session.execute(update(SimJob).where(SimJob.id == job_id).values(
+        status="failed", message=str(message)[:500],
+        finished_at=datetime.utcnow(), updated_at=datetime.utcnow()))
+    db.session.commit()
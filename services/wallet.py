@@ -1,8 +1,22 @@
 # services/wallet.py
+from flask import g, has_request_context, session
 from sqlalchemy import select
 from extensions import db
 from models.wallet import Wallet, CoinTxn, RepEvent, Entitlement
 
+def ensure_wallet(user_id: int) -> None:
+    """
+    Makes sure a wallet row exists, committing if it had to be created.
+    Remembered in the login session so dashboard loads skip the query.
+    """
+    if has_request_context() and session.get("_wallet_uid") == user_id:
+        return
+    if Wallet.query.filter_by(user_id=user_id).first() is None:
+        db.session.add(Wallet(user_id=user_id, coins_balance=0, rep_total=0))
+        db.session.commit()
+    if has_request_context():
+        session["_wallet_uid"] = user_id
+
 def get_or_create_wallet(user_id: int) -> Wallet:
     w = Wallet.query.filter_by(user_id=user_id).first()
     if not w:
@@ -60,15 +74,36 @@ def purchase_coins(user_id: int, amount: int, reason: str, idem: str | None = No
 def spend_coins(user_id: int, amount: int, reason: str, idem: str | None = None) -> int:
     return _apply_coin_delta(user_id, -abs(amount), "spend", reason, idem)
 
+# ---- entitlements ----
+# All of a user's (scope, key) pairs are loaded in one query and kept on
+# flask.g for the rest of the request, so paywall checks are set lookups.
+# The (user_id, scope, key) unique constraint is the composite index that
+# serves both this query and the idempotency check on grant.
+
+def user_entitlements(user_id: int) -> frozenset:
+    cache = g.setdefault("_entitlements", {}) if has_request_context() else {}
+    ents = cache.get(user_id)
+    if ents is None:
+        rows = db.session.execute(
+            select(Entitlement.scope, Entitlement.key).where(Entitlement.user_id == user_id)
+        ).all()
+        ents = cache[user_id] = frozenset((scope, key) for scope, key in rows)
+    return ents
+
+def invalidate_entitlements(user_id: int) -> None:
+    if has_request_context():
+        g.setdefault("_entitlements", {}).pop(user_id, None)
+
 def grant_entitlement(user_id: int, scope: str, key: str, source: str) -> Entitlement:
     e = Entitlement(user_id=user_id, scope=scope, key=key, source=source)
     db.session.add(e)
     db.session.commit()
+    invalidate_entitlements(user_id)
     return e
 
 def has_entitlement(user_id: int, scope: str, key: str) -> bool:
-    return db.session.query(
-        db.exists().where(Entitlement.user_id == user_id)
-                    .where(Entitlement.scope == scope)
-                    .where(Entitlement.key == key)
-    ).scalar()
+    return (scope, key) in user_entitlements(user_id)
+
+def has_any_entitlement(user_id: int, *pairs: tuple[str, str]) -> bool:
+    """True if the user holds any of the given (scope, key) pairs."""
+    return not user_entitlements(user_id).isdisjoint(pairs)
@@ -9,15 +9,10 @@ from multiprocessing import Pool, cpu_count
 
 from config import (
     NFL_SCHEDULE_2025_FILE,
-    WR_STATS_2024_FILE,
-    DB_ALIGNMENT_FILE,
     DEF_COVERAGE_TAGS_FILE,
     EXPORT_FULL_SEASON_FILE,
     EXPORT_TEST_WEEK_FILE,
     STADIUM_ENV_FILE,
-    WR_PROP_MARKET_FILE,
-    ROSTER_2025_FILE,
-    PROJECTION_SOURCE_TOGGLE,
     USE_FORECAST_WEATHER
 )
 from stat_loader import load_csv
@@ -26,6 +21,8 @@ from weather_estimator import get_noaa_forecast
 from report_generator import export_wr_weekly_summary
 from html_generator import export_week_html
 from load_multipliers import load_all_multipliers
+from market_blend import apply_market_blend
+from stat_blender import ensure_blends
 
 
 # -------------------------------
@@ -215,6 +212,46 @@ def build_forecast_weather_boost_map(schedule_df, env_profile_df):
     #Returns the full mapping of (week, team) to weather boost.
     return env_boost_map
 
+# -------------------------------
+# LOAD SIM INPUTS
+# -------------------------------
+
+def load_sim_inputs():
+    """
+    Loads and parses everything a simulation run needs, once:
+    schedule (plus a per-week index), WR stats, DB alignment, coverage map,
+    weather/environment boosts and multipliers.
+    """
+    print(f'\n1. Loading schedule...')
+    #Loads the raw schedule CSV and parses it to normalize/format it for use.
+    schedule_df = parse_schedule(load_csv(NFL_SCHEDULE_2025_FILE))
+
+    # Multi-year blends (BLEND_WEIGHTS); rebuilt only when the per-year inputs change
+    blended_wr_file, blended_db_file = ensure_blends()
+
+    print(f'\n2. Loading WR stats...')
+    wr_map = load_wr_stats(blended_wr_file)
+
+    print(f'\n3. Loading DB alignment...')
+    db_map = load_db_alignment(blended_db_file)
+
+    print(f'\n4. Loading coverage tags...')
+    def_coverage_map = build_def_team_coverage_map(load_csv(DEF_COVERAGE_TAGS_FILE))
+
+    print(f'\n5. Loading environment profile...')
+    env_profile_df = load_csv(STADIUM_ENV_FILE)
+    env_boost_map = build_forecast_weather_boost_map(schedule_df, env_profile_df)
+
+    return {
+        "schedule_df": schedule_df,
+        "schedule_by_week": {int(w): g for w, g in schedule_df.groupby("Week")},
+        "wr_map": wr_map,
+        "db_map": db_map,
+        "def_coverage_map": def_coverage_map,
+        "env_boost_map": env_boost_map,
+        "multipliers": load_all_multipliers(),
+    }
+
 # -------------------------------
 # SIMULATE_FOR_WEEK
 # -------------------------------
@@ -255,27 +292,16 @@ def simulate_for_week(args):
 # RUN SEASON SIMULATION
 # -------------------------------
 
-def run_season_simulation(output_file=None, simulations=100):
-    print(f'\n1. Loading schedule...')
-    raw_schedule_df = load_csv(NFL_SCHEDULE_2025_FILE)
-    schedule_df = parse_schedule(raw_schedule_df)
-
-    print(f'\n2. Loading WR stats...')
-    wr_map = load_wr_stats(WR_STATS_2024_FILE)
-
-    print(f'\n3. Loading DB alignment...')
-    db_map = load_db_alignment(DB_ALIGNMENT_FILE)
-
-    print(f'\n4. Loading coverage tags...')
-    coverage_df = load_csv(DEF_COVERAGE_TAGS_FILE)
-    def_coverage_map = build_def_team_coverage_map(coverage_df)
-
-    print(f'\n5. Loading environment profile...')
-    env_profile_df = load_csv(STADIUM_ENV_FILE)
-    env_boost_map = build_forecast_weather_boost_map(schedule_df, env_profile_df)
+def run_season_simulation(output_file=None, simulations=100, inputs=None):
+    inputs = inputs or load_sim_inputs()
+    schedule_df = inputs["schedule_df"]
+    wr_map = inputs["wr_map"]
+    db_map = inputs["db_map"]
+    def_coverage_map = inputs["def_coverage_map"]
+    env_boost_map = inputs["env_boost_map"]
 
     print(f'\n6. Simulating season in parallel using {cpu_count()} cores...')
-    multipliers = load_all_multipliers()
+    multipliers = inputs["multipliers"]
     args = [
         (week, wr_map, schedule_df, db_map, def_coverage_map, env_boost_map, simulations, multipliers)
         for week in sorted(schedule_df['Week'].unique())
@@ -287,6 +313,8 @@ def run_season_simulation(output_file=None, simulations=100):
     results = [r for week in week_results for r in week if r]
 
     output_df = pd.DataFrame(results)
+    if not output_df.empty:
+        apply_market_blend(output_df)
     out_file = output_file or EXPORT_FULL_SEASON_FILE
     output_df.to_csv(out_file, index=False)
     print(f"\n✅ Full-season projections saved to {out_file}")
@@ -311,33 +339,25 @@ def run_season_simulation(output_file=None, simulations=100):
 # RUN WEEK SIMULATION
 # -------------------------------
 
-def run_week_simulation(week, output_file=None, simulations=100):
-    multipliers = load_all_multipliers()
+def run_week_simulation(week, output_file=None, simulations=100, inputs=None, progress=None):
+    """
+    Simulates one week. Pass `inputs` from load_sim_inputs() to reuse already
+    parsed data (the resident sim worker does); `progress(done, total)` is
+    called after each WR.
+    """
+    inputs = inputs or load_sim_inputs()
+    multipliers = inputs["multipliers"]
+    wr_map = inputs["wr_map"]
+    db_map = inputs["db_map"]
+    def_coverage_map = inputs["def_coverage_map"]
+    env_boost_map = inputs["env_boost_map"]
+    #Only this week's games: project_wr_week filters the schedule once per WR.
+    schedule_df = inputs["schedule_by_week"].get(week, inputs["schedule_df"].iloc[0:0])
 
-    #Loads the raw schedule CSV into a DataFrame.
-    raw_schedule_df = load_csv(NFL_SCHEDULE_2025_FILE)
-    #Parses the schedule DataFrame to normalize/format it for use.
-    schedule_df = parse_schedule(raw_schedule_df)
-
-    #Loads WR stats from the 2024 stats CSV into a dictionary or mapping of WR objects.
-    wr_map = load_wr_stats(WR_STATS_2024_FILE)
     #Prints which teams, opponents, and number of games are scheduled for the week (for debugging/logging).
-    print("\nSchedule teams for week", week, ":", schedule_df[schedule_df['Week'] == week]['Team'].tolist())
-    print("\nSchedule opponents for week", week, ":", schedule_df[schedule_df['Week'] == week]['Opponent'].tolist())
-    print("\nNumber of schedule rows for week", week, ":", len(schedule_df[schedule_df['Week'] == week]))
-
-    #Loads the DB (defensive back) alignment data for the week from the CSV into a mapping or dictionary.
-    db_map = load_db_alignment(DB_ALIGNMENT_FILE)
-
-    #Loads the defense coverage scheme CSV into a DataFrame (contains man/zone rates per team/week).
-    coverage_df = load_csv(DEF_COVERAGE_TAGS_FILE)
-    #Processes the coverage DataFrame to build a mapping of teams/weeks to their man/zone scheme rates.
-    def_coverage_map = build_def_team_coverage_map(coverage_df)
-
-    #Loads stadium environment profile data (lat/lon, dome, turf, etc.) into a DataFrame.
-    env_profile_df = load_csv(STADIUM_ENV_FILE)
-    #Builds a map of environment/weather boosts for each team/week using the schedule and stadium environment data.
-    env_boost_map = build_forecast_weather_boost_map(schedule_df, env_profile_df)
+    print("\nSchedule teams for week", week, ":", schedule_df['Team'].tolist())
+    print("\nSchedule opponents for week", week, ":", schedule_df['Opponent'].tolist())
+    print("\nNumber of schedule rows for week", week, ":", len(schedule_df))
 
     #Initializes an empty list to hold the simulation results for each WR, and a cache for DB penalties (for efficiency).
     results = []
@@ -360,6 +380,8 @@ def run_week_simulation(week, output_file=None, simulations=100):
         )
         if wr_performance_projections:
             results.append(wr_performance_projections)
+        if progress:
+            progress(i + 1, len(wr_map))
 
     output_df = pd.DataFrame(results)
     out_file = output_file or EXPORT_TEST_WEEK_FILE
@@ -375,68 +397,8 @@ def run_week_simulation(week, output_file=None, simulations=100):
             f"output/game_script_report_week{week}.csv", index=False)
         print(f"📝 Game script report saved to output/game_script_report_week{week}.csv")
 
-    # Load DK props and roster for player matching
-    try:
-        prop_df = pd.read_csv(WR_PROP_MARKET_FILE)
-        roster_df = pd.read_csv(ROSTER_2025_FILE)
-    except FileNotFoundError:
-        print("❌ Could not find prop or roster file.")
-        prop_df = pd.DataFrame()
-        roster_df = pd.DataFrame()
-
-    # Clean and match players
-    def clean_name(name):
-        return name.lower().replace(".", "").replace("-", "").replace("'", "").replace(" ", "")
-
-    if not prop_df.empty and not roster_df.empty:
-        roster_df["clean_name"] = roster_df["full_name"].apply(clean_name)
-        prop_df["player_clean"] = prop_df["player"].apply(clean_name)
-
-        prop_pivot = prop_df.pivot_table(index="player_clean", columns="market", values="value",
-                                         aggfunc="first").reset_index()
-        prop_df_grouped = prop_df.groupby("player_clean").first().reset_index()
-        prop_pivot["player"] = prop_df_grouped["player"]
-
-        merged = pd.merge(roster_df, prop_pivot, on="clean_name", how="inner")
-
-        # Fantasy scoring logic
-        merged["market_rec"] = merged.get("player_receptions", 0) + 0.5
-        merged["market_yds"] = merged.get("player_receiving_yards", 0) + 2.0
-        merged["market_td"] = 0.4  # default if odds missing
-
-        # Map prop points to final projection df
-        name_map = dict(
-            zip(merged["gsis_id"], merged[["market_rec", "market_yds", "market_td", "player"]].values.tolist()))
-
-        def map_market_projection(row):
-            pid = row.get("player_id")
-            if pid in name_map:
-                rec, yds, td, _ = name_map[pid]
-                return rec + yds * 0.1 + td * 6.0
-            return None
-
-        output_df["market_ppr"] = output_df.apply(map_market_projection, axis=1)
-        output_df["model_ppr"] = output_df["final_pts"]
-        output_df["blend_ppr"] = output_df[["model_ppr", "market_ppr"]].mean(axis=1)
-
-        # Apply source toggle
-        def select_proj(row):
-            if PROJECTION_SOURCE_TOGGLE == "market" and not pd.isna(row["market_ppr"]):
-                return row["market_ppr"], "market"
-            elif PROJECTION_SOURCE_TOGGLE == "blend" and not pd.isna(row["market_ppr"]):
-                return row["blend_ppr"], "blend"
-            else:
-                return row["model_ppr"], "model"
-
-        output_df[["final_proj", "proj_source"]] = output_df.apply(lambda row: pd.Series(select_proj(row)), axis=1)
-
-        print(f"📦 Projections updated with {PROJECTION_SOURCE_TOGGLE} source.")
-    else:
-        output_df["market_ppr"] = None
-        output_df["model_ppr"] = output_df["final_pts"]
-        output_df["blend_ppr"] = output_df["final_pts"]
-        output_df["final_proj"] = output_df["final_pts"]
-        output_df["proj_source"] = "model"
+    # Blend model projections with the DK prop market (join-and-mask, see market_blend.py)
+    apply_market_blend(output_df)
 
     # ✅ Export Weekly WR Summary
     export_wr_weekly_summary(output_df, week)
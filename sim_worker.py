@@ -0,0 +1,214 @@
+# sim_worker.py
+"""
+Resident simulation worker.
+
+Keeps parsed sim inputs (schedule + per-week index, WR stats, DB alignment,
+coverage map, weather boosts, multipliers) warm in memory and runs week jobs
+from the SimJob table in the app DB, so a re-run only pays for the
+simulation itself. No external broker: the DB row is the queue entry.
+
+    python sim_worker.py                 # serve the queue
+    python sim_worker.py --workers 2     # two worker processes (<= MAX_SIM_WORKERS)
+    python sim_worker.py --enqueue 3     # queue week 3 and exit
+    python sim_worker.py --once          # drain the queue and exit
+"""
+
+import argparse
+import os
+import shutil
+import time
+import traceback
+from multiprocessing import Process
+from pathlib import Path
+
+from config import SIM_INPUT_FILES, SIM_RESULTS_DIR, MAX_SIM_WORKERS
+
+POLL_INTERVAL = 1.0          # seconds between queue polls when idle
+PROGRESS_STEP = 0.05         # write progress to the queue every 5%
+HEARTBEAT_INTERVAL = 30.0    # ...and at least this often (seconds), so a live job is never requeued
+
+# -------------------------------
+# JOB QUEUE
+# -------------------------------
+
+class SimQueue:
+    """
+    Worker-side view of the SimJob table (services/sim_jobs.py) in the app DB.
+    Needs an app context; the web app submits through submit_sim_job().
+    """
+
+    def claim(self):
+        from services.sim_jobs import claim_next_job, result_path_for_job
+        job = claim_next_job()
+        if job is None:
+            return None
+        return dict(job.to_dict(), result_path=str(result_path_for_job(job.week, job.fingerprint)))
+
+    def set_progress(self, job_id, progress, message=None):
+        from services.sim_jobs import set_job_progress
+        set_job_progress(job_id, progress, message)
+
+    def finish(self, job_id, result_path):
+        from services.sim_jobs import finish_job
+        finish_job(job_id, result_path)
+
+    def fail(self, job_id, message):
+        from services.sim_jobs import fail_job
+        fail_job(job_id, message)
+
+    def requeue_stale(self):
+        from services.sim_jobs import requeue_stale_jobs
+        return requeue_stale_jobs()
+
+# -------------------------------
+# WARM STATE
+# -------------------------------
+
+class SimState:
+    """
+    Parsed sim inputs held in memory. Reloaded only when a source CSV changes
+    or the forecast refresh window (services.sim_jobs.weather_epoch, also part
+    of the job fingerprint) has moved on.
+    """
+
+    def __init__(self):
+        self.inputs = None
+        self.signature = None
+        self.weather_epoch = None
+
+    @staticmethod
+    def _signature():
+        from load_multipliers import MULTIPLIER_CSV_PATHS
+        sig = []
+        for p in list(SIM_INPUT_FILES) + list(MULTIPLIER_CSV_PATHS.values()):
+            try:
+                sig.append((str(p), os.stat(p).st_mtime))
+            except OSError:
+                sig.append((str(p), None))
+        return tuple(sig)
+
+    def get(self):
+        from sim_engine import load_sim_inputs
+        from services.sim_jobs import weather_epoch
+
+        sig, epoch = self._signature(), weather_epoch()
+        if self.inputs is None or sig != self.signature or epoch != self.weather_epoch:
+            started = time.time()
+            self.inputs = load_sim_inputs()
+            self.signature, self.weather_epoch = sig, epoch
+            print(f"🔥 Sim inputs loaded in {time.time() - started:.1f}s")
+        return self.inputs
+
+# -------------------------------
+# WORKER
+# -------------------------------
+
+def result_path_for_week(week):
+    """Published result the week page reads: a copy of the latest finished job's file."""
+    return Path(SIM_RESULTS_DIR) / f"week_{int(week):02d}.csv"
+
+def _replace_file(src, dst):
+    tmp = Path(f"{dst}.tmp{os.getpid()}")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+class SimWorker:
+    def __init__(self, queue=None, state=None):
+        self.queue = queue or SimQueue()
+        self.state = state or SimState()
+
+    def run_job(self, job):
+        from sim_engine import run_week_simulation
+
+        job_id, week = job["id"], job["week"]
+        out = Path(job["result_path"])
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(f"{out.stem}.{job_id}.tmp.csv")
+        last = [0.0, time.time()]
+
+        def progress(done, total):
+            frac = done / max(total, 1)
+            now = time.time()
+            if frac - last[0] >= PROGRESS_STEP or now - last[1] >= HEARTBEAT_INTERVAL or done == total:
+                last[0], last[1] = frac, now
+                self.queue.set_progress(job_id, frac * 0.95, f"{done}/{total} WRs")
+
+        try:
+            self.queue.set_progress(job_id, 0, "loading inputs")
+            inputs = self.state.get()
+            started = time.time()
+            run_week_simulation(week, output_file=str(tmp), simulations=job["simulations"],
+                                inputs=inputs, progress=progress)
+            # same inputs -> same file name, so swap it in whole for any reader of a reused job
+            os.replace(tmp, out)
+            _replace_file(out, result_path_for_week(week))
+            self.queue.finish(job_id, out)
+            print(f"✅ Job {job_id}: week {week} done in {time.time() - started:.1f}s → {out}")
+        except Exception as e:
+            traceback.print_exc()
+            tmp.unlink(missing_ok=True)
+            self.queue.fail(job_id, e)
+            print(f"❌ Job {job_id}: week {week} failed: {e}")
+
+    def run_pending(self):
+        """Runs queued jobs until the queue is empty. Returns how many ran."""
+        n = 0
+        while (job := self.queue.claim()) is not None:
+            self.run_job(job)
+            n += 1
+        return n
+
+    def serve(self, poll_interval=POLL_INTERVAL):
+        print(f"🚀 Sim worker {os.getpid()} waiting for jobs")
+        self.state.get()  # warm up before the first job arrives
+        while True:
+            if not self.run_pending():
+                self.queue.requeue_stale()
+                time.sleep(poll_interval)
+
+# -------------------------------
+# CLI
+# -------------------------------
+
+def _serve_in_app(poll_interval, once=False):
+    from app import create_app
+
+    with create_app().app_context():
+        worker = SimWorker()
+        if once:
+            print(f"Ran {worker.run_pending()} job(s)")
+        else:
+            worker.serve(poll_interval)
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident SIMDaddy simulation worker")
+    parser.add_argument("--enqueue", type=int, metavar="WEEK", help="Queue a week and exit")
+    parser.add_argument("--sims", type=int, default=100, help="Simulations per WR (with --enqueue)")
+    parser.add_argument("--once", action="store_true", help="Drain the queue once and exit")
+    parser.add_argument("--workers", type=int, default=1, help=f"Worker processes (max {MAX_SIM_WORKERS})")
+    parser.add_argument("--poll", type=float, default=POLL_INTERVAL, help="Idle poll interval (seconds)")
+    args = parser.parse_args()
+
+    if args.enqueue:
+        from app import create_app
+        from services.sim_jobs import submit_sim_job
+
+        with create_app().app_context():
+            job, outcome = submit_sim_job(args.enqueue, args.sims)
+        print(f"📥 Week {args.enqueue}: job {job.id} ({outcome})")
+        return
+
+    n = max(1, min(args.workers, MAX_SIM_WORKERS))
+    if args.once or n == 1:
+        _serve_in_app(args.poll, once=args.once)
+        return
+
+    # Each process keeps its own warm inputs; claim_next_job() caps concurrent runs.
+    procs = [Process(target=_serve_in_app, args=(args.poll,), daemon=True) for _ in range(n)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+if __name__ == "__main__":
+    main()
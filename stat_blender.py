@@ -0,0 +1,217 @@
+# stat_blender.py
+
+"""
+Multi-year PlayerProfiler blending (BLEND_WEIGHTS) for WRs and DBs.
+
+Per-year rows are aligned by player id (shared player identity index,
+normalized-name fallback) and blended with decay weights:
+  - rate stats: weight = year weight x exposure (routes, else targets)
+  - counting stats: weight = year weight
+Bio/identity columns come from the most recent season. Missing seasons
+simply drop out and the remaining weights renormalize per player; seasons
+newer than the blend window (e.g. a rookie's first year) take the newest
+year's weight, older ones are ignored.
+
+Outputs are typed CSVs (BLENDED_WR_FILE / BLENDED_DB_FILE). A fingerprint of
+the inputs (paths, mtimes, sizes, weights) is stored next to them, so
+ensure_blends() is a few stat() calls when nothing changed.
+
+    python stat_blender.py            # rebuild if inputs changed
+    python stat_blender.py --force
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    BLEND_WEIGHTS,
+    BLENDED_DB_FILE,
+    BLENDED_WR_FILE,
+    DATA_DIR,
+    DB_ALIGNMENT_FILE,
+    PLAYER_PROFILER_DIR,
+)
+from utils.player_index import name_to_id_map, normalize_name_series
+
+BLEND_VERSION = 1  # bump when blending rules change so cached outputs are rebuilt
+FINGERPRINT_FILE = DATA_DIR / PLAYER_PROFILER_DIR / "blend_fingerprint.json"
+
+# Columns taken from the latest season instead of blended
+LATEST_COLUMNS = ["Year", "Team", "Player", "Position", "IsRookie", "Height", "Weight", "ArmLength",
+                  "ArmLengthRank", "DraftPick", "DraftYear", "College"]
+
+WR_COUNT_COLUMNS = {"Targets", "SlotSnaps", "RoutesRun", "AirYards", "DeepTargets", "RzTargets", "RzRec",
+                    "CatchableTargets", "Drops", "ContestedCatchTargets", "ExpectedPointsAddedEPA",
+                    "BestBallPointsAdded", "TotalFantasyPoints", "TotalRouteWins", "RoutesVsMan", "RoutesVsZone"}
+DB_COUNT_COLUMNS = {"GamesPlayed", "SoloTackles", "AssistedTackles", "Sacks", "QBPressures", "TacklesForLoss",
+                    "RunStuffs", "TargetsAllowed", "RoutesDefended", "ReceptionsAllowed", "YardsAllowed",
+                    "PassBreakups", "TDsAllowed"}
+
+# Exposure used to weight rate stats (first column present wins)
+WR_EXPOSURE = ["RoutesRun", "Targets"]
+DB_EXPOSURE = ["RoutesDefended", "TargetsAllowed"]
+
+# -------------------------------
+# INPUTS
+# -------------------------------
+
+def wr_year_files(weights=BLEND_WEIGHTS):
+    """{year: path} for the per-season WR_STATS_<year>.csv files that exist."""
+    base = DATA_DIR / PLAYER_PROFILER_DIR
+    return {y: base / f"WR_STATS_{y}.csv" for y in weights if (base / f"WR_STATS_{y}.csv").exists()}
+
+def db_year_files(weights=BLEND_WEIGHTS):
+    """Per-season DB_STATS_<year>.csv files, else the combined multi-year file (Year column)."""
+    base = DATA_DIR / PLAYER_PROFILER_DIR
+    per_year = {y: base / f"DB_STATS_{y}.csv" for y in weights if (base / f"DB_STATS_{y}.csv").exists()}
+    if per_year:
+        return per_year
+    return {None: DB_ALIGNMENT_FILE} if Path(DB_ALIGNMENT_FILE).exists() else {}
+
+def load_years(files, weights=BLEND_WEIGHTS):
+    """Stack per-year files into one long frame restricted to the blend years."""
+    frames = []
+    for year, path in files.items():
+        df = pd.read_csv(path)
+        if year is not None:
+            df["Year"] = year
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    df["Year"] = pd.to_numeric(df["Year"], errors="coerce")
+    return df[df["Year"].isin(list(weights)) | (df["Year"] > max(weights))].reset_index(drop=True)
+
+def to_numeric_frame(df, columns):
+    """
+    Vectorized typing of display values: '22.2%' -> 0.222, '+-2.1%' -> -0.021,
+    '1,566' -> 1566 (same rules as run.normalize_stat_value).
+    """
+    out = {}
+    for col in columns:
+        s = df[col]
+        if pd.api.types.is_numeric_dtype(s):
+            out[col] = s.astype("float64")
+            continue
+        s = s.astype("string").str.strip().str.replace(",", "", regex=False)
+        pct = s.str.endswith("%").fillna(False)
+        s = s.str.rstrip("%").str.replace(r"^\+", "", regex=True)
+        num = pd.to_numeric(s, errors="coerce").astype("float64")
+        out[col] = num.where(~pct, num / 100.0)
+    return pd.DataFrame(out, index=df.index)
+
+# -------------------------------
+# BLEND
+# -------------------------------
+
+def player_keys(df):
+    """Player id from the identity index; normalized name when unknown."""
+    clean = normalize_name_series(df["Player"])
+    try:
+        ids = clean.map(name_to_id_map())
+    except Exception:
+        ids = pd.Series(pd.NA, index=df.index, dtype="object")
+    return ids.fillna("name:" + clean).astype(str)
+
+def blend_frame(df, count_columns, exposure_columns, weights=BLEND_WEIGHTS):
+    """One row per player: decay-weighted blend of every numeric stat column."""
+    if df.empty:
+        return df
+    df = df.copy()
+    df["_key"] = player_keys(df)
+    stat_cols = [c for c in df.columns if c not in LATEST_COLUMNS and not c.startswith("_")]
+    X = to_numeric_frame(df, stat_cols)
+
+    newest = max(weights)
+    year_w = (df["Year"].where(df["Year"] <= newest, newest)
+                .map({int(k): float(v) for k, v in weights.items()}).astype("float64"))
+    exposure = pd.Series(np.nan, index=df.index)
+    for col in exposure_columns:
+        if col in X:
+            exposure = exposure.fillna(X[col])
+    exposure = exposure.where(exposure > 0, 1.0)
+
+    counts = [c for c in stat_cols if c in count_columns]
+    rates = [c for c in stat_cols if c not in count_columns]
+    key = df["_key"]
+    blended = []
+    for cols, w in ((counts, year_w), (rates, year_w * exposure)):
+        if not cols:
+            continue
+        vals = X[cols]
+        mask = vals.notna()
+        num = vals.fillna(0.0).mul(w, axis=0).groupby(key, sort=False).sum()
+        den = mask.mul(w, axis=0).groupby(key, sort=False).sum()
+        blended.append(num / den.where(den > 0))
+
+    # identity/bio columns from each player's latest season
+    latest = (df.sort_values("Year", ascending=False)
+                .drop_duplicates("_key")
+                .set_index("_key")[[c for c in LATEST_COLUMNS if c in df.columns]])
+    years = (df.groupby("_key", sort=False)["Year"]
+               .agg(lambda s: ",".join(str(int(y)) for y in sorted(s.unique(), reverse=True))))
+
+    out = latest.join(blended, how="left") if blended else latest
+    out = out[[c for c in df.columns if c in out.columns and not c.startswith("_")]]
+    out["BlendYears"] = years
+    out.index.name = "PlayerId"
+    return out.reset_index()
+
+def blend_wr(weights=BLEND_WEIGHTS):
+    return blend_frame(load_years(wr_year_files(weights), weights), WR_COUNT_COLUMNS, WR_EXPOSURE, weights)
+
+def blend_db(weights=BLEND_WEIGHTS):
+    return blend_frame(load_years(db_year_files(weights), weights), DB_COUNT_COLUMNS, DB_EXPOSURE, weights)
+
+# -------------------------------
+# CACHE
+# -------------------------------
+
+def input_fingerprint(weights=BLEND_WEIGHTS):
+    parts = [f"v{BLEND_VERSION}", json.dumps({str(k): v for k, v in sorted(weights.items())})]
+    for label, files in (("wr", wr_year_files(weights)), ("db", db_year_files(weights))):
+        for year, path in sorted(files.items(), key=lambda kv: str(kv[0])):
+            st = os.stat(path)
+            parts.append(f"{label}|{year}|{path}|{st.st_mtime_ns}|{st.st_size}")
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+def _write_csv(df, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+def ensure_blends(force=False, weights=BLEND_WEIGHTS):
+    """
+    Rebuild BLENDED_WR_FILE / BLENDED_DB_FILE when the inputs (or weights)
+    changed since the last build. Returns (wr_path, db_path).
+    """
+    fp = input_fingerprint(weights)
+    outputs_exist = Path(BLENDED_WR_FILE).exists() and Path(BLENDED_DB_FILE).exists()
+    if not force and outputs_exist and FINGERPRINT_FILE.exists():
+        try:
+            if json.loads(FINGERPRINT_FILE.read_text()).get("fingerprint") == fp:
+                return BLENDED_WR_FILE, BLENDED_DB_FILE
+        except ValueError:
+            pass
+
+    wr = blend_wr(weights)
+    db = blend_db(weights)
+    _write_csv(wr, BLENDED_WR_FILE)
+    _write_csv(db, BLENDED_DB_FILE)
+    FINGERPRINT_FILE.write_text(json.dumps({"fingerprint": fp, "wr_rows": len(wr), "db_rows": len(db)}))
+    print(f"🧪 Blended stats rebuilt: {len(wr)} WRs -> {BLENDED_WR_FILE}, {len(db)} DBs -> {BLENDED_DB_FILE}")
+    return BLENDED_WR_FILE, BLENDED_DB_FILE
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Blend per-year PlayerProfiler stats with BLEND_WEIGHTS")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if inputs are unchanged")
+    args = parser.parse_args()
+    ensure_blends(force=args.force)
@@ -1,5 +1,12 @@
 # utils/fetch_logos.py
-import os, time, requests, certifi
+"""
+Cache ESPN team logos into static/logos.
+
+    python -m utils.fetch_logos      # from the project root
+"""
+import os, certifi
+
+from utils.http_client import client
 
 ESPN = "https://a.espncdn.com/i/teamlogos/nfl/500/{code}.png"
 
@@ -8,30 +15,18 @@ CODES = [
     "lv","lac","lar","mia","min","ne","no","nyg","nyj","phi","pit","sea","sf","tb","ten","wsh"
 ]
 
-def download(url: str, dst: str, attempts: int = 3) -> bool:
-    # First try with proper CA bundle
-    for i in range(attempts):
-        try:
-            with requests.get(url, timeout=15, stream=True, verify=certifi.where()) as r:
-                r.raise_for_status()
-                with open(dst, "wb") as f:
-                    for chunk in r.iter_content(8192):
-                        if chunk:
-                            f.write(chunk)
-            return True
-        except Exception as e:
-            print(f"  attempt {i+1}/{attempts} ({type(e).__name__}): {e}")
-            time.sleep(0.7)
+def download(url: str, dst: str) -> bool:
+    # First try with proper CA bundle (the shared client retries with backoff)
+    try:
+        client().download(url, dst, timeout=15, verify=certifi.where())
+        return True
+    except Exception as e:
+        print(f"  download failed ({type(e).__name__}): {e}")
 
     # LAST RESORT: try without verification (not ideal, but unblocks local caching)
     print("  falling back to verify=False (temporary workaround)")
     try:
-        with requests.get(url, timeout=15, stream=True, verify=False) as r:  # noqa: S501
-            r.raise_for_status()
-            with open(dst, "wb") as f:
-                for chunk in r.iter_content(8192):
-                    if chunk:
-                        f.write(chunk)
+        client().download(url, dst, timeout=15, verify=False)  # noqa: S501
         return True
     except Exception as e:
         print(f"  final failure: {e}")
@@ -0,0 +1,232 @@
+# utils/http_client.py
+"""
+Shared HTTP client for every scraper and API call.
+
+- One pooled keep-alive requests.Session per process.
+- Per-host concurrency cap and minimum interval between requests.
+- Default timeout on every call.
+- Retries on connection errors, 429 and 5xx, with jittered exponential
+  backoff. Retry-After is honoured.
+- Optional on-disk response cache keyed by URL + params and revalidated
+  with ETag / Last-Modified. A 304 is served from disk; `max_age` skips the
+  network entirely while an entry is fresh.
+
+Usage:
+    from utils.http_client import http_get, get_json
+    resp = http_get(url, params={...})
+    data = get_json(url, cache=True)            # conditional GET, body reused on 304
+"""
+from __future__ import annotations
+import hashlib, json, random, threading, time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import BASE_DIR, HTTP_CACHE_DIR
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+DEFAULT_TIMEOUT = 15          # seconds
+DEFAULT_RETRIES = 3           # extra attempts after the first
+BACKOFF_BASE = 0.5            # seconds; doubled per attempt, then jittered
+BACKOFF_MAX = 20.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# host -> (max concurrent requests, min seconds between request starts)
+HOST_LIMITS = {
+    "www.fantasypros.com": (3, 0.3),
+    "www.playerprofiler.com": (4, 0.25),
+    "api.the-odds-api.com": (2, 0.0),
+    "api.weather.gov": (4, 0.0),
+    "www.nfl.com": (2, 0.5),
+}
+DEFAULT_HOST_LIMIT = (4, 0.0)
+
+
+class _HostGate:
+    """Concurrency semaphore + start-spacing for one host."""
+    def __init__(self, concurrency: int, min_interval: float):
+        self.sem = threading.BoundedSemaphore(max(1, concurrency))
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def __enter__(self):
+        self.sem.acquire()
+        if self.min_interval > 0:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._next_start - now
+                self._next_start = max(now, self._next_start) + self.min_interval
+            if wait > 0:
+                time.sleep(wait)
+        return self
+
+    def __exit__(self, *exc):
+        self.sem.release()
+
+
+class HttpClient:
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 cache_dir=HTTP_CACHE_DIR, host_limits: Optional[dict] = None,
+                 pool_size: int = 16):
+        self.timeout = timeout
+        self.retries = retries
+        p = Path(cache_dir)
+        self.cache_dir = p if p.is_absolute() else BASE_DIR / p
+        self.host_limits = dict(HOST_LIMITS if host_limits is None else host_limits)
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._gates: dict = {}
+        self._gates_lock = threading.Lock()
+
+    # ---- limits ----
+    def set_host_limit(self, host: str, concurrency: int, min_interval: float = 0.0) -> None:
+        with self._gates_lock:
+            self.host_limits[host] = (concurrency, min_interval)
+            self._gates.pop(host, None)
+
+    def _gate(self, url: str) -> _HostGate:
+        host = urlsplit(url).netloc.lower()
+        with self._gates_lock:
+            gate = self._gates.get(host)
+            if gate is None:
+                gate = self._gates[host] = _HostGate(*self.host_limits.get(host, DEFAULT_HOST_LIMIT))
+            return gate
+
+    # ---- cache ----
+    def _cache_paths(self, url: str, params: Optional[dict]):
+        full = url + ("?" + urlencode(sorted(params.items()), doseq=True) if params else "")
+        key = hashlib.sha1(full.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _cached_response(self, url: str, meta: dict, body_path: Path) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = meta.get("status", 200)
+        resp._content = body_path.read_bytes()
+        resp.headers.update(meta.get("headers", {}))
+        resp.url = url
+        resp.encoding = meta.get("encoding")
+        resp.from_cache = True
+        return resp
+
+    def _store(self, meta_path: Path, body_path: Path, resp: requests.Response) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        keep = {k: v for k, v in resp.headers.items()
+                if k.lower() in ("content-type", "etag", "last-modified")}
+        meta = {"url": resp.url, "status": resp.status_code, "headers": keep,
+                "encoding": resp.encoding, "fetched_at": time.time()}
+        tmp = body_path.with_suffix(".tmp")
+        tmp.write_bytes(resp.content)
+        tmp.replace(body_path)
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+    # ---- requests ----
+    def _backoff(self, attempt: int, resp: Optional[requests.Response]) -> float:
+        if resp is not None:
+            ra = resp.headers.get("Retry-After")
+            if ra and ra.strip().isdigit():
+                return min(float(ra), BACKOFF_MAX)
+        return min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+    def _send(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        gate = self._gate(url)
+        for attempt in range(self.retries + 1):
+            resp = None
+            try:
+                with gate:
+                    resp = self.session.get(url, **kwargs)
+                if resp.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return resp
+                resp.close()
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            time.sleep(self._backoff(attempt, resp))
+        raise RuntimeError("unreachable")
+
+    def get(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+            cache: bool = False, max_age: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        GET with pooling, host limits and retries. With `cache`, a stored copy
+        is revalidated (If-None-Match / If-Modified-Since) and reused on 304;
+        with `max_age` as well, a copy younger than that is returned without
+        any request. Cached responses carry `resp.from_cache = True`.
+        """
+        if not cache:
+            resp = self._send(url, params=params, headers=headers, **kwargs)
+            resp.from_cache = False
+            return resp
+
+        meta_path, body_path = self._cache_paths(url, params)
+        meta = None
+        if meta_path.exists() and body_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                meta = None
+        if meta and max_age is not None and time.time() - meta.get("fetched_at", 0) < max_age:
+            return self._cached_response(url, meta, body_path)
+
+        headers = dict(headers or {})
+        if meta:
+            cached_headers = {k.lower(): v for k, v in meta.get("headers", {}).items()}
+            if "etag" in cached_headers:
+                headers["If-None-Match"] = cached_headers["etag"]
+            if "last-modified" in cached_headers:
+                headers["If-Modified-Since"] = cached_headers["last-modified"]
+
+        resp = self._send(url, params=params, headers=headers, **kwargs)
+        if resp.status_code == 304 and meta:
+            meta["fetched_at"] = time.time()
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+            return self._cached_response(url, meta, body_path)
+        resp.from_cache = False
+        if resp.status_code == 200:
+            self._store(meta_path, body_path, resp)
+        return resp
+
+    def get_json(self, url: str, **kwargs):
+        resp = self.get(url, **kwargs)
+        resp.raise_for_status()
+        return resp.json()
+
+    def download(self, url: str, dst, chunk_size: int = 8192, **kwargs) -> None:
+        """Stream a response body to `dst` (written atomically). Raises on HTTP errors."""
+        dst = Path(dst)
+        tmp = dst.with_suffix(dst.suffix + ".part")
+        with self._send(url, stream=True, **kwargs) as r:
+            r.raise_for_status()
+            with open(tmp, "wb") as f:
+                for chunk in r.iter_content(chunk_size):
+                    if chunk:
+                        f.write(chunk)
+        tmp.replace(dst)
+
+
+# =========================
+#   Process-wide client
+# =========================
+
+_CLIENT: Optional[HttpClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+def client() -> HttpClient:
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = HttpClient()
+    return _CLIENT
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    return client().get(url, **kwargs)
+
+def get_json(url: str, **kwargs):
+    return client().get_json(url, **kwargs)
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 import re, time, concurrent.futures as cf
-from typing import Optional, List, Dict, Tuple
+from typing import Callable, Optional, List, Dict, Tuple
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 
+from utils.http_client import http_get
+from utils.player_index import name_to_id_map, normalize_name
+
 BASE_URL = "https://www.fantasypros.com/nfl/injury-news.php"
-HEADERS  = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
 
 # tiny in-process cache (5 minutes)
 _CACHE: dict = {}
@@ -61,9 +63,13 @@ _TEAM_NOUNS = {
     "ravens","saints","seahawks","steelers","texans","titans","vikings"
 }
 
+_NAME_TOKEN_RX = re.compile(_NAME_TOKEN)
+_STOP_SET = frozenset(w.replace("\\.", "") for w in _STOP_WORDS.split("|"))
+_SUFFIX_SPLIT_RX = re.compile(r"\s*\(|\s+-\s+")
+
 def _strip_suffixes(s: str) -> str:
     # Remove anything after " - " (source) or first "("
-    return re.split(r"\s*\(|\s+-\s+", s, maxsplit=1)[0].strip()
+    return _SUFFIX_SPLIT_RX.split(s, maxsplit=1)[0].strip()
 
 def _is_plausible_name(text: str) -> bool:
     t = (text or "").strip()
@@ -75,18 +81,17 @@ def _is_plausible_name(text: str) -> bool:
     tokens = t.split()
     if len(tokens) < 2 or len(tokens) > 4:
         return False
-    return all(re.fullmatch(_NAME_TOKEN, tok) for tok in tokens)
+    return all(_NAME_TOKEN_RX.fullmatch(tok) for tok in tokens)
 
 def _scan_start_until_stop(text: str) -> Optional[str]:
     if not text:
         return None
     parts: List[str] = []
-    stop_set = {w.replace("\\.", "") for w in _STOP_WORDS.split("|")}
     for raw in text.split():
         tok = raw.strip(".,:;!?\"'()").replace("’", "'")
-        if tok.lower() in stop_set:
+        if tok.lower() in _STOP_SET:
             break
-        if re.fullmatch(_NAME_TOKEN, tok):
+        if _NAME_TOKEN_RX.fullmatch(tok):
             parts.append(tok)
             if len(parts) >= 3:
                 break
@@ -99,10 +104,30 @@ def _first_match(regex: re.Pattern, text: str) -> Optional[str]:
     m = regex.search(text)
     return m.group("name").strip() if m else None
 
+def _index_prefix_name(text: str) -> Optional[str]:
+    """
+    Leading 3- or 2-token span of `text` if it is a known player in the
+    shared identity index (dict probes only; no regex passes).
+    """
+    if not text:
+        return None
+    try:
+        names = name_to_id_map()
+    except Exception:
+        return None
+    toks = [re.sub(r"(?:'s|’s)$", "", t.strip(",:;!?\"()")) for t in text.split()[:3]]
+    for n in (3, 2):
+        if len(toks) >= n:
+            span = " ".join(toks[:n])
+            if normalize_name(span) in names:
+                return span
+    return None
+
 def _extract_player_name(headline: Optional[str], description: Optional[str]) -> Optional[str]:
     """
     Robust player-name extractor using headline, with description fallback.
     Order:
+      0) Headline prefix that resolves in the player identity index
       1) POS-based (WR/RB/QB/TE/etc.)
       2) Name before stop word
       3) Start-of-line scan (until stop word)
@@ -111,6 +136,11 @@ def _extract_player_name(headline: Optional[str], description: Optional[str]) ->
     head = _strip_suffixes(headline or "")
     desc = _strip_suffixes(description or "")
 
+    # 0) Known-player prefix (most headlines start with the player's name)
+    name = _index_prefix_name(head)
+    if name:
+        return name
+
     # 1) POS-based
     name = _first_match(_POS_RX, head)
     if name and _is_plausible_name(name):
@@ -154,22 +184,13 @@ def _parser_name() -> str:
 def _extract_text(el) -> str:
     return el.get_text(" ", strip=True) if el else ""
 
-def _parse_article(div) -> Dict[str, Optional[str]]:
-    header = div.find("div", class_="player-news-header")
-    headline_tag = header.find("a") if header else None
-    headline = _extract_text(headline_tag) or None
-
-    date_tag = header.find("p") if header else None
-    date_text = _extract_text(date_tag)
+def _item_from_parts(headline: Optional[str], date_text: Optional[str], paras: List[str]) -> Dict[str, Optional[str]]:
+    """Shared field rules applied to one article's raw header/paragraph text."""
     date = date_text.split(" By ")[0].strip() if date_text else None
 
     description = None
     fantasy_impact = None
-    ten_cols = div.find("div", class_="ten columns")
-    p_tags = ten_cols.find_all("p", recursive=False) if ten_cols else div.find_all("p")
-    found_description = False
-    for p in p_tags:
-        text = _extract_text(p)
+    for text in paras:
         if not text:
             continue
         if "Fantasy Impact" in text:
@@ -177,44 +198,262 @@ def _parse_article(div) -> Dict[str, Optional[str]]:
             continue
         if "Source:" in text or " By " in text:
             continue
-        if not found_description:
+        if description is None:
             description = text
-            found_description = True
-
-    player_name = _extract_player_name(headline, description)
 
     return {
-        "player_name": player_name,
-        "headline": headline,
+        "player_name": _extract_player_name(headline, description),
+        "headline": headline or None,
         "date": date,
         "description": description,
         "fantasy_impact": fantasy_impact
     }
 
+# ---- BeautifulSoup (reference implementation; several find() calls per article) ----
+
+def _parse_article(div) -> Dict[str, Optional[str]]:
+    header = div.find("div", class_="player-news-header")
+    headline_tag = header.find("a") if header else None
+    date_tag = header.find("p") if header else None
+    ten_cols = div.find("div", class_="ten columns")
+    p_tags = ten_cols.find_all("p", recursive=False) if ten_cols else div.find_all("p")
+    return _item_from_parts(_extract_text(headline_tag), _extract_text(date_tag),
+                            [_extract_text(p) for p in p_tags])
+
+def _parse_bs4(html: str) -> List[Dict[str, Optional[str]]]:
+    soup = BeautifulSoup(html, _parser_name())
+    return [_parse_article(a) for a in soup.find_all("div", class_="player-news-item")]
+
+# ---- Single-pass walker (shared by the lxml and stdlib backends) ----
+
+_VOID_TAGS = frozenset({"area", "base", "br", "col", "embed", "hr", "img", "input",
+                        "link", "meta", "source", "track", "wbr"})
+
+class _ArticleWalker:
+    """
+    Fed start/end/text events in document order, collects
+    (headline, date_text, paragraphs) for every player-news-item in one pass.
+    Mirrors the BeautifulSoup rules: headline/date are the first <a>/<p> in the
+    header; paragraphs are the direct <p> children of the "ten columns" div,
+    else every <p> in the article.
+    """
+    def __init__(self):
+        self.parts: List[Tuple[Optional[str], Optional[str], List[str]]] = []
+        self.stack: list = []       # (tag, roles, text buffer or None)
+        self.open_bufs: list = []   # buffers of capturing elements currently open
+        self.art: Optional[dict] = None
+
+    def start(self, tag: str, cls: str) -> None:
+        if tag in _VOID_TAGS:
+            return
+        if tag in ("p", "div") and self.stack and self.stack[-1][0] == "p":
+            self.end("p")  # <p> is closed implicitly by a following block
+        art = self.art
+        roles: tuple = ()
+        if art is None:
+            if tag == "div" and "player-news-item" in cls.split():
+                self.art = {"headline": None, "date": None, "a_taken": False, "p_taken": False,
+                            "in_header": False, "header_seen": False, "ten_seen": False,
+                            "all_p": [], "ten_p": []}
+                roles = ("article",)
+        elif tag == "div":
+            if not art["header_seen"] and "player-news-header" in cls.split():
+                art["header_seen"] = art["in_header"] = True
+                roles = ("header",)
+            elif not art["ten_seen"] and " ".join(cls.split()) == "ten columns":
+                art["ten_seen"] = True
+                roles = ("ten",)
+        elif tag == "a":
+            if art["in_header"] and not art["a_taken"]:
+                art["a_taken"] = True
+                roles = ("head_a",)
+        elif tag == "p":
+            roles = ("p",)
+            if art["in_header"] and not art["p_taken"]:
+                art["p_taken"] = True
+                roles += ("head_p",)
+            if self.stack and "ten" in self.stack[-1][1]:
+                roles += ("ten_p",)
+        buf = None
+        if roles and roles[0] in ("p", "head_a"):  # text-capturing elements
+            buf = []
+            self.open_bufs.append(buf)
+        self.stack.append((tag, roles, buf))
+
+    def end(self, tag: str) -> None:
+        if tag in _VOID_TAGS:
+            return
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > i:
+            _, roles, buf = self.stack.pop()
+            if roles:
+                self._close(roles, buf)
+
+    def text(self, data: str) -> None:
+        if self.open_bufs:
+            data = data.strip()
+            if data:
+                for buf in self.open_bufs:
+                    buf.append(data)
+
+    def _close(self, roles: tuple, buf: Optional[list]) -> None:
+        art = self.art
+        if buf is not None:
+            # by identity: sibling buffers can compare equal (e.g. both empty)
+            self.open_bufs = [b for b in self.open_bufs if b is not buf]
+            text = " ".join(buf)
+            for role in roles:
+                if role == "p":
+                    art["all_p"].append(text)
+                elif role == "ten_p":
+                    art["ten_p"].append(text)
+                elif role == "head_a":
+                    art["headline"] = text
+                elif role == "head_p":
+                    art["date"] = text
+        elif roles == ("header",):
+            art["in_header"] = False
+        elif roles == ("article",):
+            self.parts.append((art["headline"], art["date"], art["ten_p"] if art["ten_seen"] else art["all_p"]))
+            self.art = None
+
+# ---- lxml: XPath plan compiled once; each article subtree walked once ----
+
+_LXML_PLAN = None
+
+def _lxml_plan():
+    global _LXML_PLAN
+    if _LXML_PLAN is None:
+        from lxml import etree
+        _LXML_PLAN = etree.XPath(
+            "//div[contains(concat(' ', normalize-space(@class), ' '), ' player-news-item ')]"
+        )
+    return _LXML_PLAN
+
+def _parse_lxml(html: str) -> List[Dict[str, Optional[str]]]:
+    import lxml.html
+
+    walker = _ArticleWalker()
+
+    def visit(el):
+        tag = el.tag
+        if isinstance(tag, str):  # skip comments / processing instructions, keep their tail
+            walker.start(tag, el.get("class") or "")
+            if el.text:
+                walker.text(el.text)
+            for child in el:
+                visit(child)
+            walker.end(tag)
+        if el.tail:
+            walker.text(el.tail)
+
+    for article in _lxml_plan()(lxml.html.document_fromstring(html)):
+        visit(article)
+    return [_item_from_parts(*p) for p in walker.parts]
+
+# ---- stdlib: one streaming pass over the whole page, no tree ----
+
+def _parse_stdlib(html: str) -> List[Dict[str, Optional[str]]]:
+    from html.parser import HTMLParser
+
+    walker = _ArticleWalker()
+
+    class _Tokenizer(HTMLParser):
+        def handle_starttag(self, tag, attrs):
+            cls = ""
+            for k, v in attrs:
+                if k == "class":
+                    cls = v or ""
+                    break
+            walker.start(tag, cls)
+
+        def handle_startendtag(self, tag, attrs):
+            self.handle_starttag(tag, attrs)
+            walker.end(tag)
+
+        def handle_endtag(self, tag):
+            walker.end(tag)
+
+        def handle_data(self, data):
+            walker.text(data)
+
+    # everything before the first article (head, nav, inline scripts) is irrelevant to the walker
+    first = html.find("player-news-item")
+    if first < 0:
+        return []
+    tok = _Tokenizer(convert_charrefs=True)
+    tok.feed(html[html.rfind("<", 0, first):])
+    tok.close()
+    return [_item_from_parts(*p) for p in walker.parts]
+
+_BACKENDS = {"lxml": _parse_lxml, "stdlib": _parse_stdlib, "bs4": _parse_bs4}
+
+def default_backend() -> str:
+    """lxml when installed, else the dependency-free streaming parser."""
+    return "lxml" if _parser_name() == "lxml" else "stdlib"
+
 def _fetch_page(p: int, timeout: int = 10) -> Tuple[int, List[Dict[str, Optional[str]]], bool]:
     """
     Returns (page_number, items, is_empty_or_error)
     """
     url = _page_url(p)
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=timeout)
+        resp = http_get(url, timeout=timeout)
         if resp.status_code == 404:
             return p, [], True
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, _parser_name())
-        articles = soup.find_all("div", class_="player-news-item")
-        if not articles:
-            return p, [], True
-        items = []
-        for a in articles:
-            d = _parse_article(a)
-            if not d.get("player_name"):
-                d["player_name"] = _extract_player_name(d.get("headline"), d.get("description"))
-            items.append(d)
-        return p, items, False
+        items = parse_injury_html(resp.text)
+        return p, items, not items
     except requests.RequestException:
         return p, [], True
 
+def parse_injury_html(html: str, backend: Optional[str] = None) -> List[Dict[str, Optional[str]]]:
+    """
+    Parse one injury-news page (live response or saved HTML fixture) into items.
+    `backend` is 'lxml', 'stdlib' or 'bs4' (reference); default: default_backend().
+    """
+    return _BACKENDS[backend or default_backend()](html)
+
+def fetch_new_items(
+    known_keys: Callable[[List[str]], set],
+    key_fn: Callable[[Dict[str, Optional[str]]], str],
+    max_pages: Optional[int] = 8,
+    verbose: bool = False,
+) -> List[Dict[str, Optional[str]]]:
+    """
+    Incremental crawl: walk pages newest-first and stop at the first item
+    already stored. `known_keys(keys)` returns the subset of a page's keys the
+    caller already has; `key_fn(item)` builds an item's key. Returns only the
+    new items, newest first. Pages are fetched one at a time so a refresh with
+    nothing new costs a single request.
+    """
+    new: List[Dict[str, Optional[str]]] = []
+    seen: set = set()
+    p = 1
+    while max_pages is None or p <= max_pages:
+        _, items, empty = _fetch_page(p)
+        if empty:
+            break
+        keys = [key_fn(it) for it in items]
+        known = known_keys(keys)
+        hit = False
+        for it, k in zip(items, keys):
+            if k in known:
+                hit = True
+                break
+            if k not in seen:
+                seen.add(k)
+                new.append(it)
+        if verbose: print(f"[injuries] page {p}: {len(items)} items{' (reached stored items)' if hit else ''}")
+        if hit:
+            break
+        p += 1
+    return new
+
 def get_injury_reports(
     max_pages: Optional[int] = 8,     # upper bound; None to keep going until an empty page
     target_items: Optional[int] = None,  # early-stop when we have this many rows
@@ -0,0 +1,297 @@
+# utils/injury_store.py
+"""
+Persistent injury feed.
+
+A refresher scrapes (or reads saved HTML fixtures), parses items once and
+writes them into a local SQLite table; the /injuries page only runs an
+indexed COUNT + LIMIT/OFFSET query, so request latency does not depend on
+the upstream site and every Gunicorn worker shares one copy.
+
+    python -m utils.injury_store                    # refresh once (live, stops at stored items)
+    python -m utils.injury_store --full             # re-walk every page
+    python -m utils.injury_store --every 300        # refresh every 5 minutes
+    python -m utils.injury_store --fixture page.html [--fixture page2.html]
+"""
+from __future__ import annotations
+import hashlib, re, sqlite3, threading, time
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+from config import BASE_DIR, INJURY_DB
+from utils.player_index import normalize_name
+from utils.player_team import team_for_player
+from utils.team_lookup import infer_team_code
+
+REFRESH_INTERVAL = 300      # seconds between background refreshes
+REFRESH_LOCK_TTL = 120      # a refresh holding the lock longer than this is presumed dead
+TEAM_INFER_VERSION = "2"    # bump when team inference changes so stored rows get re-enriched
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS injury_items (
+    item_key       TEXT PRIMARY KEY,          -- sha1(headline|date)
+    seq            INTEGER NOT NULL,          -- grows with recency within/between pulls
+    player_name    TEXT,
+    player_clean   TEXT,
+    team           TEXT,                      -- resolved at ingestion (roster, then headline text)
+    headline       TEXT,
+    date           TEXT,                      -- as shown on the site
+    reported_at    TEXT,                      -- ISO-8601 UTC (NULL if unparseable)
+    description    TEXT,
+    fantasy_impact TEXT,
+    first_seen     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_injury_items_order ON injury_items (reported_at DESC, seq DESC);
+CREATE INDEX IF NOT EXISTS ix_injury_items_player ON injury_items (player_clean);
+CREATE INDEX IF NOT EXISTS ix_injury_items_team ON injury_items (team);
+
+CREATE TABLE IF NOT EXISTS injury_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+ITEM_COLUMNS = ["player_name", "team", "headline", "date", "reported_at", "description", "fantasy_impact"]
+
+_ORDINAL_RX = re.compile(r"(\d+)(st|nd|rd|th)\b")
+_YEAR_RX = re.compile(r"\b(19|20)\d\d\b")
+FUTURE_SLACK = timedelta(days=3)  # yearless dates further ahead than this belong to last year
+# US zones the site prints (offsets in seconds)
+_TZINFOS = {"EDT": -4 * 3600, "EST": -5 * 3600, "CDT": -5 * 3600, "CST": -6 * 3600,
+            "MDT": -6 * 3600, "MST": -7 * 3600, "PDT": -7 * 3600, "PST": -8 * 3600, "ET": -5 * 3600}
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+def parse_report_date(text: Optional[str], now: Optional[datetime] = None) -> Optional[str]:
+    """
+    'Sun, Aug 10th 6:32pm EDT' -> ISO UTC string (None when unparseable).
+    The site omits the year and dateutil fills in the current one, so a
+    yearless date more than FUTURE_SLACK ahead of `now` (e.g. "Dec 29th"
+    read in January) is moved back a year.
+    """
+    if not text:
+        return None
+    try:
+        from dateutil import parser as dateparser
+        now = now or datetime.now(timezone.utc)
+        default = now.replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+        dt = dateparser.parse(_ORDINAL_RX.sub(r"\1", text), fuzzy=True, tzinfos=_TZINFOS, default=default)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        if not _YEAR_RX.search(text) and dt - now > FUTURE_SLACK:
+            try:
+                dt = dt.replace(year=dt.year - 1)
+            except ValueError:  # Feb 29th
+                dt = dt - timedelta(days=366)
+        return dt.astimezone(timezone.utc).replace(microsecond=0).isoformat()
+    except Exception:
+        return None
+
+def item_key(headline: Optional[str], date: Optional[str]) -> str:
+    raw = f"{(headline or '').strip().lower()}|{(date or '').strip().lower()}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def resolve_team(it: dict) -> Optional[str]:
+    """Team code for an item: explicit field, then player roster, then headline/description text."""
+    team = it.get("team") or team_for_player(it.get("player_name"))
+    if team:
+        return team
+    text = " ".join(filter(None, [it.get("headline"), it.get("description")]))
+    return infer_team_code(text)
+
+
+class InjuryStore:
+    def __init__(self, path=INJURY_DB):
+        p = Path(path)
+        self.path = str(p if p.is_absolute() else BASE_DIR / p)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    # ---- writes ----
+    def upsert(self, items: Iterable[dict]) -> int:
+        """
+        Insert items given newest-first (page order). Existing items are left
+        untouched. Returns how many were new.
+        """
+        items = list(items)
+        now = utc_now_iso()
+        with closing(self._connect()) as conn, conn:
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM injury_items").fetchone()[0]
+            before = conn.total_changes
+            # oldest first so seq increases with recency
+            for it in reversed(items):
+                seq += 1
+                conn.execute(
+                    "INSERT OR IGNORE INTO injury_items (item_key, seq, player_name, player_clean, team, headline, "
+                    "date, reported_at, description, fantasy_impact, first_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (item_key(it.get("headline"), it.get("date")), seq,
+                     it.get("player_name"), normalize_name(it.get("player_name")) or None,
+                     resolve_team(it),
+                     it.get("headline"), it.get("date"), parse_report_date(it.get("date")),
+                     it.get("description"), it.get("fantasy_impact"), now),
+                )
+            return conn.total_changes - before
+
+    def backfill_teams(self) -> int:
+        """
+        Re-run text inference for rows stored without a team. Runs once per
+        TEAM_INFER_VERSION; returns how many rows gained a team.
+        """
+        if self.get_meta("team_infer_version") == TEAM_INFER_VERSION:
+            return 0
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute(
+                "SELECT item_key, player_name, headline, description FROM injury_items WHERE team IS NULL"
+            ).fetchall()
+            updates = []
+            for key, player_name, headline, description in rows:
+                team = resolve_team({"player_name": player_name, "headline": headline, "description": description})
+                if team:
+                    updates.append((team, key))
+            conn.executemany("UPDATE injury_items SET team=? WHERE item_key=?", updates)
+            conn.execute("INSERT OR REPLACE INTO injury_meta (key, value) VALUES ('team_infer_version', ?)",
+                         (TEAM_INFER_VERSION,))
+        return len(updates)
+
+    def set_meta(self, key: str, value: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO injury_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM injury_meta WHERE key=?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def try_lock(self, name: str = "refresh", ttl: int = REFRESH_LOCK_TTL) -> bool:
+        """Cross-process lock row: True if this caller now owns `name`."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR IGNORE INTO injury_meta (key, value) VALUES (?, '0')", (f"lock:{name}",))
+            cur = conn.execute("UPDATE injury_meta SET value=? WHERE key=? AND CAST(value AS REAL) < ?",
+                               (str(now), f"lock:{name}", now - ttl))
+            return cur.rowcount == 1
+
+    def unlock(self, name: str = "refresh") -> None:
+        self.set_meta(f"lock:{name}", "0")
+
+    # ---- reads ----
+    def known_keys(self, keys: list[str]) -> set[str]:
+        """Subset of `keys` already stored (one indexed lookup per call)."""
+        if not keys:
+            return set()
+        hw = self.get_meta("high_water")
+        if keys[0] == hw:
+            return {hw}
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT item_key FROM injury_items WHERE item_key IN ({','.join('?' * len(keys))})", keys
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def count(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM injury_items").fetchone()[0]
+
+    def page(self, limit: int, offset: int = 0) -> list[dict]:
+        """Newest first: by report date, then by the order items were seen."""
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                f"SELECT {', '.join(ITEM_COLUMNS)} FROM injury_items "
+                "ORDER BY reported_at DESC, seq DESC LIMIT ? OFFSET ?", (int(limit), int(offset))
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def last_refresh(self) -> Optional[float]:
+        v = self.get_meta("last_refresh")
+        return float(v) if v else None
+
+# =========================
+#   Refresh
+# =========================
+
+def refresh_injuries(store: Optional[InjuryStore] = None, max_pages: int = 8,
+                     fixtures: Optional[list] = None, full: bool = False) -> int:
+    """
+    Pull items (live, or from saved HTML `fixtures`) into the store.
+    Live pulls are incremental: crawling stops at the first item already
+    stored (the newest stored key is kept as a high-water mark), unless
+    `full` re-walks every page. Returns the number of new items.
+    """
+    from utils.injury_reports import fetch_new_items, get_injury_reports, parse_injury_html
+
+    store = store or InjuryStore()
+    if fixtures:
+        items = []
+        for f in fixtures:
+            items.extend(parse_injury_html(Path(f).read_text(encoding="utf-8")))
+    elif full:
+        df = get_injury_reports(max_pages=max_pages, target_items=None, use_cache=False)
+        items = df.to_dict(orient="records")
+    else:
+        items = fetch_new_items(store.known_keys, lambda it: item_key(it.get("headline"), it.get("date")),
+                                max_pages=max_pages)
+
+    added = store.upsert(items)
+    if items:
+        store.set_meta("high_water", item_key(items[0].get("headline"), items[0].get("date")))
+    store.backfill_teams()
+    store.set_meta("last_refresh", str(time.time()))
+    return added
+
+_refresh_thread: Optional[threading.Thread] = None
+
+def _refresh_locked(store: InjuryStore, max_pages: int) -> None:
+    try:
+        n = refresh_injuries(store, max_pages=max_pages)
+        print(f"🩹 Injury feed refreshed: {n} new item(s)")
+    except Exception as e:
+        print(f"⚠️ Injury refresh failed: {e}")
+    finally:
+        store.unlock()
+
+def maybe_refresh_async(store: Optional[InjuryStore] = None, max_age: int = REFRESH_INTERVAL,
+                        max_pages: int = 8, force: bool = False) -> bool:
+    """
+    Starts a background refresh when the feed is older than `max_age`.
+    At most one refresh runs at a time across all processes (lock row).
+    Returns True when a refresh was started.
+    """
+    global _refresh_thread
+    store = store or InjuryStore()
+    last = store.last_refresh()
+    if not force and last is not None and time.time() - last < max_age:
+        return False
+    if _refresh_thread is not None and _refresh_thread.is_alive():
+        return False
+    if not store.try_lock():
+        return False
+    _refresh_thread = threading.Thread(target=_refresh_locked, args=(store, max_pages), daemon=True)
+    _refresh_thread.start()
+    return True
+
+def main():
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Refresh the local injury feed store")
+    ap.add_argument("--every", type=int, default=0, help="Refresh every N seconds (0 = once)")
+    ap.add_argument("--max-pages", type=int, default=8, help="Pages to scan per refresh")
+    ap.add_argument("--full", action="store_true", help="Re-walk every page instead of stopping at stored items")
+    ap.add_argument("--fixture", action="append", default=None, help="Saved HTML page(s) to ingest instead of scraping")
+    args = ap.parse_args()
+
+    store = InjuryStore()
+    while True:
+        n = refresh_injuries(store, max_pages=args.max_pages, fixtures=args.fixture, full=args.full)
+        print(f"🩹 {n} new item(s); {store.count()} total in {store.path}")
+        if not args.every or args.fixture:
+            break
+        time.sleep(args.every)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# utils/player_index.py
+"""
+Player identity index shared by every piece of name-matching code
+(sim market blend, prop store, injuries, headshots, DV pages).
+
+Built once from the 2025 roster + depth charts into two hash maps:
+    names:   normalized name / alias -> gsis_id
+    players: gsis_id -> {name, team, depth_team, position, headshot_url}
+
+The index is persisted as JSON next to the source CSVs and reloaded only
+when either source file changes, so resolution is a dict probe. The source
+files are stat()ed at most once every SIGNATURE_CHECK_SECONDS, not per lookup.
+
+Usage:
+    from utils.player_index import resolve_player
+    resolve_player("A.J. Brown")          # -> {'gsis_id': ..., 'team': 'PHI', ...}
+    resolve_player("Marvin Harrison Jr.") # suffixes are ignored
+"""
+from __future__ import annotations
+import re, time, unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from config import BASE_DIR, ROSTER_2025_FILE, DATA_DIR, PLAYER_INDEX_FILE
+from utils.cache import read_cache, write_cache
+
+DEPTH_CHART_FILE = DATA_DIR / "nfl_depth_charts.csv"
+_INDEX_VERSION = 2  # bump when normalization rules or stored fields change
+SIGNATURE_CHECK_SECONDS = 5.0
+
+_SUFFIX_RX = re.compile(r"\s+(?:jr|sr|ii|iii|iv|v)\.?$")
+_NON_ALPHA_RX = re.compile(r"[^a-z0-9]")
+
+# Roster uses 'LA' for the Rams; everything downstream expects 'LAR'.
+_TEAM_FIXUPS = {"LA": "LAR", "JAC": "JAX", "WSH": "WAS"}
+
+# =========================
+#   Normalization
+# =========================
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Canonical key: ascii-folded, lowercase, suffix (Jr./Sr./II-V) dropped,
+    then everything but letters/digits removed. "A.J. Brown", "AJ Brown" and
+    "a j brown" all map to "ajbrown".
+    """
+    s = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode()
+    s = re.sub(r"[*+]+$", "", s.strip().lower())  # PFR award marks, e.g. "Saquon Barkley*+"
+    s = _SUFFIX_RX.sub("", s.replace(",", ""))
+    return _NON_ALPHA_RX.sub("", s)
+
+def normalize_name_series(names):
+    """Vectorized normalize_name for pandas Series (same rules)."""
+    s = (names.astype("string")
+              .str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+              .str.strip().str.lower()
+              .str.replace(r"[*+]+$", "", regex=True)
+              .str.replace(",", "", regex=False)
+              .str.replace(_SUFFIX_RX.pattern, "", regex=True))
+    return s.str.replace(_NON_ALPHA_RX.pattern, "", regex=True)
+
+def _aliases(full_name: str, first: str = "", last: str = "", nickname: str = "") -> set[str]:
+    """Alternate keys: first+last (drops middle names), nickname+last, first-initial+last."""
+    tokens = [t for t in re.split(r"\s+", _SUFFIX_RX.sub("", str(full_name or "").strip().lower())) if t]
+    first = first or (tokens[0] if tokens else "")
+    last = last or (tokens[-1] if len(tokens) > 1 else "")
+    out = set()
+    if first and last:
+        out.add(normalize_name(f"{first} {last}"))
+        out.add(normalize_name(first)[:1] + normalize_name(last))
+    if nickname and last:
+        out.add(normalize_name(f"{nickname} {last}"))
+    out.discard("")
+    return out
+
+# =========================
+#   Build / persist
+# =========================
+
+def _resolve(path: Path) -> Path:
+    return path if path.is_absolute() else BASE_DIR / path
+
+def _source_signature(paths) -> list:
+    sig = []
+    for p in paths:
+        try:
+            sig.append([str(p), p.stat().st_mtime])
+        except OSError:
+            sig.append([str(p), None])
+    return sig
+
+def build_player_index(roster_path: Path = ROSTER_2025_FILE, depth_path: Path = DEPTH_CHART_FILE) -> dict:
+    import pandas as pd
+
+    players: dict[str, dict] = {}
+    names: dict[str, str] = {}
+    alias_votes: dict[str, set] = {}
+
+    roster_path, depth_path = _resolve(Path(roster_path)), _resolve(Path(depth_path))
+    roster = pd.read_csv(roster_path) if roster_path.exists() else pd.DataFrame()
+    depth = pd.read_csv(depth_path) if depth_path.exists() else pd.DataFrame()
+
+    # Depth-chart players win name collisions: they are the fantasy-relevant ones.
+    depth_team: dict[str, str] = {}
+    if not depth.empty:
+        keys = normalize_name_series(depth["name"])
+        for key, team in zip(keys, depth["team"].astype(str).str.strip().str.upper()):
+            if key:
+                depth_team.setdefault(key, _TEAM_FIXUPS.get(team, team))
+
+    if not roster.empty:
+        roster = roster.assign(
+            norm_key=normalize_name_series(roster["full_name"]),
+            is_active=(roster.get("status") == "ACT"),
+        ).sort_values("is_active", ascending=False, kind="stable")
+        for r in roster.itertuples(index=False):
+            gsis = getattr(r, "gsis_id", None)
+            if not isinstance(gsis, str) or not r.norm_key:
+                continue
+            team = str(r.team or "").strip().upper()
+            team = _TEAM_FIXUPS.get(team, team)
+            headshot = getattr(r, "headshot_url", None)
+            players[gsis] = {
+                "gsis_id": gsis,
+                "name": r.full_name,
+                "team": team,
+                "depth_team": depth_team.get(r.norm_key),
+                "position": r.position,
+                "headshot_url": headshot if isinstance(headshot, str) else None,
+            }
+            prev = names.get(r.norm_key)
+            if prev is None or (depth_team.get(r.norm_key) == team != players[prev]["team"]):
+                names[r.norm_key] = gsis
+            nickname = getattr(r, "football_name", "")
+            for alias in _aliases(r.full_name, str(r.first_name or ""), str(r.last_name or ""),
+                                  nickname if isinstance(nickname, str) else ""):
+                alias_votes.setdefault(alias, set()).add(gsis)
+
+    # Depth-chart names the roster does not know (e.g. rookies added late).
+    for key, team in depth_team.items():
+        if key not in names:
+            pid = f"depth:{key}"
+            players[pid] = {"gsis_id": None, "name": None, "team": team, "depth_team": team,
+                            "position": None, "headshot_url": None}
+            names[key] = pid
+
+    # Aliases only count when they point at exactly one player.
+    for alias, ids in alias_votes.items():
+        if alias not in names and len(ids) == 1:
+            names[alias] = next(iter(ids))
+
+    return {
+        "version": _INDEX_VERSION,
+        "sources": _source_signature([roster_path, depth_path]),
+        "players": players,
+        "names": names,
+    }
+
+@lru_cache(maxsize=4)
+def _load_index(sig_key: str) -> dict:
+    path = _resolve(Path(PLAYER_INDEX_FILE))
+    cached = read_cache(path, max_age_seconds=10**9)
+    if cached and cached.get("version") == _INDEX_VERSION and repr(cached.get("sources")) == sig_key:
+        return cached
+    idx = build_player_index()
+    write_cache(path, idx)
+    return idx
+
+_sig_key: Optional[str] = None
+_sig_checked = 0.0
+
+def load_player_index() -> dict:
+    """
+    Returns the (process-cached) index; rebuilt only when a source CSV changes.
+    Lookups run per table row, so the sources are re-stat()ed at most once
+    every SIGNATURE_CHECK_SECONDS.
+    """
+    global _sig_key, _sig_checked
+    now = time.monotonic()
+    if _sig_key is None or now - _sig_checked >= SIGNATURE_CHECK_SECONDS:
+        _sig_key = repr(_source_signature([_resolve(Path(ROSTER_2025_FILE)), _resolve(DEPTH_CHART_FILE)]))
+        _sig_checked = now
+    return _load_index(_sig_key)
+
+# =========================
+#   Lookups
+# =========================
+
+def resolve_id(name: Optional[str]) -> Optional[str]:
+    """gsis_id for a player name (None when unknown or only known from depth charts)."""
+    pid = load_player_index()["names"].get(normalize_name(name))
+    return pid if pid and not pid.startswith("depth:") else None
+
+def resolve_player(name: Optional[str]) -> Optional[dict]:
+    idx = load_player_index()
+    pid = idx["names"].get(normalize_name(name))
+    return idx["players"].get(pid) if pid else None
+
+def team_for_name(name: Optional[str]) -> Optional[str]:
+    """Depth-chart team when the player is on one (it tracks trades), else the roster team."""
+    p = resolve_player(name)
+    return (p.get("depth_team") or p["team"]) if p else None
+
+def name_to_id_map() -> dict[str, str]:
+    """The raw normalized-name -> id map, for vectorized Series.map joins."""
+    return load_player_index()["names"]
@@ -1,51 +1,286 @@
 # utils/sos.py
+"""
+Strength-of-schedule index backed by a small precomputed table.
+
+Each source CSV (season stat files plus every weekly summary export) is
+aggregated once into per-(position, season, week, opponent) sums of the
+allowed metric and stored in SQLite next to the data. A sync only
+re-aggregates files whose (mtime, size) changed, so a new weekly file costs
+one small read. Queries group the stored sums; last-N-week windows come from
+cumulative sums over the season/week calendar.
+
+    python -m utils.sos --data-dir DATA --position WR            # sync + print index
+    python -m utils.sos --data-dir DATA --position WR --weeks 4  # last 4 weeks only
+"""
+from __future__ import annotations
+import re, sqlite3
+from contextlib import closing
 from pathlib import Path
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
-def load_sos(data_dir: Path, position: str = "WR"):
-    '''
-    Builds a team-level defensive SoS index for a position using available CSVs.
-    Returns columns: opponent_team, sos_index, games
-    '''
+SOS_SOURCES = [
+    "nfl_player_stats_2024.csv",
+    "nfl_player_stats_2023.csv",
+    "nfl_player_stats_2022.csv",
+    "wr_weekly_summary_01.csv",
+    "weekly_ppr.csv",
+]
+SOS_WEEKLY_GLOB = "wr_weekly_summary_*.csv"   # new weekly exports are picked up automatically
+SOS_DB_NAME = "sos_index.sqlite"
+SOS_VERSION = "1"   # bump when aggregation rules change so every source is re-ingested
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sos_sources (
+    path     TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size     INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sos_allowed (
+    source     TEXT NOT NULL,
+    position   TEXT NOT NULL,             -- 'ALL' when the file has no position column
+    season     INTEGER NOT NULL,          -- 0 when unknown
+    week       INTEGER NOT NULL,          -- 0 for season-total rows
+    opponent   TEXT NOT NULL,
+    metric_sum REAL NOT NULL,
+    metric_n   INTEGER NOT NULL,          -- rows with a metric value
+    rows       INTEGER NOT NULL,          -- all rows (the "games" column)
+    PRIMARY KEY (source, position, season, week, opponent)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_sos_allowed_pos ON sos_allowed (position, season, week);
+
+CREATE TABLE IF NOT EXISTS sos_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+_YEAR_RX = re.compile(r"(20\d\d)")
+_POS_PREFIX_RX = re.compile(r"^(wr|rb|te|qb)_", re.I)
+
+def sos_source_paths(data_dir: Path) -> list[Path]:
+    """Existing SoS inputs: the fixed source list plus all weekly summary exports."""
     data_dir = Path(data_dir)
-    sources = [
-        "nfl_player_stats_2024.csv",
-        "nfl_player_stats_2023.csv",
-        "nfl_player_stats_2022.csv",
-        "wr_weekly_summary_01.csv",
-        "weekly_ppr.csv",
-    ]
-    paths = [data_dir/p for p in sources if (data_dir/p).exists()]
-    if not paths:
+    paths = [data_dir / p for p in SOS_SOURCES if (data_dir / p).exists()]
+    for p in sorted(data_dir.glob(SOS_WEEKLY_GLOB)):
+        if p not in paths:
+            paths.append(p)
+    return paths
+
+# -------------------------------
+# Per-file aggregation
+# -------------------------------
+
+def aggregate_source(path: Path) -> Optional[pd.DataFrame]:
+    """
+    One file -> allowed-metric sums per (position, season, week, opponent).
+    None when the file lacks team/opponent/metric columns.
+    """
+    path = Path(path)
+    df = pd.read_csv(path)
+
+    cols = {c.lower(): c for c in df.columns}
+    team_col = cols.get("team") or cols.get("posteam") or cols.get("home_team")
+    opp_col  = (cols.get("opponent") or cols.get("defteam") or cols.get("away_team") or cols.get("opp")
+                or cols.get("opp_team") or cols.get("opponent_team"))
+    yds_col  = cols.get("receiving_yards") or cols.get("rec_yds") or cols.get("yards") or cols.get("fantasy_points_ppr")
+    if not (team_col and opp_col and yds_col):
         return None
 
-    frames = []
-    for p in paths:
-        try:
-            df = pd.read_csv(p)
-        except Exception:
-            continue
+    n = len(df)
+    pos_col = cols.get("pos") or cols.get("position")
+    if pos_col:
+        position = df[pos_col].astype("string").str.upper().fillna("ALL")
+    else:
+        m = _POS_PREFIX_RX.match(path.name)
+        position = pd.Series([m.group(1).upper() if m else "ALL"] * n, index=df.index)
 
-        cols = {c.lower(): c for c in df.columns}
-        team_col = cols.get("team") or cols.get("posteam") or cols.get("home_team")
-        opp_col  = cols.get("opponent") or cols.get("defteam") or cols.get("away_team") or cols.get("opp")
-        yds_col  = cols.get("receiving_yards") or cols.get("rec_yds") or cols.get("yards") or cols.get("fantasy_points_ppr")
-        if not (team_col and opp_col and yds_col):
-            continue
+    season_col = cols.get("season") or cols.get("year")
+    if season_col:
+        season = pd.to_numeric(df[season_col], errors="coerce").fillna(0).astype("int64")
+    else:
+        m = _YEAR_RX.search(path.name)
+        season = pd.Series([int(m.group(1)) if m else 0] * n, index=df.index)
 
-        tmp = df[[team_col, opp_col, yds_col]].rename(columns={team_col:"team", opp_col:"opp", yds_col:"metric"})
-        frames.append(tmp)
+    week_col = cols.get("week")
+    week = (pd.to_numeric(df[week_col], errors="coerce").fillna(0).astype("int64")
+            if week_col else pd.Series([0] * n, index=df.index))
 
-    if not frames:
-        return None
+    tmp = pd.DataFrame({
+        "position": position, "season": season, "week": week,
+        "opponent": df[opp_col].astype("string"),
+        "metric": pd.to_numeric(df[yds_col], errors="coerce"),
+    }).dropna(subset=["opponent"])
+    return (tmp.groupby(["position", "season", "week", "opponent"], sort=False)["metric"]
+               .agg(metric_sum="sum", metric_n="count", rows="size")
+               .reset_index())
+
+
+class SosStore:
+    def __init__(self, path):
+        self.path = str(path)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def sync(self, paths: list[Path]) -> int:
+        """
+        Bring the table in line with `paths`: re-aggregate new or changed
+        files, drop files that disappeared. Returns how many files were read.
+        """
+        current = {}
+        for p in paths:
+            st = Path(p).stat()
+            current[str(p)] = (st.st_mtime_ns, st.st_size)
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT value FROM sos_meta WHERE key='version'").fetchone()
+            if not row or row[0] != SOS_VERSION:
+                conn.execute("DELETE FROM sos_allowed")
+                conn.execute("DELETE FROM sos_sources")
+                conn.execute("INSERT OR REPLACE INTO sos_meta (key, value) VALUES ('version', ?)", (SOS_VERSION,))
+            stored = {p: (m, s) for p, m, s in conn.execute("SELECT path, mtime_ns, size FROM sos_sources")}
 
-    data = pd.concat(frames, ignore_index=True)
-    sos = (data.groupby("opp")["metric"].mean()
-                 .rename("allowed_metric")
-                 .reset_index()
-                 .rename(columns={"opp":"opponent_team"}))
+            for p in set(stored) - set(current):
+                conn.execute("DELETE FROM sos_allowed WHERE source=?", (p,))
+                conn.execute("DELETE FROM sos_sources WHERE path=?", (p,))
 
+            changed = [p for p, sig in current.items() if stored.get(p) != sig]
+            for p in changed:
+                try:
+                    agg = aggregate_source(Path(p))
+                except Exception as e:
+                    print(f"⚠️ SoS: skipping {p}: {e}")
+                    agg = None
+                conn.execute("DELETE FROM sos_allowed WHERE source=?", (p,))
+                if agg is not None and not agg.empty:
+                    conn.executemany(
+                        "INSERT INTO sos_allowed (source, position, season, week, opponent, metric_sum, metric_n, rows) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(p, pos, int(season), int(week), opp, float(s), int(n), int(r))
+                         for pos, season, week, opp, s, n, r in agg.itertuples(index=False)],
+                    )
+                conn.execute("INSERT OR REPLACE INTO sos_sources (path, mtime_ns, size) VALUES (?, ?, ?)",
+                             (p, *current[p]))
+        return len(changed)
+
+    def allowed(self, position: Optional[str] = None, seasons: Optional[list] = None) -> pd.DataFrame:
+        """Summed aggregates per (season, week, opponent); position rows plus position-less files."""
+        where, args = [], []
+        if position:
+            where.append("position IN (?, 'ALL')")
+            args.append(position.upper())
+        if seasons:
+            where.append(f"season IN ({','.join('?' * len(seasons))})")
+            args.extend(int(s) for s in seasons)
+        sql = ("SELECT season, week, opponent, SUM(metric_sum) AS metric_sum, SUM(metric_n) AS metric_n, "
+               "SUM(rows) AS rows FROM sos_allowed"
+               + (" WHERE " + " AND ".join(where) if where else "")
+               + " GROUP BY season, week, opponent")
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(sql, conn, params=args)
+
+# -------------------------------
+# Index
+# -------------------------------
+
+def _check_weeks(weeks) -> None:
+    if weeks is not None and (int(weeks) != weeks or weeks < 1):
+        raise ValueError(f"SoS window must be a whole number of weeks >= 1, got {weeks!r}")
+
+def window_totals(agg: pd.DataFrame, weeks: int, as_of: Optional[tuple] = None) -> pd.DataFrame:
+    """
+    Per-opponent sums over the last `weeks` weekly periods (league calendar,
+    ordered by season then week) ending at `as_of` (season, week); defaults
+    to the latest period. Uses cumulative sums, so any window is O(opponents).
+    Raises ValueError for weeks < 1 or an `as_of` that is not in the data.
+    """
+    _check_weeks(weeks)
+    weekly = agg[agg["week"] > 0]
+    if weekly.empty:
+        return weekly[["opponent", "metric_sum", "metric_n", "rows"]]
+
+    periods = pd.MultiIndex.from_frame(
+        weekly[["season", "week"]].drop_duplicates().sort_values(["season", "week"]))
+    if as_of is None:
+        end = len(periods) - 1
+    else:
+        key = tuple(int(x) for x in as_of)
+        if key not in periods:
+            first, last = (tuple(int(x) for x in p) for p in (periods[0], periods[-1]))
+            raise ValueError(f"as_of {key} is not a (season, week) in the SoS data ({first} .. {last})")
+        end = periods.get_loc(key)
+    start = end - weeks  # exclusive
+
+    period_idx = periods.get_indexer(pd.MultiIndex.from_frame(weekly[["season", "week"]]))
+    grid = (weekly.assign(_p=period_idx)
+                  .pivot_table(index="opponent", columns="_p", values=["metric_sum", "metric_n", "rows"],
+                               aggfunc="sum", fill_value=0))
+    out = pd.DataFrame({"opponent": grid.index})
+    for col in ("metric_sum", "metric_n", "rows"):
+        per_period = grid[col].reindex(columns=range(len(periods)), fill_value=0).to_numpy(dtype="float64")
+        cum = np.cumsum(per_period, axis=1)
+        out[col] = cum[:, end] - (cum[:, start] if start >= 0 else 0.0)
+    return out[out["rows"] > 0].reset_index(drop=True)
+
+def sos_index(agg: pd.DataFrame, weeks: Optional[int] = None) -> Optional[pd.DataFrame]:
+    if agg is None or agg.empty:
+        return None
+    if weeks is not None:
+        totals = window_totals(agg, weeks)
+    else:
+        totals = agg.groupby("opponent", as_index=False)[["metric_sum", "metric_n", "rows"]].sum()
+    totals = totals[totals["metric_n"] > 0]
+    if totals.empty:
+        return None
+
+    # games comes from the same grouped frame as the mean, so rows always line up
+    sos = pd.DataFrame({
+        "opponent_team": totals["opponent"].to_numpy(),
+        "allowed_metric": (totals["metric_sum"] / totals["metric_n"]).to_numpy(),
+        "games": totals["rows"].astype("int64").to_numpy(),
+    }).sort_values("opponent_team", ignore_index=True)
     mean = sos["allowed_metric"].mean()
     sos["sos_index"] = 100.0 * sos["allowed_metric"] / mean
-    sos["games"] = data.groupby("opp").size().values
-    return sos[["opponent_team","sos_index","games"]]
+    return sos[["opponent_team", "sos_index", "games"]]
+
+def load_sos(data_dir: Path, position: str = "WR", weeks: Optional[int] = None,
+             seasons: Optional[list] = None, db_path: Optional[Path] = None):
+    '''
+    Builds a team-level defensive SoS index for a position using available CSVs.
+    Returns columns: opponent_team, sos_index, games (None when no usable input).
+    `weeks` limits it to the last N weekly periods (ValueError when < 1);
+    `seasons` filters seasons.
+    '''
+    _check_weeks(weeks)
+    data_dir = Path(data_dir)
+    paths = sos_source_paths(data_dir)
+    if not paths:
+        return None
+    store = SosStore(db_path or data_dir / SOS_DB_NAME)
+    store.sync(paths)
+    return sos_index(store.allowed(position, seasons), weeks)
+
+def main():
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Sync the SoS aggregate table and print the index")
+    ap.add_argument("--data-dir", default="DATA")
+    ap.add_argument("--position", default="WR")
+    ap.add_argument("--weeks", type=int, default=None, help="Only the last N weekly periods")
+    args = ap.parse_args()
+
+    data_dir = Path(args.data_dir)
+    store = SosStore(data_dir / SOS_DB_NAME)
+    n = store.sync(sos_source_paths(data_dir))
+    print(f"📐 SoS table synced ({n} file(s) re-aggregated) -> {store.path}")
+    sos = sos_index(store.allowed(args.position), args.weeks)
+    print(sos.to_string(index=False) if sos is not None else "No SoS inputs with team/opponent/metric columns.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# utils/table_query.py
+"""
+Server-side filter / sort / paginate for tabular pages.
+
+Routes hand over the (cached) DataFrame plus request.args and get back one
+page of rows ready for a template or JSON, so page weight and render time
+depend on the page size, not on the table size.
+
+Query string:
+    q=text                 case-insensitive substring match over text columns
+    f_<col>=value          per-column filter: substring for text columns,
+                           '>=x', '<=x', '>x', '<x' or an exact number for numeric ones
+    sort=<col>&dir=asc|desc
+    page=N&size=M          (size capped at MAX_PAGE_SIZE)
+
+Usage:
+    tq = parse_table_args(request.args, columns, default_sort="spike_week_score")
+    page = query_frame(df, tq)       # {"rows", "columns", "total", "page", "pages", ...}
+"""
+from __future__ import annotations
+import math, re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_CMP_RX = re.compile(r"^\s*(>=|<=|>|<|=)?\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def parse_table_args(args, columns: list, default_sort: Optional[str] = None, default_dir: str = "desc",
+                     default_size: int = DEFAULT_PAGE_SIZE) -> dict:
+    """Normalize request args against the columns that actually exist."""
+    sort = args.get("sort") or default_sort
+    if sort not in columns:
+        sort = default_sort if default_sort in columns else None
+    direction = (args.get("dir") or default_dir).lower()
+    if direction not in ("asc", "desc"):
+        direction = default_dir
+
+    try:
+        size = int(args.get("size") or default_size)
+    except (TypeError, ValueError):
+        size = default_size
+    try:
+        page = int(args.get("page") or 1)
+    except (TypeError, ValueError):
+        page = 1
+
+    filters = {}
+    for key in args:
+        if key.startswith("f_") and key[2:] in columns and (args.get(key) or "").strip():
+            filters[key[2:]] = args.get(key).strip()
+
+    return {
+        "q": (args.get("q") or "").strip(),
+        "filters": filters,
+        "sort": sort,
+        "dir": direction,
+        "page": max(1, page),
+        "size": max(1, min(size, MAX_PAGE_SIZE)),
+    }
+
+def _text_match(s: pd.Series, needle: str) -> np.ndarray:
+    return s.astype("string").str.contains(needle, case=False, regex=False, na=False).to_numpy(dtype=bool)
+
+def _filter_mask(df: pd.DataFrame, tq: dict) -> Optional[np.ndarray]:
+    mask = None
+
+    def _and(m):
+        nonlocal mask
+        mask = m if mask is None else (mask & m)
+
+    if tq["q"]:
+        text_cols = [c for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])]
+        any_hit = np.zeros(len(df), dtype=bool)
+        for c in text_cols:
+            any_hit |= _text_match(df[c], tq["q"])
+        _and(any_hit)
+
+    for col, value in tq["filters"].items():
+        s = df[col]
+        m = _CMP_RX.match(value) if pd.api.types.is_numeric_dtype(s) else None
+        if m:
+            op, x = m.group(1) or "=", float(m.group(2))
+            v = s.to_numpy(dtype="float64", na_value=np.nan)
+            _and({">=": v >= x, "<=": v <= x, ">": v > x, "<": v < x, "=": v == x}[op])
+        else:
+            _and(_text_match(s, value))
+    return mask
+
+def _json_safe(df: pd.DataFrame) -> list:
+    """Records with NaN/NaT as None so the same rows work in Jinja and JSON."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+def query_frame(df: Optional[pd.DataFrame], tq: dict, columns: Optional[list] = None) -> dict:
+    """
+    Filter -> sort -> slice one page. Only the page is converted to dicts.
+    `columns` limits/orders the returned columns (default: all).
+    """
+    if df is None or df.empty:
+        return {"rows": [], "columns": list(columns or (df.columns if df is not None else [])),
+                "total": 0, "page": 1, "pages": 1, "size": tq["size"], "sort": tq["sort"],
+                "dir": tq["dir"], "q": tq["q"], "filters": tq["filters"]}
+
+    columns = [c for c in (columns or list(df.columns)) if c in df.columns]
+    mask = _filter_mask(df, tq)
+    view = df if mask is None else df[mask]
+
+    if tq["sort"] in view.columns and len(view) > 1:
+        order = dict(ascending=(tq["dir"] == "asc"), kind="stable", na_position="last")
+        try:
+            view = view.sort_values(tq["sort"], **order)
+        except TypeError:
+            # object column mixing str and numbers: compare as text
+            view = view.sort_values(tq["sort"], key=lambda s: s.astype(str).where(s.notna()), **order)
+
+    total = len(view)
+    pages = max(1, math.ceil(total / tq["size"]))
+    page = min(tq["page"], pages)
+    start = (page - 1) * tq["size"]
+    rows = _json_safe(view.iloc[start:start + tq["size"]][columns])
+
+    return {"rows": rows, "columns": columns, "total": total, "page": page, "pages": pages,
+            "size": tq["size"], "sort": tq["sort"], "dir": tq["dir"], "q": tq["q"], "filters": tq["filters"]}
@@ -47,22 +47,38 @@ TEAM_SYNONYMS = {
     "WAS": ["washington commanders", "commanders", "was", "washington"],
 }
 
-# Compile regexes once (longer phrases first so "los angeles chargers" wins over "chargers")
-_PATTERNS: list[tuple[str, re.Pattern]] = []
-for code, synonyms in TEAM_SYNONYMS.items():
-    for syn in sorted(synonyms, key=len, reverse=True):
-        # Word boundaries; allow flexible whitespace
-        pattern = r"\b" + re.sub(r"\s+", r"\\s+", re.escape(syn)) + r"\b"
-        _PATTERNS.append((code, re.compile(pattern, re.IGNORECASE)))
+# One combined alternation over every synonym (longest first so "los angeles
+# chargers" wins over "chargers"); a single finditer pass replaces ~100
+# separate regex searches.
+_SYNONYM_TO_CODE: dict[str, str] = {}
+_TEAM_ORDER: dict[str, int] = {}
+for _i, (_code, _synonyms) in enumerate(TEAM_SYNONYMS.items()):
+    _TEAM_ORDER[_code] = _i
+    for _syn in _synonyms:
+        _SYNONYM_TO_CODE[" ".join(_syn.split())] = _code
+
+_TEAM_RX = re.compile(
+    r"\b(?:" + "|".join(
+        re.sub(r"\\ ", r"\\s+", re.escape(syn))
+        for syn in sorted(_SYNONYM_TO_CODE, key=len, reverse=True)
+    ) + r")\b",
+    re.IGNORECASE,
+)
 
 
 def infer_team_code(text: Optional[str]) -> Optional[str]:
     """
     Return a team code like 'NYJ' if we can infer one from text; else None.
+    When several teams are mentioned, the one listed first in TEAM_SYNONYMS
+    wins (same precedence as checking each team's patterns in order).
     """
     if not text or not isinstance(text, str):
         return None
-    for code, rx in _PATTERNS:
-        if rx.search(text):
-            return code
-    return None
+    best = None
+    for m in _TEAM_RX.finditer(text):
+        code = _SYNONYM_TO_CODE.get(" ".join(m.group(0).lower().split()))
+        if code and (best is None or _TEAM_ORDER[code] < _TEAM_ORDER[best]):
+            best = code
+            if _TEAM_ORDER[code] == 0:
+                break
+    return best
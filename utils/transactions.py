@@ -3,13 +3,11 @@ from bs4 import BeautifulSoup
 import pandas as pd
 import re
 
-def get_player_transactions(month, url):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-    }
+from utils.http_client import http_get
 
+def get_player_transactions(month, url):
     try:
-        response = requests.get(url, headers=headers)
+        response = http_get(url)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
         content_div = soup.find('div', {'id': 'content'})
@@ -0,0 +1,75 @@
+# utils/week_cache.py
+"""
+Decorated week-page rows cached by (file path, mtime, size).
+
+Two layers:
+    - in-process LRU (bounded, per Gunicorn worker)
+    - JSON files under instance/week_cache/ shared by all workers
+
+A sim rewriting week_XX.csv changes its mtime/size, so stale entries are
+simply never looked up again. Only a cold miss touches pandas.
+"""
+from __future__ import annotations
+import hashlib, threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+from utils.cache import read_cache, write_cache
+
+MEMORY_ENTRIES = 32          # weeks kept per process
+DISK_MAX_AGE = 7 * 24 * 3600 # disk entries are validated by signature; age is only a backstop
+
+_mem: "OrderedDict[tuple, list]" = OrderedDict()
+_lock = threading.Lock()
+
+def _signature(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (str(path.resolve()), st.st_mtime_ns, st.st_size)
+
+def _disk_path(cache_dir: Path, sig: tuple) -> Path:
+    return cache_dir / f"{hashlib.sha1(sig[0].encode()).hexdigest()[:16]}.json"
+
+def _read_rows(path: Path) -> list[dict]:
+    import pandas as pd
+    return pd.read_csv(path).to_dict(orient="records")
+
+def week_rows(path, decorate: Callable[[dict], dict], cache_dir=None) -> Optional[list[dict]]:
+    """
+    Rows of a week CSV after `decorate` was applied to each, or None when the
+    file does not exist. `cache_dir` (e.g. instance/week_cache) enables the
+    shared on-disk layer.
+    """
+    path = Path(path)
+    sig = _signature(path)
+    if sig is None:
+        return None
+
+    with _lock:
+        rows = _mem.get(sig)
+        if rows is not None:
+            _mem.move_to_end(sig)
+            return rows
+
+    disk = _disk_path(Path(cache_dir), sig) if cache_dir else None
+    cached = read_cache(disk, DISK_MAX_AGE) if disk else None
+    if cached and tuple(cached.get("sig", ())) == sig:
+        rows = cached["rows"]
+    else:
+        rows = [decorate(r) for r in _read_rows(path)]
+        if disk:
+            write_cache(disk, {"sig": list(sig), "rows": rows})
+
+    with _lock:
+        _mem[sig] = rows
+        _mem.move_to_end(sig)
+        while len(_mem) > MEMORY_ENTRIES:
+            _mem.popitem(last=False)
+    return rows
+
+def clear_week_cache() -> None:
+    with _lock:
+        _mem.clear()
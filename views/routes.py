@@ -1,18 +1,18 @@
 # views/routes.py
 
-from flask import Blueprint, render_template, session, redirect, url_for, request, flash, current_app, abort
+from flask import Blueprint, render_template, session, redirect, url_for, request, flash, current_app, abort, jsonify
 from flask_login import login_required, current_user
-import os, sys, subprocess, time
+import os, time
 from pathlib import Path
-import pandas as pd
 from datetime import datetime
 from sqlalchemy import or_, func, and_
 import hashlib, math, re
 
-from utils.injury_reports import get_injury_reports
-from config import NFL_SCHEDULE_2025_FILE, STADIUM_ENV_FILE
-from utils.team_logo import logo_url_for_code, team_logo_url
-from utils.player_team import team_for_player
+# pandas / requests / bs4 / PIL are imported inside the routes that use them
+# so worker boot stays cheap (see scripts/check_import_time.py).
+from config import NFL_SCHEDULE_2025_FILE, STADIUM_ENV_FILE, SIM_RESULTS_DIR
+from utils.team_logo import logo_url_for_code
+from utils.week_cache import week_rows
 
 import csv
 from werkzeug.utils import secure_filename
@@ -20,8 +20,8 @@ from config import ALLOWED_IMAGE_EXTENSIONS, BASE_DIR
 
 # Wallet/entitlement helpers
 from services.wallet import (
-    get_or_create_wallet, earn_coins, spend_coins, add_rep,
-    grant_entitlement, has_entitlement
+    get_or_create_wallet, ensure_wallet, earn_coins, spend_coins, add_rep,
+    grant_entitlement, has_entitlement, has_any_entitlement
 )
 from models.wallet import Wallet, CoinTxn, RepEvent, Entitlement
 
@@ -40,7 +40,7 @@ def inject_os():
     return dict(os=os)
 
 # Where weekly CSV outputs land for the dashboard (adjust if yours differs)
-DATA_DIR = 'DATA/sim_results'
+DATA_DIR = str(SIM_RESULTS_DIR)
 
 TEAM_COLORS = {
     "CIN": "#FB4F14", "DET": "#0076B6", "PHI": "#004C54", "DAL": "#041E42", "BUF": "#00338D",
@@ -60,6 +60,11 @@ def matchup_bg_color(adj_pts):
     except:
         return "#bbb"
 
+def _decorate_week_row(row):
+    row['team_color'] = TEAM_COLORS.get(row.get('team'), "#444")
+    row['bg_color'] = matchup_bg_color(row.get('adj_pts'))
+    return row
+
 # =========================
 #          ROUTES
 # =========================
@@ -99,7 +104,7 @@ def home():
     ])
     # ensure wallet exists so balances always render
     if current_user.is_authenticated:
-        get_or_create_wallet(current_user.id)
+        ensure_wallet(current_user.id)
     return render_template('index.html', weeks=weeks, username=session.get('user'))
 
 # Week view (now gated by entitlement)
@@ -112,7 +117,7 @@ def week_view(week):
     # If the user has the week or a season pass, let them in
     unlocked = False
     if current_user.is_authenticated:
-        unlocked = has_entitlement(current_user.id, 'week', key) or has_entitlement(current_user.id, 'season', '2025-SEASON')
+        unlocked = has_any_entitlement(current_user.id, ('week', key), ('season', '2025-SEASON'))
 
     if not unlocked:
         # Pricing from config (fallbacks if missing)
@@ -126,15 +131,11 @@ def week_view(week):
     # Proceed with the normal rendering (existing logic)
     fname = f'week_{week:02d}.csv'
     path = os.path.join(DATA_DIR, fname)
-    if not os.path.exists(path):
+    rows = week_rows(path, _decorate_week_row, cache_dir=Path(current_app.instance_path) / "week_cache")
+    if rows is None:
         flash(f"No data for week {week}", "warning")
         return redirect(url_for('views.home'))
 
-    df = pd.read_csv(path)
-    rows = df.to_dict(orient='records')
-    for row in rows:
-        row['team_color'] = TEAM_COLORS.get(row.get('team'), "#444")
-        row['bg_color'] = matchup_bg_color(row.get('adj_pts'))
     return render_template('week.html', week=week, rows=rows)
 
 # Unlock a week with coins
@@ -197,25 +198,22 @@ def dev_grant_coins():
 @views_bp.route("/injuries", methods=["GET"])
 def injuries():
     """
-    Load injury reports, attach logo URLs via player->team or text inference,
-    and paginate results at 10 per page while keeping a stable total_count.
-    Use ?refresh=1 to bypass the 5-min scrape cache once.
+    Injury reports from the local store (utils/injury_store.py), paginated in
+    SQL at 10 per page. A stale feed is refreshed in the background, so the
+    request never waits on the upstream site. ?refresh=1 forces a refresh.
     """
+    from utils.injury_store import InjuryStore, maybe_refresh_async
+
     PAGE_SIZE = 10
     page = request.args.get("page", 1, type=int) or 1
     max_pages = request.args.get("pages", default=8, type=int)
-    refresh = request.args.get("refresh", type=int) == 1  # <— NEW
-
-    # Pull the full dataset so total_count is stable
-    df = get_injury_reports(
-        max_pages=max_pages,
-        target_items=None,   # do not early-stop; get full set
-        concurrency=3,
-        use_cache=not refresh,   # <— NEW: bypass cache when refresh=1
-        verbose=False,
-    )
+    refresh = request.args.get("refresh", type=int) == 1
 
-    if df is None or df.empty:
+    store = InjuryStore()
+    maybe_refresh_async(store, max_pages=max_pages, force=refresh)
+
+    total_count = store.count()
+    if total_count == 0:
         flash("No injury data available right now.", "warning")
         return render_template(
             "injuries.html",
@@ -228,33 +226,15 @@ def injuries():
             showing_end=0,
         )
 
-    # Convert to records
-    items = df.to_dict(orient="records")
-
-    # Attach logo URLs — prefer player->team via roster, then text inference
-    for it in items:
-        player = (it.get("player_name") or it.get("player") or "").strip()
-        logo = None
-
-        # 1) Try roster map
-        if player:
-            code = team_for_player(player)
-            if code:
-                logo = logo_url_for_code(code)
-
-        # 2) Fallback: infer from headline + description
-        if not logo:
-            text = " ".join(filter(None, [it.get("headline", ""), it.get("description", "")]))
-            logo = team_logo_url(text)
-
-        it["logo_url"] = logo
-
-    total_count = len(items)
     total_pages = max(1, (total_count + PAGE_SIZE - 1) // PAGE_SIZE)
     page = max(1, min(page, total_pages))
     start = (page - 1) * PAGE_SIZE
     end = start + PAGE_SIZE
-    injuries_page = items[start:end]
+    injuries_page = store.page(PAGE_SIZE, start)
+
+    # Team was resolved at ingestion; rendering is a code -> URL lookup only
+    for it in injuries_page:
+        it["logo_url"] = logo_url_for_code(it["team"]) if it.get("team") else None
 
     return render_template(
         "injuries.html",
@@ -778,6 +758,8 @@ def dk_summary():
 
 # ===== Weather (fixed) =====
 def _load_stadium_env_by_team():
+    import pandas as pd
+
     out = {}
     if not os.path.exists(STADIUM_ENV_FILE):
         return out
@@ -804,6 +786,7 @@ def _load_stadium_env_by_team():
 @views_bp.route("/weather")
 def weather_insights():
     import csv
+    import pandas as pd
     from utils.team_logo import team_logo_url  # global resolver (local /static first, ESPN fallback)
 
     data_path = os.getenv("DATA_DIR", "DATA")
@@ -926,82 +909,115 @@ def weather_insights():
 
     return render_template("weather.html", rows=rows, weeks=weeks_all, week=week_sel)
 
-# ===== Transactions (unchanged logic, just rendering) =====
-@views_bp.route("/transactions")
-def transactions():
-    from utils.team_logo import team_logo_url  # global resolver (local /static first, ESPN fallback)
+# ===== Transactions (paged server-side via utils.table_query) =====
+_TX_FRAME_CACHE: dict = {}
 
-    items = []
+def _transactions_frame():
+    import pandas as pd
 
     # Primary source via utils.transactions (if present)
     try:
         from utils.transactions import get_transactions
         df = get_transactions()
-        if df is not None:
-            items = df.to_dict(orient="records")
+        if df is not None and not df.empty:
+            return df
     except Exception:
         pass
 
     # Fallback CSV if utils.transactions isn't available or returns nothing
-    if not items:
-        data_dir = os.getenv("DATA_DIR", "DATA")
-        csv_path = os.path.join(data_dir, "transactions.csv")
-        if os.path.exists(csv_path):
-            try:
-                df = pd.read_csv(csv_path)
-                items = df.to_dict(orient="records")
-            except Exception:
-                items = []
-
-    # Decorate with a logo inferred from any team-like field (global helper handles it)
-    decorated = []
-    for row in items:
-        r = dict(row)
+    data_dir = os.getenv("DATA_DIR", "DATA")
+    csv_path = os.path.join(data_dir, "transactions.csv")
+    if os.path.exists(csv_path):
+        try:
+            st = os.stat(csv_path)
+            sig = (st.st_mtime_ns, st.st_size)   # re-read only when the export changes
+            cached = _TX_FRAME_CACHE.get("csv")
+            if cached is None or cached[0] != sig:
+                cached = (sig, pd.read_csv(csv_path))
+                _TX_FRAME_CACHE["csv"] = cached
+            return cached[1]
+        except Exception:
+            return None
+    return None
+
+def _transactions_page():
+    from utils.table_query import parse_table_args, query_frame
+    from utils.team_logo import team_logo_url  # global resolver (local /static first, ESPN fallback)
+
+    df = _transactions_frame()
+    columns = list(df.columns) if df is not None else []
+    page = query_frame(df, parse_table_args(request.args, columns))
+
+    # Decorate only the rows on this page with a logo inferred from any team-like field
+    for r in page["rows"]:
         team_like = (
             r.get("team") or r.get("Team") or r.get("home") or r.get("Home")
             or r.get("to_team") or r.get("from_team") or r.get("Team Name")
         )
         r["_logo"] = team_logo_url(team_like)
         r["_team_label"] = team_like
-        decorated.append(r)
-
-    return render_template("transactions.html", items=decorated)
+    return page
 
-# Trigger a simulation (Week X)
+@views_bp.route("/transactions")
+def transactions():
+    page = _transactions_page()
+    args = {k: v for k, v in request.args.to_dict().items() if not k.startswith("_")}  # url_for reserves _external, ...
+    page_url = lambda n: url_for("views.transactions", **{**args, "page": n})
+    return render_template("transactions.html", items=page["rows"], transactions=page["rows"], tp=page,
+                           page_url=page_url, data_url=url_for("views.transactions_data", **args))
+
+@views_bp.route("/transactions/data")
+def transactions_data():
+    """One page of transactions as JSON (same ?q= / sort / page / size args as the page)."""
+    return jsonify(_transactions_page())
+
+# Trigger a simulation (Week X): one SimJob per (week, inputs); run by sim_worker.py
 @views_bp.route('/simulate', methods=['POST'])
 @login_required
 def simulate():
+    from services.sim_jobs import submit_sim_job
+
     week = request.form.get('week', type=int)
     if not week or week < 1 or week > 18:
         flash("Please pick a valid week (1–18).", "error")
         return redirect(url_for('views.home'))
 
     try:
-        app_root = Path(current_app.root_path).parent  # project root
-        sim_py = app_root / "sim_engine.py"
-
-        # Prefer in-process function if available
-        try:
-            from sim_engine import run_week
-            run_week(week=week)
-            flash(f"Week {week} simulation completed.", "success")
-        except Exception:
-            # Fallback: background process so UI returns immediately
-            subprocess.Popen(
-                [sys.executable, str(sim_py), "--week", str(week)],
-                cwd=str(app_root),
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.STDOUT,
-                shell=False
-            )
-            flash(f"Week {week} simulation started in background.", "success")
-
+        job, outcome = submit_sim_job(week, user_id=current_user.id)
+        if outcome == "reused":
+            flash(f"Week {week} is already up to date (job #{job.id}).", "success")
+        elif outcome == "coalesced":
+            flash(f"Week {week} simulation already {job.status} (job #{job.id}).", "success")
+        else:
+            flash(f"Week {week} simulation queued (job #{job.id}).", "success")
     except Exception as e:
         current_app.logger.exception("Sim trigger failed")
-        flash(f"Failed to start simulation: {e}", "error")
+        flash(f"Failed to queue simulation: {e}", "error")
 
     return redirect(url_for('views.week_view', week=week))
 
+@views_bp.route('/simulate/status/<int:job_id>')
+@login_required
+def simulate_status(job_id):
+    from services.sim_jobs import get_job
+
+    job = get_job(job_id)
+    if job is None:
+        abort(404)
+    if job.requested_by != current_user.id and not getattr(current_user, "is_admin", False):
+        abort(403)
+    return jsonify(job.to_dict())
+
+@views_bp.route('/simulate/jobs')
+@login_required
+def simulate_jobs():
+    from services.sim_jobs import recent_jobs
+
+    jobs = [j.to_dict() for j in recent_jobs()]
+    if request.args.get('format') == 'json':
+        return jsonify(jobs)
+    return render_template('sim_jobs.html', jobs=jobs)
+
 @views_bp.route("/me/dk/reset", methods=["POST"])
 @login_required
 def dk_reset_self():
@@ -1,9 +1,9 @@
 
 # weather_estimator.py
 
-import requests
 from datetime import datetime, timedelta
 from config import NOAA_POINTS_BASE_URL
+from utils.http_client import get_json
 
 CLIMATE_PHASE_MODIFIERS = {
     "ElNino": {
@@ -107,11 +107,12 @@ def get_noaa_forecast(lat, lon, game_date):
     try:
         #Step 1: Builds the points API URL, requests location metadata, and extracts the hourly forecast URL.
         points_url = f"{NOAA_POINTS_BASE_URL}/{lat},{lon}"
-        meta = requests.get(points_url, timeout=10).json()
+        # Grid metadata for a stadium rarely changes: conditional GET, body reused on 304
+        meta = get_json(points_url, timeout=10, cache=True)
         forecast_url = meta['properties']['forecastHourly']
 
         #Step 2: Fetches hourly forecast data and gets the list of hourly periods.
-        forecast_data = requests.get(forecast_url, timeout=10).json()
+        forecast_data = get_json(forecast_url, timeout=10)
         periods = forecast_data['properties']['periods']
 
         # Step 3: Finds the forecast period whose start time is closest to the game time.